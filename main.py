@@ -1,8 +1,38 @@
 #!/usr/bin/env python3
 """Entrypoint for Horror House Survival."""
 
-from src.game import run_game
+import argparse
+
+from src.game import TELEMETRY_DIR, run_game
+from src.hotreload import load_tuning
 
 
 if __name__ == "__main__":
-    run_game()
+    parser = argparse.ArgumentParser(description="Horror House Survival")
+    parser.add_argument("--threaded", action="store_true", help="run the simulation on its own thread")
+    parser.add_argument("--telemetry-dir", default=TELEMETRY_DIR, help="where to write telemetry logs")
+    parser.add_argument("--no-telemetry", action="store_true")
+    parser.add_argument("--quality", choices=("auto", "high", "medium", "low"), default="auto",
+                        help="visual effect quality (auto adapts to measured frame time)")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="internal render resolution as a fraction of 960x540, scaled to the window")
+    parser.add_argument("--window", default="960x540", help="initial window size, WxH")
+    parser.add_argument("--tuning", help="JSON file of balance overrides, e.g. {\"GHOST_SPEED\": 70}")
+    parser.add_argument("--hot-reload", action="store_true",
+                        help="reload changed assets and the --tuning file while the game runs")
+    parser.add_argument("--record-replays", metavar="DIR",
+                        help="save each game's inputs and state hashes here, for tools_replay.py check")
+    args = parser.parse_args()
+    window = tuple(int(v) for v in args.window.lower().split("x"))
+    tuning = load_tuning(args.tuning) if args.tuning else None
+    run_game(
+        None if args.no_telemetry else args.telemetry_dir,
+        threaded=args.threaded,
+        quality=args.quality,
+        scale=args.render_scale,
+        window_size=window,
+        tuning=tuning,
+        tuning_path=args.tuning,
+        hot_reload=args.hot_reload,
+        replay_dir=args.record_replays,
+    )
@@ -0,0 +1,175 @@
+"""Per-frame allocation accounting for the update and render hot paths.
+
+Python-level allocations (Rects, tuples, Surface wrappers) are measured with
+tracemalloc. SDL pixel buffers are invisible to tracemalloc, so while tracking
+is enabled ``pygame.Surface`` is swapped for a subclass that counts every
+surface constructed and the bytes its pixels occupy.
+"""
+
+import tracemalloc
+from collections import deque
+
+import pygame
+
+from .profiler import Profiler, percentile
+
+# Reference line for one update + render on the F6 overlay, in KB. A quiet
+# daytime frame allocates about 20 KB; the torch, TV and full-screen effects
+# cost far more, so the benchmark gate calibrates a budget per scenario instead.
+FRAME_ALLOC_BUDGET_KB = 64.0
+
+
+class AllocationTracker(Profiler):
+    def __init__(self, window=120):
+        super().__init__(window=window)
+        self.frame = {}
+        self.frame_total = [0, 0, 0, 0]
+        self.frames = deque(maxlen=window)
+        self.surfaces = 0
+        self.surface_bytes = 0
+        self._stack = []
+        self._surface_class = None
+        self._started_tracing = False
+
+    def enable(self):
+        if self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._patch_surface()
+        super().enable()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        super().disable()
+        pygame.Surface = self._surface_class
+        self._surface_class = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self):
+        super().reset()
+        self.frame = {}
+        self.frame_total = [0, 0, 0, 0]
+        self.frames.clear()
+
+    def _patch_surface(self):
+        tracker = self
+        original = self._surface_class = pygame.Surface
+
+        class CountingSurface(original):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                tracker.surfaces += 1
+                tracker.surface_bytes += self.get_width() * self.get_height() * self.get_bytesize()
+
+        pygame.Surface = CountingSurface
+
+    def _instrument(self, name, method):
+        stack = self._stack
+        traced = tracemalloc.get_traced_memory
+        reset_peak = tracemalloc.reset_peak
+
+        def tracked(*args, **kwargs):
+            current, peak = traced()
+            if stack:
+                parent = stack[-1]
+                parent[1] = max(parent[1], peak - parent[0])
+            reset_peak()
+            entry = [current, 0, self.surfaces, self.surface_bytes]
+            stack.append(entry)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stack.pop()
+                current, peak = traced()
+                high = max(entry[1], peak - entry[0])
+                if stack:
+                    parent = stack[-1]
+                    parent[1] = max(parent[1], peak - parent[0])
+                reset_peak()
+                self._record(
+                    name,
+                    high,
+                    current - entry[0],
+                    self.surfaces - entry[2],
+                    self.surface_bytes - entry[3],
+                    not stack,
+                )
+
+        return tracked
+
+    def _record(self, name, peak, net, surfaces, surface_bytes, top_level):
+        totals = self.frame.get(name)
+        if totals is None:
+            totals = self.frame[name] = [0, 0, 0, 0]
+        totals[0] += peak
+        totals[1] += net
+        totals[2] += surfaces
+        totals[3] += surface_bytes
+        if top_level:
+            frame_total = self.frame_total
+            frame_total[0] += peak
+            frame_total[1] += net
+            frame_total[2] += surfaces
+            frame_total[3] += surface_bytes
+
+    def end_frame(self):
+        frame = self.frame
+        frame["frame"] = self.frame_total
+        self.frames.append(frame)
+        self.frame = {}
+        self.frame_total = [0, 0, 0, 0]
+        return frame
+
+    @staticmethod
+    def frame_bytes(totals):
+        # Python heap high-water plus pixel memory of surfaces created in the section.
+        return totals[0] + totals[3]
+
+    def stats(self):
+        by_section = {}
+        for frame in self.frames:
+            for name, totals in frame.items():
+                by_section.setdefault(name, []).append(totals)
+        rows = []
+        frames = max(1, len(self.frames))
+        for name, entries in by_section.items():
+            sizes = sorted(self.frame_bytes(totals) for totals in entries)
+            rows.append(
+                (
+                    name,
+                    sum(sizes) / frames / 1024.0,
+                    percentile(sizes, 95) / 1024.0,
+                    sizes[-1] / 1024.0,
+                    sum(totals[2] for totals in entries) / frames,
+                )
+            )
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+
+def steady_peak(tracker, warmup=0, section="frame"):
+    """Largest KB ``section`` allocated in one frame after ``warmup`` frames."""
+    sizes = [tracker.frame_bytes(frame[section]) for frame in list(tracker.frames)[warmup:] if section in frame]
+    return max(sizes, default=0) / 1024.0
+
+
+def check_budget(tracker, budget_kb, section_budgets_kb=None, warmup=0):
+    """Return (frame index, section, kb, limit) for every steady-state frame over budget."""
+    section_budgets_kb = section_budgets_kb or {}
+    violations = []
+    for index, frame in enumerate(tracker.frames):
+        if index < warmup:
+            continue
+        for name, totals in frame.items():
+            limit = budget_kb if name == "frame" else section_budgets_kb.get(name)
+            if limit is None:
+                continue
+            used = tracker.frame_bytes(totals) / 1024.0
+            if used > limit:
+                violations.append((index, name, used, limit))
+    return violations
@@ -4,6 +4,7 @@ import os
 
 import pygame
 
+from .atlas import faded, optimize_assets
 from .constants import (
     ASSET_BG_BATH,
     ASSET_BG_LIVING,
@@ -13,6 +14,8 @@ from .constants import (
     ASSET_GHOST_RED,
     ASSET_PLAYER,
     ASSET_TENTACLE,
+    HEIGHT,
+    WIDTH,
 )
 
 SPRITE_SCALE = 1 / 10.0
@@ -46,19 +49,103 @@ def load_image(asset_root, rel_path, size=None):
     return surf
 
 
-def load_assets(asset_root):
-    def scale_sprite(surface):
-        w = max(1, int(surface.get_width() * SPRITE_SCALE))
-        h = max(1, int(surface.get_height() * SPRITE_SCALE))
-        return pygame.transform.smoothscale(surface, (w, h))
-
-    return {
-        "bg_living": load_image(asset_root, ASSET_BG_LIVING, (960, 540)),
-        "bg_bath": load_image(asset_root, ASSET_BG_BATH, (960, 540)),
-        "player": scale_sprite(load_image(asset_root, ASSET_PLAYER)),
-        "dog": scale_sprite(load_image(asset_root, ASSET_DOG)),
-        "dead_dog": scale_sprite(load_image(asset_root, ASSET_DEAD_DOG)),
-        "ghost": scale_sprite(load_image(asset_root, ASSET_GHOST)),
-        "ghost_red": scale_sprite(load_image(asset_root, ASSET_GHOST_RED)),
-        "tentacle": scale_sprite(load_image(asset_root, ASSET_TENTACLE)),
-    }
+# Asset name -> (path under the asset root, is a sprite). Backgrounds fill the screen.
+SOURCES = {
+    "bg_living": (ASSET_BG_LIVING, False),
+    "bg_bath": (ASSET_BG_BATH, False),
+    "player": (ASSET_PLAYER, True),
+    "dog": (ASSET_DOG, True),
+    "dead_dog": (ASSET_DEAD_DOG, True),
+    "ghost": (ASSET_GHOST, True),
+    "ghost_red": (ASSET_GHOST_RED, True),
+    "tentacle": (ASSET_TENTACLE, True),
+}
+# Translucent variants the renderer used to make with copy() + set_alpha() per frame:
+# name -> (source sprite, alpha).
+VARIANTS = {
+    "ghost_flicker": ("ghost", 180),
+    "ghost_red_flicker": ("ghost_red", 180),
+    "hallucination": ("ghost", 120),
+}
+
+_loaded = {}
+_sources = {}
+_atlases = {}
+_reports = {}
+
+
+def load_assets(asset_root, scale=1.0):
+    """Load the shared, read-only surfaces every GameState draws with.
+
+    Surfaces are pre-scaled for the render ``scale`` and cached per (root, scale),
+    so nothing is rescaled while drawing.
+    """
+    key = (asset_root, scale)
+    assets = _loaded.get(key)
+    if assets is None:
+        _sources[key] = {name: _load_source(asset_root, name, scale) for name in SOURCES}
+        _loaded[key] = assets = {}
+        _reports[key] = []
+        _optimize(key, list(SOURCES) + list(VARIANTS))
+    return assets
+
+
+def asset_report(asset_root, scale=1.0, timed=False):
+    """Return (sprite atlas, rows of (name, alpha kind, chosen format, {format: us per blit})).
+
+    Timings are only measured, on fresh copies of every candidate, when ``timed``.
+    """
+    key = (asset_root, scale)
+    load_assets(asset_root, scale)
+    if timed:
+        surfaces, sprites, size = _prepare(key)
+        _, atlas, rows = optimize_assets(surfaces, sprites, size, timed=True)
+        return atlas, rows
+    return _atlases[key], _reports[key]
+
+
+def asset_files(asset_root):
+    """Map each source file path (as currently resolved) to its asset name."""
+    return {resolve_path(asset_root, rel_path): name for name, (rel_path, _) in SOURCES.items()}
+
+
+def reload_asset(asset_root, name):
+    """Reload one source asset and its variants in every loaded scale, in place.
+
+    The cached dicts are updated rather than replaced, so running GameStates,
+    which share them, draw the new surfaces on their next frame. Returns the
+    names that changed.
+    """
+    names = [name] + [variant for variant, (source, _) in VARIANTS.items() if source == name]
+    for key in [key for key in _loaded if key[0] == asset_root]:
+        _sources[key][name] = _load_source(asset_root, name, key[1])
+        _optimize(key, names)
+    return names
+
+
+def _load_source(asset_root, name, scale):
+    rel_path, sprite = SOURCES[name]
+    if not sprite:
+        size = (max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale)))
+        return load_image(asset_root, rel_path, size)
+    surface = load_image(asset_root, rel_path)
+    w = max(1, int(surface.get_width() * SPRITE_SCALE * scale))
+    h = max(1, int(surface.get_height() * SPRITE_SCALE * scale))
+    return pygame.transform.smoothscale(surface, (w, h))
+
+
+def _prepare(key):
+    sources = _sources[key]
+    sprites = {name: surface for name, surface in sources.items() if SOURCES[name][1]}
+    for variant, (source, alpha) in VARIANTS.items():
+        sprites[variant] = faded(sources[source], alpha)
+    size = (max(1, round(WIDTH * key[1])), max(1, round(HEIGHT * key[1])))
+    return {**sources, **sprites}, sprites, size
+
+
+def _optimize(key, names):
+    surfaces, sprites, size = _prepare(key)
+    assets, _atlases[key], rows = optimize_assets(surfaces, sprites, size, names)
+    _loaded[key].update(assets)
+    changed = {row[0] for row in rows}
+    _reports[key] = [row for row in _reports[key] if row[0] not in changed] + rows
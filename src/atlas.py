@@ -0,0 +1,149 @@
+"""Blit-optimized asset formats and a sprite atlas.
+
+``optimize_assets`` converts freshly loaded surfaces to the display format
+that draws the same pixels, chosen by what their alpha channel holds:
+
+    opaque    ``convert()`` to the display format, for fully opaque images
+    colorkey  opaque pixels plus an RLE-accelerated colour key, for sprites
+              whose alpha is only ever 0 or 255
+    alpha     ``convert_alpha()`` per-pixel alpha, for translucent sprites
+
+The choice is a rule rather than a measurement, so it is the same on every
+machine and costs nothing at load time. With ``timed=True`` every pixel-
+equivalent candidate, including RLE alpha and a subsurface of the shared
+sprite atlas, is also timed blitting onto a display-format surface, as a
+diagnostic for ``tools_assets.py``.
+"""
+
+import time
+
+import pygame
+
+BLIT_REPEATS = 200
+BACKGROUND_REPEATS = 20
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 1
+# Colour keys tried in order until one is not used by any opaque pixel.
+COLORKEYS = ((255, 0, 255), (0, 255, 255), (1, 2, 3))
+
+
+def alpha_kind(surface):
+    """Classify a surface as "opaque", "binary" (alpha 0 or 255 only) or "translucent"."""
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return "opaque"
+    total = surface.get_width() * surface.get_height()
+    solid = pygame.mask.from_surface(surface, 254)
+    count = solid.count()
+    if count == total:
+        return "opaque"
+    if count == pygame.mask.from_surface(surface, 0).count():
+        return "binary"
+    return "translucent"
+
+
+def faded(surface, alpha):
+    """A copy of a per-pixel alpha sprite with its alpha scaled, replacing set_alpha on a copy."""
+    variant = surface.copy()
+    variant.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    return variant
+
+
+def colorkeyed(surface):
+    solid = pygame.mask.from_surface(surface, 254)
+    for key in COLORKEYS:
+        keyed = pygame.Surface(surface.get_size()).convert()
+        keyed.fill(key)
+        keyed.blit(surface, (0, 0))
+        keyed.set_colorkey(key, pygame.RLEACCEL)
+        if pygame.mask.from_surface(keyed).overlap_area(solid, (0, 0)) == solid.count():
+            return keyed
+    return None
+
+
+def measure_blit(surface, target, repeats=BLIT_REPEATS):
+    """Average microseconds per blit of ``surface`` onto ``target``."""
+    blit = target.blit
+    surface_rect = surface.get_rect()
+    surface_rect.center = target.get_rect().center
+    blit(surface, surface_rect)  # The first blit of an RLE surface encodes it.
+    start = time.perf_counter()
+    for _ in range(repeats):
+        blit(surface, surface_rect)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+class Atlas:
+    """Sprites shelf-packed into one per-pixel alpha surface, addressed by subsurface rects."""
+
+    def __init__(self, sprites, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+        width = max([width] + [s.get_width() + 2 * padding for s in sprites.values()])
+        self.rects = {}
+        x = y = shelf = 0
+        for name in sorted(sprites, key=lambda n: -sprites[n].get_height()):
+            w, h = sprites[name].get_size()
+            if x + w + padding > width:
+                x, y = 0, y + shelf
+                shelf = 0
+            self.rects[name] = pygame.Rect(x + padding, y + padding, w, h)
+            x += w + padding
+            shelf = max(shelf, h + padding)
+        height = max(1, y + shelf + padding)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        for name, rect in self.rects.items():
+            self.surface.blit(sprites[name], rect, special_flags=pygame.BLEND_RGBA_MAX)
+
+    def get(self, name):
+        return self.surface.subsurface(self.rects[name])
+
+
+def choose_format(kind, options):
+    """The format a surface of alpha ``kind`` is drawn with, among its ``options``."""
+    if kind == "opaque":
+        return "opaque"
+    if kind == "binary" and "colorkey" in options:
+        return "colorkey"
+    return "alpha"
+
+
+def candidates(surface, kind, atlas=None, name=None):
+    found = {"alpha": surface.convert_alpha()}
+    if kind == "opaque":
+        found["opaque"] = surface.convert()
+    elif kind == "binary":
+        keyed = colorkeyed(surface)
+        if keyed is not None:
+            found["colorkey"] = keyed
+    if kind != "opaque":
+        rle = surface.copy()
+        rle.set_alpha(255, pygame.RLEACCEL)
+        found["alpha-rle"] = rle
+    if atlas is not None and name in atlas.rects:
+        found["atlas"] = atlas.get(name)
+    return found
+
+
+def optimize_assets(surfaces, sprites, target_size, names=None, timed=False):
+    """Convert each surface to its blit format; return (assets, atlas, report).
+
+    ``sprites`` names the entries packed into the atlas; the rest (backgrounds)
+    are only converted. Only ``names`` are optimized when given, e.g. after one
+    file changed. Report rows are (name, kind, chosen, {format: us per blit}),
+    with the timings left empty unless ``timed``.
+    """
+    target = pygame.Surface(target_size).convert() if timed else None
+    atlas = Atlas({name: surfaces[name] for name in sprites})
+    assets = {}
+    report = []
+    for name in names or surfaces:
+        surface = surfaces[name]
+        kind = alpha_kind(surface)
+        options = candidates(surface, kind, atlas, name)
+        chosen = choose_format(kind, options)
+        timings = {}
+        if timed:
+            repeats = BLIT_REPEATS if name in sprites else BACKGROUND_REPEATS
+            timings = {fmt: measure_blit(option, target, repeats) for fmt, option in options.items()}
+        assets[name] = options[chosen]
+        report.append((name, kind, chosen, timings))
+    return assets, atlas, report
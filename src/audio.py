@@ -1,12 +1,53 @@
-"""Procedural audio helpers."""
+"""Procedural audio helpers and the positional audio engine.
+
+``AudioEngine`` owns a fixed pool of reserved mixer channels. Each emitter (the
+dog, the ghost, the tentacle, the TV and the fan) has a priority; a sound that
+finds no free channel takes the one playing the lowest-priority sound, or is
+dropped if everything playing matters more. Stereo levels come from two
+precomputed tables, constant-power pan by horizontal offset and quantized
+distance rolloff, and a channel's volume is only set again when its emitter
+moves into a different pan step or gain level, not every frame.
+
+Bus handlers can run on the simulation thread, so they only queue their
+sounds; ``update`` plays them on the thread that owns the mixer.
+"""
 
 import array
+import functools
 import math
+import random
+from collections import deque, namedtuple
 
 import pygame
 
+from .constants import HEIGHT, ROOM_LIVING, WIDTH
+from .events import Died, DogBarked, Won
+
+SAMPLE_RATE = 44100
+CHANNELS = 8
+PAN_STEPS = 33
+PAN_WIDTH = WIDTH / 2  # Horizontal offset that pans fully to one side.
+DISTANCE_STEP = 4
+GAIN_LEVELS = 24
+REFERENCE_DISTANCE = 80
+MAX_DISTANCE = math.hypot(WIDTH, HEIGHT)
+# Living room sources heard from the bathroom come through the wall on the left.
+WALL_GAIN = 0.3
+WALL_PAN = -0.6
 
-def make_beep(freq=520, duration=0.25, volume=0.4, sample_rate=44100):
+# name -> priority, base volume, looping. Higher priority keeps its channel.
+Emitter = namedtuple("Emitter", ("priority", "volume", "loop"))
+EMITTERS = {
+    "ghost": Emitter(4, 0.55, True),
+    "tentacle": Emitter(4, 0.7, True),
+    "dog": Emitter(3, 0.8, False),
+    "tv": Emitter(1, 0.35, True),
+    "fan": Emitter(0, 0.25, True),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def make_beep(freq=520, duration=0.25, volume=0.4, sample_rate=SAMPLE_RATE):
     length = int(sample_rate * duration)
     buf = array.array("h")
     amp = int(32767 * volume)
@@ -14,3 +55,208 @@ def make_beep(freq=520, duration=0.25, volume=0.4, sample_rate=44100):
         t = i / sample_rate
         buf.append(int(amp * math.sin(2 * math.pi * freq * t)))
     return pygame.mixer.Sound(buffer=buf.tobytes())
+
+
+@functools.lru_cache(maxsize=None)
+def make_noise(duration=1.0, volume=0.2, smoothing=0.0, seed=0, sample_rate=SAMPLE_RATE):
+    """Looping noise; ``smoothing`` near 1 low-passes it from hiss towards a rumble."""
+    rng = random.Random(seed)  # Own generator: the game's random streams stay untouched.
+    buf = array.array("h")
+    # One-pole low-pass; the gain restores the loudness filtering takes away.
+    amp = 32767 * volume * math.sqrt((1.0 + smoothing) / (1.0 - smoothing))
+    value = 0.0
+    for _ in range(int(sample_rate * duration)):
+        value = value * smoothing + rng.uniform(-1.0, 1.0) * (1.0 - smoothing)
+        buf.append(int(max(-32767, min(32767, amp * value))))
+    return pygame.mixer.Sound(buffer=buf.tobytes())
+
+
+@functools.lru_cache(maxsize=None)
+def make_drone(freq=55, beat=0.7, duration=2.0, volume=0.3, sample_rate=SAMPLE_RATE):
+    """A low tone beating against a slightly detuned copy; loops cleanly over ``duration``."""
+    # Round both frequencies to whole cycles per loop so the seam is silent.
+    f1 = round(freq * duration) / duration
+    f2 = round((freq + beat) * duration) / duration
+    buf = array.array("h")
+    amp = 32767 * volume / 2
+    for i in range(int(sample_rate * duration)):
+        t = i / sample_rate
+        buf.append(int(amp * (math.sin(2 * math.pi * f1 * t) + math.sin(2 * math.pi * f2 * t))))
+    return pygame.mixer.Sound(buffer=buf.tobytes())
+
+
+def default_sounds():
+    return {
+        "dog": make_beep(620, 0.2, 0.5),
+        "ghost": make_drone(110, 0.9, 2.0, 0.3),
+        "tentacle": make_drone(45, 0.4, 2.0, 0.45),
+        "tv": make_noise(1.0, 0.18, 0.0, 1),
+        "fan": make_noise(1.0, 0.25, 0.9, 2),
+    }
+
+
+def pan_table(steps=PAN_STEPS):
+    """(left, right) gains for pan positions -1..1, constant power."""
+    return tuple(
+        (math.cos(i / (steps - 1) * math.pi / 2), math.sin(i / (steps - 1) * math.pi / 2)) for i in range(steps)
+    )
+
+
+def attenuation_table(step=DISTANCE_STEP, reference=REFERENCE_DISTANCE, limit=MAX_DISTANCE, levels=GAIN_LEVELS):
+    """Gain level (0..``levels``) per ``step`` of distance.
+
+    Full volume inside ``reference``, inverse rolloff to silence at ``limit``.
+    Quantizing to levels means moving far away changes nothing audible and so
+    triggers no update, while moving close by does.
+    """
+    table = []
+    for i in range(int(limit // step) + 2):
+        d = i * step
+        gain = min(1.0, reference / max(d, 1e-9)) * max(0.0, 1.0 - d / limit)
+        table.append(round(gain * levels))
+    return tuple(table)
+
+
+class AudioEngine:
+    def __init__(self, sounds=None, channels=CHANNELS):
+        self.sounds = sounds or default_sounds()
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+        pygame.mixer.set_reserved(channels)  # Sound.play() elsewhere never takes ours.
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.owner = [None] * channels
+        self.cells = [None] * channels
+        self.pans = pan_table()
+        self.gains = attenuation_table()
+        self.volume_sets = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.pending = deque()  # (emitter, cell) one-shots from bus handlers; None silences.
+
+    def attach(self, state):
+        """Subscribe to a GameState's bus; lookahead clones use detached buses and stay silent."""
+        state.events.subscribe(DogBarked, self.on_dog_barked)
+        state.events.subscribe(Died, self.on_silence)
+        state.events.subscribe(Won, self.on_silence)
+
+    # Levels -------------------------------------------------------------
+
+    def cell(self, offset):
+        """(pan index, gain level, muffled) for a source at ``offset`` from the listener."""
+        pan = max(-1.0, min(1.0, offset[0] / PAN_WIDTH))
+        dist = min(len(self.gains) - 1, int(math.hypot(offset[0], offset[1]) // DISTANCE_STEP))
+        return round((pan + 1) / 2 * (PAN_STEPS - 1)), self.gains[dist], False
+
+    def wall_cell(self):
+        return round((WALL_PAN + 1) / 2 * (PAN_STEPS - 1)), GAIN_LEVELS, True
+
+    def levels(self, name, cell):
+        pan, level, muffled = cell
+        gain = EMITTERS[name].volume * level / GAIN_LEVELS * (WALL_GAIN if muffled else 1.0)
+        left, right = self.pans[pan]
+        return left * gain, right * gain
+
+    def apply(self, index, name, cell):
+        if self.cells[index] != cell:
+            self.cells[index] = cell
+            self.channels[index].set_volume(*self.levels(name, cell))
+            self.volume_sets += 1
+
+    # Channels -----------------------------------------------------------
+
+    def find(self, name):
+        for i, owner in enumerate(self.owner):
+            if owner == name and self.channels[i].get_busy():
+                return i
+        return None
+
+    def acquire(self, name):
+        """A channel for ``name``: a free one, else the lowest-priority one below it, else None."""
+        lowest = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            if lowest is None or EMITTERS[self.owner[i]].priority < EMITTERS[self.owner[lowest]].priority:
+                lowest = i
+        if lowest is not None and EMITTERS[self.owner[lowest]].priority < EMITTERS[name].priority:
+            self.channels[lowest].stop()
+            self.stolen += 1
+            return lowest
+        self.dropped += 1
+        return None
+
+    def play(self, name, cell):
+        index = self.acquire(name)
+        if index is None:
+            return None
+        self.owner[index] = name
+        self.cells[index] = None
+        self.channels[index].play(self.sounds[name], loops=-1 if EMITTERS[name].loop else 0)
+        self.apply(index, name, cell)  # After play(), which may reset the channel's levels.
+        return index
+
+    def stop(self, name):
+        index = self.find(name)
+        if index is not None:
+            self.channels[index].stop()
+            self.owner[index] = None
+
+    def silence(self):
+        for i, channel in enumerate(self.channels):
+            channel.stop()
+            self.owner[i] = None
+
+    # Game ---------------------------------------------------------------
+
+    def sources(self, view, zones):
+        """{emitter name: cell} for every looping source audible in ``view``."""
+        found = {}
+        if view.intro or view.dead or view.win:
+            return found
+        listener = view.player_center
+        in_living = view.current_room == ROOM_LIVING
+        if view.ghost_rect:
+            x, y, w, h = view.ghost_rect
+            found["ghost"] = self.cell((x + w / 2 - listener[0], y + h / 2 - listener[1]))
+        if view.tentacle_rect:
+            x, y, w, h = view.tentacle_rect
+            found["tentacle"] = self.cell((x + w / 2 - listener[0], y + h / 2 - listener[1]))
+        for name, on in (("tv", view.tv_on), ("fan", view.fan_on)):
+            if on:
+                # The simulation thread may be swapping the room layout in.
+                zone = zones.get("TV" if name == "tv" else "Fan")
+                if zone is not None and in_living:
+                    found[name] = self.cell((zone.centerx - listener[0], zone.centery - listener[1]))
+                else:
+                    found[name] = self.wall_cell()
+        return found
+
+    def update(self, view, zones):
+        """Play queued one-shots, then start, stop and re-level looping emitters from a RenderSnapshot."""
+        while self.pending:
+            sound = self.pending.popleft()
+            if sound is None:
+                self.silence()
+            else:
+                self.play(*sound)
+        wanted = self.sources(view, zones)
+        for i, owner in enumerate(self.owner):
+            if owner is not None and EMITTERS[owner].loop and owner not in wanted:
+                self.channels[i].stop()
+                self.owner[i] = None
+        for name, cell in sorted(wanted.items(), key=lambda item: -EMITTERS[item[0]].priority):
+            index = self.find(name)
+            if index is None:
+                self.play(name, cell)
+            else:
+                self.apply(index, name, cell)
+
+    def on_dog_barked(self, state, event):
+        dog, player = state.dog.rect.center, state.player.rect.center
+        self.pending.append(("dog", self.cell((dog[0] - player[0], dog[1] - player[1]))))
+
+    def on_silence(self, state, event):
+        self.pending.append(None)
+
+    def stats(self):
+        busy = sum(channel.get_busy() for channel in self.channels)
+        return {"busy": busy, "volume_sets": self.volume_sets, "stolen": self.stolen, "dropped": self.dropped}
@@ -0,0 +1,219 @@
+"""Fixed-seed scripted scenarios for measuring the update and render hot paths."""
+
+import gc
+import math
+import time
+import tracemalloc
+
+from .allocs import AllocationTracker, check_budget
+from .constants import AXE_DAY, DAY_SECONDS, HOUR_SECONDS
+from .game import Game
+from .profiler import GAME_PHASES, STATE_PHASES, UI_DRAW_CALLS, percentile
+
+TICK = 1.0 / 60.0
+
+# Metrics where a larger number is better; everything else regresses upward.
+HIGHER_IS_BETTER = ("update_ticks_per_sec", "render_fps")
+# Single worst frames are too noisy to gate on; they are reported only.
+REPORT_ONLY = ("update_max_ms", "render_max_ms")
+
+
+def keep_alive(state):
+    # Scenarios measure steady-state cost, so deaths are undone rather than ending the run.
+    state.hunger = max(state.hunger, 50.0)
+    state.thirst = max(state.thirst, 50.0)
+    state.ghost_attack_timer = 0.0
+    state.dead = False
+
+
+def setup_idle_day(state):
+    state.time_system.time = 4 * HOUR_SECONDS
+
+
+def step_idle_day(state, tick):
+    keep_alive(state)
+    state.sanity = max(state.sanity, 50.0)
+    return 0, 0
+
+
+def setup_night_torch_tv(state):
+    state.time_system.time = 3 * DAY_SECONDS + 8 * HOUR_SECONDS
+    state.tv_on = True
+    state.torch_on = True
+
+
+def step_night_torch_tv(state, tick):
+    keep_alive(state)
+    state.sanity = max(state.sanity, 50.0)
+    state.torch_battery = 100.0
+    state.torch_on = True
+    angle = tick * 0.05
+    return math.cos(angle), math.sin(angle)
+
+
+def setup_hallucination_storm(state):
+    state.time_system.time = HOUR_SECONDS
+    state.curse_timer = DAY_SECONDS
+
+
+def step_hallucination_storm(state, tick):
+    keep_alive(state)
+    state.sanity = 8.0
+    state.curse_timer = DAY_SECONDS
+    if not state.hallucination:
+        state.spawn_hallucination()
+    return 0, 0
+
+
+def setup_tentacle_fight(state):
+    state.time_system.time = (AXE_DAY - 1) * DAY_SECONDS + HOUR_SECONDS
+
+
+def step_tentacle_fight(state, tick):
+    keep_alive(state)
+    state.sanity = max(state.sanity, 50.0)
+    if not state.tentacle:
+        state.spawn_tentacle()
+    elif state.tentacle.in_range(state.player.rect.center):
+        state.axe_attack()
+    return 0, 0
+
+
+SCENARIOS = {
+    "idle_day": (setup_idle_day, step_idle_day),
+    "night_torch_tv": (setup_night_torch_tv, step_night_torch_tv),
+    "hallucination_storm": (setup_hallucination_storm, step_hallucination_storm),
+    "tentacle_fight": (setup_tentacle_fight, step_tentacle_fight),
+}
+
+
+def timing_stats(prefix, samples):
+    ordered = sorted(samples)
+    total = sum(samples)
+    return {
+        f"{prefix}_p50_ms": percentile(ordered, 50) * 1000.0,
+        f"{prefix}_p95_ms": percentile(ordered, 95) * 1000.0,
+        f"{prefix}_p99_ms": percentile(ordered, 99) * 1000.0,
+        f"{prefix}_max_ms": ordered[-1] * 1000.0,
+    }, total
+
+
+def make_game(asset_root, name, seed):
+    setup, _ = SCENARIOS[name]
+    game = Game(asset_root, seed)
+    game.intro = False
+    setup(game.state)
+    return game
+
+
+def run_update(asset_root, name, ticks, seed):
+    _, step = SCENARIOS[name]
+    state = make_game(asset_root, name, seed).state
+    clock = time.perf_counter
+    samples = []
+    gc.collect()
+    for tick in range(ticks):
+        dx, dy = step(state, tick)
+        start = clock()
+        state.move_player(dx, dy, TICK)
+        state.update(TICK)
+        samples.append(clock() - start)
+    stats, total = timing_stats("update", samples)
+    stats["update_ticks_per_sec"] = ticks / total if total else 0.0
+    return stats
+
+
+def run_render(asset_root, name, frames, seed):
+    _, step = SCENARIOS[name]
+    game = make_game(asset_root, name, seed)
+    state = game.state
+    clock = time.perf_counter
+    samples = []
+    gc.collect()
+    for tick in range(frames):
+        dx, dy = step(state, tick)
+        state.move_player(dx, dy, TICK)
+        state.update(TICK)
+        start = clock()
+        game.render()
+        samples.append(clock() - start)
+    stats, total = timing_stats("render", samples)
+    stats["render_fps"] = frames / total if total else 0.0
+    return stats
+
+
+def run_allocations(asset_root, name, ticks, seed, render=True):
+    _, step = SCENARIOS[name]
+    game = make_game(asset_root, name, seed)
+    state = game.state
+    update_bytes = 0
+    render_bytes = 0
+    tracemalloc.start()
+    try:
+        for tick in range(ticks):
+            dx, dy = step(state, tick)
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            state.move_player(dx, dy, TICK)
+            state.update(TICK)
+            update_bytes += tracemalloc.get_traced_memory()[1] - base
+            if render:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                game.render()
+                render_bytes += tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    stats = {"update_alloc_kb_per_tick": update_bytes / ticks / 1024.0}
+    if render:
+        stats["render_alloc_kb_per_frame"] = render_bytes / ticks / 1024.0
+    return stats
+
+
+def run_alloc_budget(asset_root, name, frames, warmup, seed, budget_kb, section_budgets_kb=None):
+    _, step = SCENARIOS[name]
+    game = make_game(asset_root, name, seed)
+    state = game.state
+    tracker = AllocationTracker(window=warmup + frames)
+    tracker.attach(game, "Game", GAME_PHASES)
+    tracker.attach(state, "GameState", STATE_PHASES)
+    tracker.attach(state.ui, "UI", UI_DRAW_CALLS)
+    tracker.enable()
+    try:
+        for tick in range(warmup + frames):
+            dx, dy = step(state, tick)
+            state.move_player(dx, dy, TICK)
+            state.update(TICK)
+            game.render()
+            tracker.end_frame()
+    finally:
+        tracker.disable()
+    return tracker, check_budget(tracker, budget_kb, section_budgets_kb, warmup)
+
+
+def run_scenario(asset_root, name, ticks=3000, frames=600, alloc_ticks=300, seed=1234, render=True):
+    results = run_update(asset_root, name, ticks, seed)
+    if render:
+        results.update(run_render(asset_root, name, frames, seed))
+    if alloc_ticks:
+        results.update(run_allocations(asset_root, name, alloc_ticks, seed, render))
+    return results
+
+
+def compare(results, baseline, threshold=0.2, metric_thresholds=None):
+    metric_thresholds = metric_thresholds or {}
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name, {})
+        for metric, value in metrics.items():
+            base = reference.get(metric)
+            if not base or metric in REPORT_ONLY:
+                continue
+            limit = metric_thresholds.get(metric, threshold)
+            if metric in HIGHER_IS_BETTER:
+                change = (base - value) / base
+            else:
+                change = (value - base) / base
+            if change > limit:
+                regressions.append((name, metric, base, value, change))
+    return regressions
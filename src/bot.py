@@ -0,0 +1,400 @@
+"""Reference AI players: a cheap heuristic policy and an open-loop MCTS planner.
+
+The planner searches over macro-actions (an action held for ``action_time``
+seconds) by simulating clones of the live GameState with the game's own rules,
+finishing each simulation with heuristic rollouts. The tree below the committed
+action is kept between ticks, and search continues while that action plays out.
+"""
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .constants import METER_MAX, ROOM_BATH, ROOM_LIVING
+from .entities import distance
+from .risk import RiskModel
+from .snapshot import clone_state, pack_state, unpack_state
+from .tuning import Tuning
+
+DIAGONAL = math.sqrt(0.5)
+MOVES = {
+    "move_n": (0, -1),
+    "move_s": (0, 1),
+    "move_w": (-1, 0),
+    "move_e": (1, 0),
+    "move_nw": (-DIAGONAL, -DIAGONAL),
+    "move_ne": (DIAGONAL, -DIAGONAL),
+    "move_sw": (-DIAGONAL, DIAGONAL),
+    "move_se": (DIAGONAL, DIAGONAL),
+}
+STEER_PROBE = 12
+# Switch the TV off when, at the current noise sources, a tentacle is due within this many seconds.
+TV_NOISE_MARGIN = 300.0
+ACTIONS = ("idle",) + tuple(MOVES) + (
+    "torch",
+    "interact",
+    "tv",
+    "fan",
+    "ground",
+    "eat",
+    "drink",
+    "liquid",
+    "axe",
+    "switch_room",
+)
+
+
+def legal_actions(state):
+    actions = ["idle", *MOVES, "switch_room"]
+    if state.torch_on or (state.ghost and state.torch_battery > 0):
+        actions.append("torch")
+    living = state.current_room == ROOM_LIVING
+    if living and state.near_zone("TV"):
+        actions.append("tv")
+    if living and state.near_zone("Fan"):
+        actions.append("fan")
+    if living and state.near_zone("Stash") and state.stash_stock > 0:
+        actions.append("interact")
+    if not living and state.near_zone("Sink"):
+        actions.append("interact")
+    if state.near_grounding():
+        actions.append("ground")
+    if state.inventory["food"] > 0:
+        actions.append("eat")
+    if state.inventory["water"] > 0:
+        actions.append("drink")
+    if state.inventory["liquid"] > 0:
+        actions.append("liquid")
+    if state.has_axe and state.axe_cooldown <= 0 and state.tentacle:
+        actions.append("axe")
+    return actions
+
+
+def apply_action(state, action):
+    """Perform the one-shot part of ``action`` and return the movement to hold."""
+    move = MOVES.get(action)
+    if move:
+        return move
+    state.perform(action)
+    return 0, 0
+
+
+def move_toward(state, target, away=False):
+    """Pick the 8-way move closest to ``target`` (or away from it) that isn't blocked."""
+    origin = state.player.rect.center
+    dx = target[0] - origin[0]
+    dy = target[1] - origin[1]
+    if away:
+        dx, dy = -dx, -dy
+    angle = math.atan2(dy, dx)
+    ranked = sorted(MOVES.items(), key=lambda item: -(math.cos(angle) * item[1][0] + math.sin(angle) * item[1][1]))
+    bounds = state.room_bounds()
+    obstacles = state.current_obstacles()
+    for action, (mx, my) in ranked:
+        probe = state.player.rect.move(mx * STEER_PROBE, my * STEER_PROBE)
+        if bounds.contains(probe) and probe.collidelist(obstacles) == -1:
+            return action
+    return ranked[0][0]
+
+
+def heuristic_action(state):
+    player = state.player.rect.center
+    if state.tentacle:
+        tentacle = (state.tentacle.x, state.tentacle.y)
+        if state.has_axe and state.axe_cooldown <= 0 and state.tentacle.in_range(player, state.tuning.AXE_RANGE):
+            return "axe"
+        if not state.has_axe:
+            return move_toward(state, tentacle, away=True)
+    if state.ghost and not state.ghost.banished:
+        if not state.torch_on and state.torch_battery > 0:
+            return "torch"
+        return move_toward(state, (state.ghost.x, state.ghost.y))
+    if state.hallucination:
+        # Grounding at the sink dispels hallucinations, which otherwise shred sanity up close.
+        if state.current_room != ROOM_BATH:
+            return "switch_room"
+        if state.near_grounding() and state.time_system.time - state.grounding_last >= 6.0:
+            return "ground"
+        if not state.near_grounding():
+            return move_toward(state, state.interact_zones["Sink"].center)
+        return move_toward(state, (state.hallucination.x, state.hallucination.y), away=True)
+    if state.torch_on:
+        return "torch"
+    if state.hunger < 45 and state.inventory["food"] > 0:
+        return "eat"
+    if state.thirst < 45 and state.inventory["water"] > 0:
+        return "drink"
+    if state.fan_on:
+        return "fan" if state.current_room == ROOM_LIVING and state.near_zone("Fan") else "idle"
+    if state.thirst < 45 or state.sanity < 45:
+        if state.current_room != ROOM_BATH:
+            return "switch_room"
+        if state.sanity < 45 and state.near_grounding() and state.time_system.time - state.grounding_last >= 6.0:
+            return "ground"
+        if state.thirst < 45 and state.near_zone("Sink"):
+            return "interact"
+        return move_toward(state, state.interact_zones["Sink"].center)
+    if state.tv_on and state.near_zone("TV"):
+        eta = RiskModel(state.tuning).noise_eta(state)
+        if eta is not None and eta <= TV_NOISE_MARGIN:
+            return "tv"
+    return "idle"
+
+
+def evaluate(state):
+    if state.dead:
+        return 0.0
+    if state.win:
+        return 1.0
+    meters = min(state.sanity, state.hunger, state.thirst) / METER_MAX
+    score = 0.4 + 0.45 * meters + 0.05 * state.torch_battery / METER_MAX
+    if state.ghost and not state.ghost.banished:
+        score -= 0.25 * state.ghost_attack_timer / state.tuning.GHOST_KILL_TIME
+    if state.tentacle:
+        gap = distance(state.player.rect.center, (state.tentacle.x, state.tentacle.y))
+        score -= 0.25 * max(0.0, 1.0 - gap / 400.0)
+    if state.hallucination:
+        gap = distance(state.player.rect.center, (state.hallucination.x, state.hallucination.y))
+        score -= 0.1 * max(0.0, 1.0 - gap / 200.0)
+    return max(0.0, min(1.0, score))
+
+
+def simulate(state, action, duration, step):
+    dx, dy = apply_action(state, action)
+    elapsed = 0.0
+    while elapsed < duration and not (state.dead or state.win):
+        state.move_player(dx, dy, step)
+        state.update(step)
+        elapsed += step
+
+
+def play_game(asset_root, bot, seed=None, minutes=60.0, dt=1.0 / 60.0, tuning=None):
+    """Let ``bot`` play a fresh headless game and summarize how it ended."""
+    from .game import GameState
+
+    state = GameState(asset_root, seed, tuning)
+    limit = minutes * 60.0
+    started = time.perf_counter()
+    ticks = 0
+    while not (state.dead or state.win) and state.time_system.time < limit:
+        dx, dy = bot.act(state, dt)
+        state.move_player(dx, dy, dt)
+        state.update(dt)
+        ticks += 1
+    d, h, m = state.time_breakdown()
+    return {
+        "seed": seed,
+        "survived_s": state.time_system.time,
+        "time": f"Day {d} Hour {h:02d}:{m:02d}",
+        "dead": state.dead,
+        "win": state.win,
+        "cause": state.death_monster or state.death_cause,
+        "wall_ms_per_tick": (time.perf_counter() - started) * 1000.0 / max(1, ticks),
+    }
+
+
+class Node:
+    __slots__ = ("children", "visits", "value")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+
+class HeuristicBot:
+    """Plays ``heuristic_action`` directly; the same rules drive the planner's rollouts."""
+
+    def __init__(self, action_time=0.25):
+        self.action_time = action_time
+        self.action = "idle"
+        self.remaining = 0.0
+        self.move = (0, 0)
+
+    def act(self, state, dt):
+        self.remaining -= dt
+        if self.remaining <= 0:
+            self.action = heuristic_action(state)
+            self.remaining = self.action_time
+            self.move = apply_action(state, self.action)
+        return self.move
+
+
+class PlannerBot:
+    def __init__(
+        self,
+        budget_ms=4.0,
+        action_time=0.25,
+        depth=3,
+        rollout_time=2.0,
+        step=1.0 / 30.0,
+        exploration=1.2,
+        min_visits=8,
+        margin=0.05,
+        workers=0,
+        seed=None,
+    ):
+        self.budget = budget_ms / 1000.0
+        self.action_time = action_time
+        self.depth = depth
+        self.rollout_time = rollout_time
+        self.step = step
+        self.exploration = exploration
+        self.min_visits = min_visits
+        self.margin = margin
+        self.rng = random.Random(seed)
+        self.root = Node()
+        self.action = "idle"
+        self.remaining = 0.0
+        self.move = (0, 0)
+        self.iterations = 0
+        self.pool = ProcessPoolExecutor(workers, initializer=_init_worker) if workers else None
+        self.pending = None
+        self.decision = 0
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def act(self, state, dt):
+        self.remaining -= dt
+        if self.remaining <= 0:
+            self._collect()
+            self._commit(state)
+        self._dispatch(state)
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            self.iterate(state)
+        self._collect()
+        return self.move
+
+    def _commit(self, state):
+        legal = legal_actions(state)
+        # The rollout policy's choice stands unless search found something clearly better
+        # with enough visits to trust.
+        self.action = heuristic_action(state)
+        default = self.root.children.get(self.action)
+        best_mean = default.value / default.visits if default and default.visits else 0.0
+        for action, child in self.root.children.items():
+            if action in legal and child.visits >= self.min_visits:
+                mean = child.value / child.visits
+                if mean > best_mean + self.margin:
+                    self.action, best_mean = action, mean
+        # Reuse the subtree under the chosen action as the next decision's root.
+        self.root = self.root.children.get(self.action) or Node()
+        self.remaining = self.action_time
+        self.move = apply_action(state, self.action)
+        self.decision += 1
+
+    def iterate(self, state):
+        sim = clone_state(state, random.Random(self.rng.getrandbits(32)))
+        dx, dy = self.move
+        elapsed = 0.0
+        while elapsed < self.remaining and not (sim.dead or sim.win):
+            sim.move_player(dx, dy, self.step)
+            sim.update(self.step)
+            elapsed += self.step
+        path = [self.root]
+        node = self.root
+        for _ in range(self.depth):
+            if sim.dead or sim.win:
+                break
+            action, node = self._select(node, sim)
+            simulate(sim, action, self.action_time, self.step)
+            path.append(node)
+        value = self.rollout(sim)
+        for visited in path:
+            visited.visits += 1
+            visited.value += value
+        self.iterations += 1
+
+    def _select(self, node, sim):
+        legal = legal_actions(sim)
+        untried = [action for action in legal if action not in node.children]
+        if untried:
+            preferred = heuristic_action(sim)
+            action = preferred if preferred in untried else self.rng.choice(untried)
+            child = node.children[action] = Node()
+            return action, child
+        log_total = math.log(max(1, node.visits))
+        best = None
+        best_score = -1.0
+        for action in legal:
+            child = node.children[action]
+            score = child.value / child.visits + self.exploration * math.sqrt(log_total / child.visits) if child.visits else 2.0
+            if score > best_score:
+                best, best_score = action, score
+        return best, node.children[best]
+
+    def rollout(self, sim):
+        elapsed = 0.0
+        while elapsed < self.rollout_time and not (sim.dead or sim.win):
+            simulate(sim, heuristic_action(sim), self.action_time, self.step)
+            elapsed += self.action_time
+        return evaluate(sim)
+
+    def _dispatch(self, state):
+        if not self.pool or self.pending:
+            return
+        params = (self.depth, self.rollout_time, self.step, self.exploration, self.action_time)
+        future = self.pool.submit(
+            _search_worker,
+            pack_state(state),
+            state.tuning.overrides(),
+            self.action,
+            self.remaining,
+            self.budget * 4,
+            params,
+            self.rng.getrandbits(32),
+        )
+        self.pending = (self.decision, future)
+
+    def _collect(self):
+        # Never block the game thread on workers; late results for an old decision are dropped.
+        if not self.pending:
+            return
+        decision, future = self.pending
+        if not future.done():
+            return
+        self.pending = None
+        stats = future.result()
+        if decision != self.decision:
+            return
+        for action, (visits, value) in stats.items():
+            child = self.root.children.get(action)
+            if child is None:
+                child = self.root.children[action] = Node()
+            child.visits += visits
+            child.value += value
+            self.root.visits += visits
+            self.root.value += value
+
+
+_worker_state = None
+
+
+def _init_worker():
+    global _worker_state
+    from .game import GameState, default_asset_root
+    from .headless import init_headless
+
+    init_headless()
+    _worker_state = GameState(default_asset_root())
+
+
+def _search_worker(data, overrides, action, remaining, budget, params, seed):
+    depth, rollout_time, step, exploration, action_time = params
+    # Snapshots do not carry tuning; plan against the same balance as the game being played.
+    if _worker_state.tuning.overrides() != overrides:
+        _worker_state.apply_tuning(Tuning(**overrides))
+    state = unpack_state(data, _worker_state)
+    bot = PlannerBot(budget * 1000.0, action_time, depth, rollout_time, step, exploration, seed=seed)
+    bot.action = action
+    bot.remaining = remaining
+    bot.move = MOVES.get(action, (0, 0))
+    deadline = time.perf_counter() + budget
+    while time.perf_counter() < deadline:
+        bot.iterate(state)
+    return {action: (child.visits, child.value) for action, child in bot.root.children.items()}
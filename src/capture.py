@@ -0,0 +1,177 @@
+"""Asynchronous frame capture to raw video, PNG sequences or an encoder pipe.
+
+``FrameCapture.capture`` copies the display surface into one of a fixed pool
+of preallocated buffers (a straight memory copy, no per-frame allocation) and
+queues it for a background writer thread. When every buffer is still waiting
+to be written, the frame is dropped and counted instead of stalling the game
+loop; offline exports pass ``block=True`` to wait instead.
+
+Formats:
+    raw     one ``frames.raw`` file of packed frames plus ``frames.json`` with
+            size, pitch and pixel format
+    png     ``frame_000000.png`` ... encoded by ``writers`` threads, since PNG
+            compression is the slow step
+    ffmpeg  pipe frames into a local ``ffmpeg`` to produce ``capture.mp4``
+"""
+
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+
+import pygame
+
+FORMATS = ("raw", "png", "ffmpeg")
+
+
+def pixel_format(surface):
+    """Return (pygame buffer format, ffmpeg pix_fmt) for a 32-bit surface's byte order."""
+    if surface.get_bytesize() != 4:
+        return None, None
+    r, g, b, a = surface.get_masks()
+    if (r, g, b) == (0xFF0000, 0xFF00, 0xFF):
+        return "BGRA", "bgra" if a else "bgr0"
+    if (r, g, b) == (0xFF, 0xFF00, 0xFF0000):
+        return "RGBA", "rgba" if a else "rgb0"
+    return None, None
+
+
+class FrameCapture:
+    def __init__(self, directory, fmt="raw", fps=60, pool_size=8, writers=2):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown capture format {fmt!r}; expected one of {FORMATS}.")
+        if fmt == "ffmpeg" and not shutil.which("ffmpeg"):
+            raise RuntimeError("ffmpeg was not found on PATH.")
+        self.directory = directory
+        self.fmt = fmt
+        self.fps = fps
+        os.makedirs(directory, exist_ok=True)
+        self.frame_bytes = None
+        self.free = queue.SimpleQueue()
+        self.pool_size = pool_size
+        self.pending = queue.SimpleQueue()
+        self.frames = 0
+        self.written = 0
+        self.dropped = 0
+        self.layout = None
+        self.output = None
+        # Raw and piped output must stay in order, so only PNG gets several writers.
+        count = writers if fmt == "png" else 1
+        self.threads = [
+            threading.Thread(target=self._run, name=f"frame-writer-{i}", daemon=True) for i in range(count)
+        ]
+        self.lock = threading.Lock()
+        self.started = False
+
+    def _start(self, surface):
+        buffer_format, pix_fmt = pixel_format(surface)
+        if buffer_format is None:
+            raise ValueError("Frame capture needs a 32-bit RGB or BGR surface.")
+        pitch = surface.get_pitch()
+        self.frame_bytes = pitch * surface.get_height()
+        self.layout = {
+            "width": surface.get_width(),
+            "height": surface.get_height(),
+            "pitch": pitch,
+            "format": buffer_format,
+            "masks": list(surface.get_masks()),
+            "pix_fmt": pix_fmt,
+            "fps": self.fps,
+        }
+        for _ in range(self.pool_size):
+            self.free.put(bytearray(self.frame_bytes))
+        if self.fmt == "raw":
+            self.output = open(os.path.join(self.directory, "frames.raw"), "wb")
+        elif self.fmt == "ffmpeg":
+            self.output = subprocess.Popen(
+                [
+                    "ffmpeg", "-loglevel", "error", "-y",
+                    "-f", "rawvideo", "-pix_fmt", pix_fmt,
+                    "-s", f"{pitch // 4}x{surface.get_height()}", "-r", str(self.fps),
+                    "-i", "-",
+                    "-vf", f"crop={surface.get_width()}:{surface.get_height()}:0:0",
+                    "-pix_fmt", "yuv420p", os.path.join(self.directory, "capture.mp4"),
+                ],
+                stdin=subprocess.PIPE,
+            )
+        self.started = True
+        for thread in self.threads:
+            thread.start()
+
+    def capture(self, surface, block=False):
+        """Queue a copy of ``surface``; return False if the frame was dropped."""
+        if not self.started:
+            self._start(surface)
+        try:
+            buf = self.free.get(block)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        view = surface.get_buffer()
+        memoryview(buf)[:] = view
+        del view  # Release the surface lock before the next blit.
+        self.pending.put((self.frames, buf))
+        self.frames += 1
+        return True
+
+    def close(self):
+        if not self.started:
+            return self.stats()
+        for thread in self.threads:
+            self.pending.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.fmt == "raw":
+            self.output.close()
+        elif self.fmt == "ffmpeg":
+            self.output.stdin.close()
+            self.output.wait()
+        layout = dict(self.layout, frames=self.written, dropped=self.dropped, format_name=self.fmt)
+        with open(os.path.join(self.directory, "frames.json"), "w", encoding="utf-8") as f:
+            json.dump(layout, f, indent=2)
+        return self.stats()
+
+    def stats(self):
+        return {"frames": self.frames, "written": self.written, "dropped": self.dropped}
+
+    def _run(self):
+        image = None
+        if self.fmt == "png":
+            image = frame_surface(self.layout)
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            index, buf = item
+            if self.fmt == "raw":
+                self.output.write(buf)
+            elif self.fmt == "ffmpeg":
+                self.output.stdin.write(buf)
+            else:
+                image.get_buffer().write(bytes(buf))
+                pygame.image.save(image, os.path.join(self.directory, f"frame_{index:06d}.png"))
+            with self.lock:
+                self.written += 1
+            self.free.put(buf)
+
+
+def frame_surface(layout):
+    """An opaque surface with the captured pixel layout, for decoding frames."""
+    return pygame.Surface((layout["width"], layout["height"]), 0, 32, layout["masks"])
+
+
+def read_raw(directory):
+    """Yield frames of a raw capture as surfaces."""
+    with open(os.path.join(directory, "frames.json"), encoding="utf-8") as f:
+        layout = json.load(f)
+    frame_bytes = layout["pitch"] * layout["height"]
+    with open(os.path.join(directory, "frames.raw"), "rb") as f:
+        while True:
+            data = f.read(frame_bytes)
+            if len(data) < frame_bytes:
+                break
+            image = frame_surface(layout)
+            image.get_buffer().write(data)
+            yield image
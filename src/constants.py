@@ -54,6 +54,19 @@ HALLUCINATION_SPEED = 55
 GHOST_KILL_TIME = 10.0
 GHOST_BANISH_TIME = 8.0
 
+# Spawn rolls: the ghost every 10 s (days 1-2 only in the living room), hallucinations
+# every 6 s in the living room, tentacles every tick while hunting or after three liquids.
+GHOST_ROLL_SECONDS = 10.0
+GHOST_CHANCE_EARLY = 0.2
+GHOST_CHANCE = 0.35
+GHOST_EARLY_DAYS = 2
+HALLUCINATION_ROLL_SECONDS = 6.0
+HALLUCINATION_SANITY_BONUS = 0.2
+TENTACLE_HUNT_DAY = 4
+TENTACLE_HUNT_CHANCE = 0.01
+TENTACLE_LIQUID_USES = 3
+TENTACLE_LIQUID_CHANCE = 0.015
+
 HALLUCINATION_BASE = 0.03
 BREACH_BASE = 0.02
 BREACH_CURSE_BONUS = 0.05
@@ -84,3 +97,5 @@ ASSET_DEAD_DOG = "sprites/dead_dog.png"
 ASSET_GHOST = "sprites/girl_ghost.png"
 ASSET_GHOST_RED = "sprites/girl_ghost_red_eyes.png"
 ASSET_TENTACLE = "sprites/tentacle_monster.png"
+ASSET_FONT = "fonts/hud.ttf"
+ASSET_FONT_BOLD = "fonts/hud_bold.ttf"
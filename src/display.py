@@ -0,0 +1,72 @@
+"""Window with an internal render resolution scaled to the window once per frame.
+
+The game draws in logical 960x540 coordinates multiplied by the render scale
+onto ``canvas``. ``present`` scales the canvas straight into a letterboxed
+subsurface of the window in a single pass. When the canvas matches the window
+exactly, it *is* the window surface and no scaling happens at all.
+"""
+
+import pygame
+
+from .constants import HEIGHT, WIDTH
+
+_active = None
+
+
+def canvas():
+    """The surface game frames are drawn on: the active Display's canvas, or the window."""
+    return _active.canvas if _active else pygame.display.get_surface()
+
+
+def render_scale():
+    return _active.scale if _active else 1.0
+
+
+class Display:
+    def __init__(self, window_size=(WIDTH, HEIGHT), scale=1.0, resizable=True, smooth=False):
+        global _active
+        self.scale = scale
+        self.size = (max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale)))
+        self.flags = pygame.RESIZABLE if resizable else 0
+        self.smooth = smooth
+        self.window = None
+        self.canvas = None
+        self.target = None
+        self.rect = None
+        self.resize(window_size)
+        _active = self
+
+    def resize(self, window_size):
+        self.window = pygame.display.set_mode(window_size, self.flags)
+        width, height = self.window.get_size()
+        fit = min(width / self.size[0], height / self.size[1])
+        self.rect = pygame.Rect(0, 0, max(1, int(self.size[0] * fit)), max(1, int(self.size[1] * fit)))
+        self.rect.center = (width // 2, height // 2)
+        if self.rect.size == self.size and self.rect.topleft == (0, 0):
+            self.canvas = self.window
+            self.target = None
+        else:
+            if self.canvas is None or self.canvas is self.window:
+                self.canvas = pygame.Surface(self.size).convert()
+            self.window.fill((0, 0, 0))
+            self.target = self.window.subsurface(self.rect)
+        return self.canvas
+
+    def present(self):
+        if self.target is None:
+            return
+        if self.smooth:
+            pygame.transform.smoothscale(self.canvas, self.rect.size, self.target)
+        else:
+            pygame.transform.scale(self.canvas, self.rect.size, self.target)
+
+    def to_logical(self, pos):
+        """Map a window position (e.g. the mouse) to logical 960x540 coordinates."""
+        x = (pos[0] - self.rect.x) * WIDTH / self.rect.w
+        y = (pos[1] - self.rect.y) * HEIGHT / self.rect.h
+        return x, y
+
+    def close(self):
+        global _active
+        if _active is self:
+            _active = None
@@ -77,7 +77,8 @@ class Dog:
 
 
 class Ghost:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None):
+        self.rng = rng or random
         self.x = x
         self.y = y
         self.speed = GHOST_SPEED
@@ -96,7 +97,7 @@ class Ghost:
             return
         self.attack_timer += dt
         tx, ty = target_pos
-        if random.random() < 0.1:
+        if self.rng.random() < 0.1:
             return
         angle = math.atan2(ty - self.y, tx - self.x)
         self.x += math.cos(angle) * self.speed * dt
@@ -144,5 +145,5 @@ class Tentacle:
     def rect(self):
         return pygame.Rect(int(self.x - 24), int(self.y - 24), 48, 48)
 
-    def in_range(self, player_pos):
-        return distance((self.x, self.y), player_pos) <= AXE_RANGE
+    def in_range(self, player_pos, reach=AXE_RANGE):
+        return distance((self.x, self.y), player_pos) <= reach
@@ -0,0 +1,49 @@
+"""Typed publish/subscribe bus for game transitions.
+
+Systems publish an event when something changes (a new phase or day, an
+entity spawning or leaving, a meter crossing a threshold, a bark, death) instead of
+every consumer re-checking shared GameState fields each tick. Handlers are
+called as ``handler(state, event)`` from pre-built tuples, so publishing is a
+dict lookup and a loop.
+
+A GameState's bus starts from the game's own handlers (``base``). Consumers
+attached later (telemetry, audio, tools) are dropped by ``detached``, which
+is what lookahead clones use so imagined futures reach no one outside.
+"""
+
+from collections import namedtuple
+
+PhaseChanged = namedtuple("PhaseChanged", ("day", "phase", "previous"))
+DayChanged = namedtuple("DayChanged", ("day", "previous"))
+Spawned = namedtuple("Spawned", ("entity",))
+Despawned = namedtuple("Despawned", ("entity", "reason"))
+MeterCrossed = namedtuple("MeterCrossed", ("meter", "threshold", "value", "rising"))
+Died = namedtuple("Died", ("cause", "monster"))
+Won = namedtuple("Won", ())
+DogBarked = namedtuple("DogBarked", ())
+
+EVENT_TYPES = (PhaseChanged, DayChanged, Spawned, Despawned, MeterCrossed, Died, Won, DogBarked)
+
+
+class EventBus:
+    def __init__(self, base=None):
+        self.base = dict(base or {})
+        self.handlers = dict(self.base)
+
+    def subscribe(self, event_type, handler):
+        self.handlers[event_type] = self.handlers.get(event_type, ()) + (handler,)
+        return handler
+
+    def unsubscribe(self, event_type, handler):
+        handlers = list(self.handlers.get(event_type, ()))
+        if handler in handlers:
+            handlers.remove(handler)
+            self.handlers[event_type] = tuple(handlers)
+
+    def publish(self, state, event):
+        for handler in self.handlers.get(event.__class__, ()):
+            handler(state, event)
+
+    def detached(self):
+        """A bus with only the base handlers."""
+        return EventBus(self.base)
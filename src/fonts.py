@@ -0,0 +1,141 @@
+"""Fonts from bundled files and pre-rasterized glyph atlases for HUD text.
+
+Fonts come from ``assets/fonts/`` and fall back to the font that ships with
+pygame, so no system font scan ever runs and every machine gets the same
+metrics. Each (file, size, bold) is opened once per process; GameStates share
+them.
+
+``GlyphAtlas`` rasterizes a fixed character set once per font and colour into
+one surface. A line of HUD text is composed from atlas glyphs with one
+``blits`` call the first time it is drawn and then kept in a small LRU, so
+the font never rasterizes during play and a frame's text costs one blit per
+line. Glyphs are placed by running sums of per-pair pen steps (advance plus
+fractional kerning), each measured once, so laying out a line measures
+nothing. Lines with characters outside the set fall back to the font.
+"""
+
+import math
+import os
+import string
+from collections import OrderedDict
+
+import pygame
+
+from .assets import resolve_path
+from .constants import ASSET_FONT, ASSET_FONT_BOLD
+
+HUD_CHARSET = string.ascii_letters + string.digits + string.punctuation + " "
+LINE_CACHE_SIZE = 256
+# Copies of a pair measured at once; the font keeps kerning in fractions of a
+# pixel, which only shows over a run of pairs.
+PAIR_REPEAT = 32
+
+_fonts = {}
+_atlases = {}
+
+
+def font_path(asset_root, bold=False):
+    """The bundled font file for the style, or None to use pygame's own font."""
+    if asset_root is None:
+        return None
+    for rel_path in ((ASSET_FONT_BOLD, ASSET_FONT) if bold else (ASSET_FONT,)):
+        path = resolve_path(asset_root, rel_path)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def get_font(asset_root, size, bold=False):
+    path = font_path(asset_root, bold)
+    key = (path, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[key] = pygame.font.Font(path, size)
+        # Only synthesize bold when there is no bold file.
+        if bold and path == font_path(asset_root):
+            font.set_bold(True)
+    return font
+
+
+class GlyphAtlas:
+    def __init__(self, font, color, charset=HUD_CHARSET):
+        self.font = font
+        self.color = color
+        glyphs = [(ch, font.render(ch, True, color)) for ch in charset]
+        # Descenders can reach below get_height(); cells are as tall as the tallest glyph.
+        self.height = max([font.get_height()] + [g.get_height() for _, g in glyphs])
+        self.surface = pygame.Surface((sum(g.get_width() for _, g in glyphs) or 1, self.height), pygame.SRCALPHA)
+        self.surface.fill((*color, 0))
+        self.areas = {}
+        x = 0
+        for ch, glyph in glyphs:
+            self.surface.blit(glyph, (x, 0))
+            self.areas[ch] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+        self.widths = {ch: glyph.get_width() for ch, glyph in glyphs}
+        self.spaced = {ch: font.size((ch + " ") * PAIR_REPEAT)[0] for ch in charset}
+        self.steps = {}
+        self.lines = OrderedDict()
+        self.composed = 0
+        self.rendered = 0
+
+    def size(self, text):
+        return self.font.size(text)
+
+    def step(self, a, b):
+        """Pen distance from ``a`` to a following ``b``: a's advance plus the pair's kerning."""
+        step = self.steps.get(a + b)
+        if step is None:
+            # "ab ab ab ..." less "b b b ...": a's advance and the a-b kerning, N times over.
+            step = self.steps[a + b] = (self.font.size((a + b + " ") * PAIR_REPEAT)[0] - self.spaced[b]) / PAIR_REPEAT
+        return step
+
+    def compose(self, text):
+        """A line built from atlas glyphs, placed at the font's own (kerned) pen positions."""
+        areas, atlas, widths = self.areas, self.surface, self.widths
+        if not all(ch in areas for ch in text):
+            self.rendered += 1
+            return self.font.render(text, True, self.color)
+        blits = []
+        pen = 0.0
+        x = 0
+        for i, ch in enumerate(text):
+            if i:
+                pen += self.step(text[i - 1], ch)
+                x = math.floor(pen)
+            if ch != " ":
+                # MAX keeps the glyph colour where neighbouring glyph boxes overlap.
+                blits.append((atlas, (x, 0), areas[ch], pygame.BLEND_RGBA_MAX))
+        width = x + widths[text[-1]] if text else 0
+        # A new surface is transparent black; MAX takes the glyph colour from the atlas cells.
+        line = pygame.Surface((max(1, width), self.height), pygame.SRCALPHA)
+        line.blits(blits, doreturn=False)
+        self.composed += 1
+        return line
+
+    def line(self, text):
+        line = self.lines.get(text)
+        if line is None:
+            line = self.lines[text] = self.compose(text)
+            if len(self.lines) > LINE_CACHE_SIZE:
+                self.lines.popitem(last=False)
+        else:
+            self.lines.move_to_end(text)
+        return line
+
+    def draw(self, surface, text, pos):
+        """Blit ``text`` at ``pos``; returns its width."""
+        line = self.line(text)
+        surface.blit(line, pos)
+        return line.get_width()
+
+
+def glyph_atlas(font, color):
+    """The shared atlas for a font (from get_font) in one colour."""
+    key = (font, tuple(color))
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font, color)
+    return atlas
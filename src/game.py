@@ -3,109 +3,94 @@
 import math
 import os
 import random
+import threading
+import time
 
 import pygame
 
+from .allocs import FRAME_ALLOC_BUDGET_KB, AllocationTracker
 from .assets import load_assets
-from .audio import make_beep
+from .audio import AudioEngine
+from .capture import FrameCapture
 from .constants import (
-    AXE_COOLDOWN,
-    AXE_DAY,
-    AXE_RANGE,
     DAY_SECONDS,
     FPS,
-    GHOST_BANISH_TIME,
-    GHOST_KILL_TIME,
     HEIGHT,
     HOUR_SECONDS,
-    HUNGER_DRAIN_DAY,
-    HUNGER_DRAIN_MORNING,
-    HUNGER_DRAIN_NIGHT,
-    METER_MAX,
-    NOISE_DECAY,
-    NOISE_FAN,
-    NOISE_MOVE,
-    NOISE_THRESHOLD_TENTACLE,
-    NOISE_TORCH,
-    NOISE_TV,
-    PLAYER_SPEED,
     ROOM_BATH,
     ROOM_LIVING,
-    SANITY_DRAIN_DAY,
-    SANITY_DRAIN_MORNING,
-    SANITY_DRAIN_NIGHT,
-    STRANGE_LIQUID_COOLDOWN,
-    STRANGE_LIQUID_CURSE,
-    THIRST_DRAIN_DAY,
-    THIRST_DRAIN_MORNING,
-    THIRST_DRAIN_NIGHT,
-    TV_OVERUSE_LIMIT,
-    TV_OVERUSE_PENALTY,
-    TV_SANITY_GAIN,
     WHITE,
     WIDTH,
 )
+from .bot import PlannerBot
+from .display import Display, canvas, render_scale
 from .entities import Dog, Ghost, Hallucination, Player, Tentacle, distance
+from .events import DayChanged, Despawned, Died, DogBarked, EventBus, MeterCrossed, PhaseChanged, Spawned, Won
+from .hotreload import HotReloader
+from .pipeline import SimulationThread, make_snapshot
+from .profiler import FRAME_BUDGET_MS, GAME_PHASES, STATE_PHASES, UI_DRAW_CALLS, Profiler
+from .quality import QUALITY_LEVELS, QualityGovernor
+from .replay import ReplayRecorder
+from .risk import HINT_THRESHOLD, RiskModel
+from .rooms import load_rooms
+from .snapshot import load_game, save_game
 from .systems import NoiseSystem, SpawnSystem, TimeSystem
+from .telemetry import (
+    BANISH,
+    DEVICE_FAN,
+    DEVICE_TORCH,
+    DEVICE_TV,
+    GROUNDING,
+    ITEM,
+    ROOM,
+    ROOMS,
+    TOGGLE,
+    TELEMETRY_HANDLERS,
+    TelemetryWriter,
+)
+from .tuning import DEFAULT_TUNING
 from .ui import UI
+from .visibility import Visibility
+
+QUICKSAVE_PATH = "quicksave.bin"
+IDLE_POLL_MS = 100
+TELEMETRY_DIR = "telemetry"
+# Meter -> ascending thresholds; crossing one publishes MeterCrossed.
+METER_THRESHOLDS = (
+    ("hunger", (0,)),
+    ("thirst", (0,)),
+    ("sanity", (0, 35)),
+    ("torch_battery", (0, 20)),
+)
 
 
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
 
-def in_cone(origin, target, direction, max_angle=40, max_distance=260):
-    dx = target[0] - origin[0]
-    dy = target[1] - origin[1]
-    dist = math.hypot(dx, dy)
-    if dist > max_distance:
-        return False
-    if dist == 0:
-        return True
-    nx, ny = dx / dist, dy / dist
-    dot = nx * direction[0] + ny * direction[1]
-    angle = math.degrees(math.acos(clamp(dot, -1, 1)))
-    return angle <= max_angle
-
-
 class GameState:
-    def __init__(self, asset_root):
+    def __init__(self, asset_root, seed=None, tuning=None):
         self.asset_root = asset_root
-        self.assets = load_assets(asset_root)
-        self.ui = UI(pygame.display.get_surface())
+        self.seed = seed
+        self.tuning = tuning or DEFAULT_TUNING
+        self.rng = random.Random(seed)
+        self.replay = None
+        self.assets = load_assets(asset_root, render_scale())
+        self.ui = UI(canvas(), render_scale(), asset_root)
 
         self.current_room = ROOM_LIVING
-        self.living_bounds = pygame.Rect(40, 40, 880, 460)
-        self.bath_bounds = pygame.Rect(80, 80, 800, 420)
         self.doorway_y = (240, 320)
-
-        self.obstacles = {
-            ROOM_LIVING: [
-                pygame.Rect(360, 220, 180, 80),
-                pygame.Rect(120, 380, 160, 40),
-            ],
-            ROOM_BATH: [
-                pygame.Rect(520, 160, 200, 80),
-                pygame.Rect(150, 300, 200, 60),
-            ],
-        }
-
-        self.interact_zones = {
-            "TV": pygame.Rect(140, 160, 80, 40),
-            "Fan": pygame.Rect(260, 180, 40, 40),
-            "Door": pygame.Rect(60, 240, 40, 80),
-            "Sink": pygame.Rect(200, 220, 80, 40),
-            "Bathtub": pygame.Rect(540, 160, 160, 80),
-            "Mirror": pygame.Rect(620, 220, 80, 60),
-            "Stash": pygame.Rect(420, 360, 80, 40),
-            "TopDoor": pygame.Rect(440, 70, 80, 40),
-        }
+        self.obstacles = {}
+        self.interact_zones = {}
+        self.visibility = Visibility(self.obstacles)
+        self.apply_rooms(load_rooms())
 
         self.player = Player(self.living_bounds.centerx, self.living_bounds.centery)
-        self.player.speed = PLAYER_SPEED
+        self.player.speed = self.tuning.PLAYER_SPEED
         self.player_dir = (1, 0)
 
         self.dog = Dog(self.player.rect.centerx - 40, self.player.rect.centery + 20)
+        self.dog.speed = self.tuning.DOG_SPEED
         self.dog_dead = False
 
         self.ghost = None
@@ -124,7 +109,7 @@ class GameState:
         self.curse_timer = 0.0
 
         self.noise = NoiseSystem()
-        self.spawn = SpawnSystem()
+        self.spawn = SpawnSystem(self.rng, self.tuning)
         self.time_system = TimeSystem()
 
         self.messages = []
@@ -145,17 +130,23 @@ class GameState:
         self.ghost_hint_timer = 0.0
         self.hallucination_active = False
         self.tv_broadcast_timer = 0.0
-        self.refill_timer = random.uniform(90.0, 140.0)
+        self.refill_timer = self.rng.uniform(90.0, 140.0)
         self.refill_soon = False
         self.grounding_last = -100.0
         self.grounding_history = []
 
-        self.has_axe = False
+        self.has_axe = self.day >= self.tuning.AXE_DAY
         self.axe_cooldown = 0.0
-        self.bark_sound = make_beep(620, 0.2, 0.5)
         self.tv_static_timer = 0.0
         self.stash_stock = 4
 
+        self.telemetry = None
+        self.session = 0
+        self.events = EventBus(GAME_HANDLERS)
+        self.last_phase = (self.day, self.phase)
+        self.meter_bands = self.meter_levels()
+        self.tentacle_hunt = False
+
     @property
     def day(self):
         return self.time_system.day()
@@ -173,6 +164,48 @@ class GameState:
         if len(self.messages) > self.max_messages:
             self.messages.pop(0)
 
+    def apply_rooms(self, rooms):
+        """Take room geometry from ``rooms`` ({room: Room}), updating the shared dicts in place."""
+        self.living_bounds = rooms[ROOM_LIVING].bounds
+        self.bath_bounds = rooms[ROOM_BATH].bounds
+        self.obstacles.clear()
+        self.obstacles.update((name, room.obstacles) for name, room in rooms.items())
+        self.interact_zones.clear()
+        for room in rooms.values():
+            self.interact_zones.update(room.zones)
+        self.visibility.invalidate()
+        if self.replay:
+            self.replay.rebuilt(rooms)
+
+    def apply_tuning(self, tuning):
+        """Switch to new balance values mid-game; everything else about the run is kept."""
+        self.tuning = tuning
+        self.spawn.tuning = tuning
+        self.player.speed = tuning.PLAYER_SPEED
+        self.dog.speed = tuning.DOG_SPEED
+        self.tentacle_hunt = self.phase == "night" and self.day >= tuning.TENTACLE_HUNT_DAY
+        # An earlier AXE_DAY hands the axe over now; a later one never takes it back.
+        self.has_axe = self.has_axe or self.day >= tuning.AXE_DAY
+        for entity, name in ((self.ghost, "GHOST_SPEED"), (self.hallucination, "HALLUCINATION_SPEED"),
+                             (self.tentacle, "TENTACLE_SPEED")):
+            if entity:
+                entity.speed = getattr(tuning, name)
+        if self.replay:
+            self.replay.retuned(tuning)
+
+    def attach_telemetry(self, writer):
+        self.telemetry = writer
+        self.session = writer.new_session(self.seed)
+        for event_type, handler in TELEMETRY_HANDLERS.items():
+            self.events.subscribe(event_type, handler)
+
+    def emit(self, event):
+        self.events.publish(self, event)
+
+    def record(self, event, *fields):
+        if self.telemetry:
+            self.telemetry.log(event, self.session, self.time_system.time, *fields)
+
     def room_bounds(self):
         return self.living_bounds if self.current_room == ROOM_LIVING else self.bath_bounds
 
@@ -184,6 +217,17 @@ class GameState:
         bounds = self.room_bounds()
         self.player.rect.center = (bounds.centerx, bounds.centery)
         self.add_message(f"Entered {self.current_room}.")
+        self.record(ROOM, ROOMS.index(self.current_room))
+
+    def move_player(self, dx, dy, dt):
+        if self.replay:
+            self.replay.moved(dx, dy)
+        if dx != 0 or dy != 0:
+            length = math.hypot(dx, dy)
+            dx /= length
+            dy /= length
+            self.player_dir = (dx, dy)
+        self.player.move(dx, dy, self.room_bounds(), self.current_obstacles(), dt)
 
     def check_room_connection(self):
         if self.current_room == ROOM_LIVING:
@@ -192,19 +236,21 @@ class GameState:
                     self.current_room = ROOM_BATH
                     self.player.rect.center = (self.bath_bounds.left + 10, self.player.rect.centery)
                     self.add_message("You slip into the bathroom.")
+                    self.record(ROOM, ROOMS.index(ROOM_BATH))
         else:
             if self.player.rect.left <= self.bath_bounds.left + 2:
                 if self.doorway_y[0] <= self.player.rect.centery <= self.doorway_y[1]:
                     self.current_room = ROOM_LIVING
                     self.player.rect.center = (self.living_bounds.right - 10, self.player.rect.centery)
                     self.add_message("You step back into the living room.")
+                    self.record(ROOM, ROOMS.index(ROOM_LIVING))
 
     def update(self, dt):
         if self.dead or self.win:
             return
         self.time_system.update(dt)
         self.check_room_connection()
-        self.update_day_state()
+        self.update_clock()
         self.update_meters(dt)
         self.update_noise(dt)
         self.update_events(dt)
@@ -212,36 +258,86 @@ class GameState:
         self.update_enemies(dt)
         self.update_dog(dt)
         self.check_win()
+        if self.replay:
+            self.replay.tick(self, dt)
 
-    def update_day_state(self):
-        if self.day > 2 and not self.dog_dead:
+    def update_clock(self):
+        time_system = self.time_system
+        if not time_system.phase_changed:
+            return
+        clock = time_system.clock
+        (day, phase), self.last_phase = self.last_phase, (clock.day, clock.phase)
+        if clock.day != day:
+            self.emit(DayChanged(clock.day, day))
+        self.emit(PhaseChanged(clock.day, clock.phase, phase))
+
+    def meter_levels(self):
+        """Which band between its thresholds each meter is in (0 = at or below the lowest)."""
+        return tuple(
+            sum(getattr(self, meter) > t for t in thresholds) for meter, thresholds in METER_THRESHOLDS
+        )
+
+    def check_meters(self):
+        bands = self.meter_levels()
+        if bands == self.meter_bands:
+            return
+        previous, self.meter_bands = self.meter_bands, bands
+        for (meter, thresholds), old, new in zip(METER_THRESHOLDS, previous, bands):
+            value = getattr(self, meter)
+            for band in range(old, new):
+                self.emit(MeterCrossed(meter, thresholds[band], value, True))
+            for band in range(old - 1, new - 1, -1):
+                self.emit(MeterCrossed(meter, thresholds[band], value, False))
+
+    def sync_events(self):
+        """Adopt the current clock and meter bands without publishing, e.g. after loading."""
+        self.time_system.sync()
+        self.last_phase = (self.day, self.phase)
+        self.meter_bands = self.meter_levels()
+        self.tentacle_hunt = self.phase == "night" and self.day >= self.tuning.TENTACLE_HUNT_DAY
+
+    def on_day_changed(self, event):
+        if event.day > 2 and not self.dog_dead:
             self.dog_dead = True
             self.dog.alive = False
             self.add_message("A heavy silence... the dog is gone.")
-        if self.day == AXE_DAY:
+        if event.day >= self.tuning.AXE_DAY:
             self.has_axe = True
 
+    def on_phase_changed(self, event):
+        self.tentacle_hunt = event.phase == "night" and event.day >= self.tuning.TENTACLE_HUNT_DAY
+
+    def on_meter_crossed(self, event):
+        if event.rising or event.threshold > 0:
+            return
+        if event.meter == "torch_battery":
+            if self.torch_on:
+                self.torch_on = False
+                self.record(TOGGLE, DEVICE_TORCH, False)
+        else:
+            self.kill(event.meter.title())
+
     def update_meters(self, dt):
         minute = dt / 60.0
         if self.phase == "morning":
-            self.hunger = clamp(self.hunger - HUNGER_DRAIN_MORNING * minute, 0, 100)
-            self.thirst = clamp(self.thirst - THIRST_DRAIN_MORNING * minute, 0, 100)
-            self.sanity = clamp(self.sanity - SANITY_DRAIN_MORNING * minute, 0, 100)
+            self.hunger = clamp(self.hunger - self.tuning.HUNGER_DRAIN_MORNING * minute, 0, 100)
+            self.thirst = clamp(self.thirst - self.tuning.THIRST_DRAIN_MORNING * minute, 0, 100)
+            self.sanity = clamp(self.sanity - self.tuning.SANITY_DRAIN_MORNING * minute, 0, 100)
         elif self.phase == "day":
-            self.hunger = clamp(self.hunger - HUNGER_DRAIN_DAY * minute, 0, 100)
-            self.thirst = clamp(self.thirst - THIRST_DRAIN_DAY * minute, 0, 100)
-            self.sanity = clamp(self.sanity - SANITY_DRAIN_DAY * minute, 0, 100)
+            self.hunger = clamp(self.hunger - self.tuning.HUNGER_DRAIN_DAY * minute, 0, 100)
+            self.thirst = clamp(self.thirst - self.tuning.THIRST_DRAIN_DAY * minute, 0, 100)
+            self.sanity = clamp(self.sanity - self.tuning.SANITY_DRAIN_DAY * minute, 0, 100)
         else:
-            self.hunger = clamp(self.hunger - HUNGER_DRAIN_NIGHT * minute, 0, 100)
-            self.thirst = clamp(self.thirst - THIRST_DRAIN_NIGHT * minute, 0, 100)
-            self.sanity = clamp(self.sanity - SANITY_DRAIN_NIGHT * minute, 0, 100)
+            self.hunger = clamp(self.hunger - self.tuning.HUNGER_DRAIN_NIGHT * minute, 0, 100)
+            self.thirst = clamp(self.thirst - self.tuning.THIRST_DRAIN_NIGHT * minute, 0, 100)
+            self.sanity = clamp(self.sanity - self.tuning.SANITY_DRAIN_NIGHT * minute, 0, 100)
 
         if self.tv_on:
-            self.sanity = clamp(self.sanity + TV_SANITY_GAIN * minute, 0, 100)
+            self.sanity = clamp(self.sanity + self.tuning.TV_SANITY_GAIN * minute, 0, 100)
             self.tv_time += dt
             self.tv_overuse += dt
-            if self.tv_overuse > TV_OVERUSE_LIMIT and random.random() < 0.02:
-                self.sanity = clamp(self.sanity - TV_OVERUSE_PENALTY, 0, 100)
+            if self.tv_overuse > self.tuning.TV_OVERUSE_LIMIT and self.rng.random() < 0.02:
+                self.sanity = clamp(self.sanity - self.tuning.TV_OVERUSE_PENALTY, 0, 100)
                 self.add_message("The TV hum digs into your skull.")
         else:
             self.tv_overuse = max(0.0, self.tv_overuse - dt * 0.5)
@@ -251,38 +347,31 @@ class GameState:
 
         if self.torch_on:
             self.torch_battery = clamp(self.torch_battery - 7.0 * minute, 0, 100)
-            if self.torch_battery <= 0:
-                self.torch_on = False
 
         if self.ghost and not self.ghost.banished:
             self.sanity = clamp(self.sanity - 0.7 * minute, 0, 100)
 
         if self.hallucination:
             dist = distance(self.player.rect.center, (self.hallucination.x, self.hallucination.y))
-            if dist < 90 and random.random() < 0.2:
+            if dist < 90 and self.rng.random() < 0.2:
                 self.sanity = clamp(self.sanity - 1.0, 0, 100)
 
-        if self.hunger <= 0:
-            self.kill("Hunger")
-        if self.thirst <= 0:
-            self.kill("Thirst")
-        if self.sanity <= 0:
-            self.kill("Sanity")
+        self.check_meters()
 
     def update_noise(self, dt):
         minute = dt / 60.0
         if self.tv_on:
-            self.noise.add(NOISE_TV * minute)
+            self.noise.add(self.tuning.NOISE_TV * minute)
         if self.fan_on:
-            self.noise.add(NOISE_FAN * minute)
+            self.noise.add(self.tuning.NOISE_FAN * minute)
         if self.player.moving:
-            self.noise.add(NOISE_MOVE * minute)
+            self.noise.add(self.tuning.NOISE_MOVE * minute)
         if self.torch_on:
-            self.noise.add(NOISE_TORCH * minute)
-        self.noise.decay(NOISE_DECAY * minute)
+            self.noise.add(self.tuning.NOISE_TORCH * minute)
+        self.noise.decay(self.tuning.NOISE_DECAY * minute)
         self.noise_peak = self.noise.peak
 
-        if self.noise.value >= NOISE_THRESHOLD_TENTACLE and not self.tentacle:
+        if self.noise.value >= self.tuning.NOISE_THRESHOLD_TENTACLE and not self.tentacle:
             self.spawn_tentacle()
             self.add_message("Something drops from above.")
 
@@ -294,22 +383,22 @@ class GameState:
         if not self.hallucination and self.spawn.update_hallucination(dt, self.sanity, self.current_room):
             self.spawn_hallucination()
 
-        if self.phase == "night" and not self.tentacle and self.day >= 4:
-            if random.random() < 0.01:
+        if self.tentacle_hunt and not self.tentacle:
+            if self.rng.random() < self.tuning.TENTACLE_HUNT_CHANCE:
                 self.spawn_tentacle()
-        if self.liquid_uses >= 3 and not self.tentacle:
-            if random.random() < 0.015:
+        if self.liquid_uses >= self.tuning.TENTACLE_LIQUID_USES and not self.tentacle:
+            if self.rng.random() < self.tuning.TENTACLE_LIQUID_CHANCE:
                 self.spawn_tentacle()
         self.refill_timer -= dt
         self.refill_soon = self.refill_timer < 20.0
         if self.refill_timer <= 0:
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 self.inventory["food"] += 1
                 self.add_message("You find a hidden can nearby.")
             else:
                 self.inventory["water"] += 1
                 self.add_message("A bottle is left by the sink.")
-            self.refill_timer = random.uniform(120.0, 200.0)
+            self.refill_timer = self.rng.uniform(120.0, 200.0)
 
     def update_tv(self, dt):
         if not self.tv_on:
@@ -319,24 +408,29 @@ class GameState:
         if self.tv_broadcast_timer < 8.0:
             return
         self.tv_broadcast_timer = 0.0
-        truth_bias = 0.75 if self.curse_timer <= 0 else 0.45
-        truthful = random.random() < truth_bias
+        model = RiskModel(self.tuning)
+        truthful = self.rng.random() < model.truth_bias(self)
         hints = []
         if self.refill_soon:
             hints.append("Resource refill soon.")
         if self.ghost or self.tentacle:
             hints.append("Breath of something nearby.")
-        if self.phase == "night":
+        risk = model.estimate(self)
+        if not self.ghost and risk.ghost >= HINT_THRESHOLD:
             hints.append("Breach probability rising.")
+        if not self.tentacle and risk.tentacle >= HINT_THRESHOLD:
+            hints.append("Something shifts above the ceiling.")
+        if not self.hallucination and risk.hallucination >= HINT_THRESHOLD:
+            hints.append("Don't trust your eyes.")
         if not hints:
             hints.append("Static drifts across the screen.")
         if truthful:
-            self.add_message(f"TV: {random.choice(hints)}")
+            self.add_message(f"TV: {self.rng.choice(hints)}")
         else:
             self.add_message(
-                f"TV: {random.choice(['All clear.', 'No breach expected.', 'Stay by the door.', 'Nothing out there.'])}"
+                f"TV: {self.rng.choice(['All clear.', 'No breach expected.', 'Stay by the door.', 'Nothing out there.'])}"
             )
-        if random.random() < 0.2:
+        if self.rng.random() < 0.2:
             self.sanity = clamp(self.sanity - 6, 0, 100)
             self.add_message("The broadcast buzzes inside your head.")
 
@@ -346,18 +440,20 @@ class GameState:
             if self.ghost.banished:
                 return
             self.ghost_attack_timer += dt
-            if self.ghost_attack_timer >= GHOST_KILL_TIME:
+            if self.ghost_attack_timer >= self.tuning.GHOST_KILL_TIME:
                 self.kill("Monster", "Dead Girl")
             if self.torch_on and self.torch_hits(self.ghost.rect()):
-                self.ghost.banish(GHOST_BANISH_TIME)
+                self.ghost.banish(self.tuning.GHOST_BANISH_TIME)
                 self.ghost_attack_timer = 0.0
                 self.add_message("The torch burns her away.")
+                self.record(BANISH)
             self.ghost_hint_timer = max(0.0, self.ghost_hint_timer - dt)
         if self.hallucination:
             self.hallucination.update(dt, self.player.rect.center)
             if self.hallucination.life <= 0:
                 self.hallucination = None
                 self.hallucination_active = False
+                self.emit(Despawned("hallucination", "expired"))
         if self.tentacle:
             self.tentacle.update(dt, self.player.rect.center)
             if self.tentacle.rect().colliderect(self.player.rect):
@@ -371,73 +467,88 @@ class GameState:
             self.dog.update(dt, self.player.rect.center)
 
     def kill(self, cause, monster_name=""):
+        if self.dead:
+            return
         self.dead = True
         self.death_cause = cause
         self.death_monster = monster_name
+        self.emit(Died(cause, monster_name))
 
     def check_win(self):
         if self.time_system.time >= DAY_SECONDS * 5:
             self.win = True
+            self.emit(Won())
 
     def time_breakdown(self):
-        total = self.time_system.time
-        day = self.time_system.day()
-        hour = self.time_system.hour()
-        minute = int((total % HOUR_SECONDS) / (HOUR_SECONDS / 60.0))
-        return day, hour, minute
+        clock = self.time_system.current()
+        minute = int((self.time_system.time - clock.hour_start) / (HOUR_SECONDS / 60.0))
+        return clock.day, clock.hour, minute
 
     def spawn_ghost(self):
         x = self.living_bounds.centerx if self.current_room == ROOM_LIVING else self.bath_bounds.centerx
         y = self.living_bounds.centery if self.current_room == ROOM_LIVING else self.bath_bounds.centery
-        self.ghost = Ghost(x, y)
+        self.ghost = Ghost(x, y, self.rng)
+        self.ghost.speed = self.tuning.GHOST_SPEED
         self.ghost_attack_timer = 0.0
         if self.dog.alive:
             self.dog.bark()
-            self.bark_sound.play()
+            self.emit(DogBarked())
             self.add_message("The dog barks at the air.")
         self.add_message("A girl appears in the corner of your eye.")
+        self.emit(Spawned("ghost"))
 
     def spawn_hallucination(self):
         self.hallucination = Hallucination(self.living_bounds.centerx - 160, self.living_bounds.centery)
+        self.hallucination.speed = self.tuning.HALLUCINATION_SPEED
         self.hallucination_active = True
         self.add_message("A hollow figure drifts near.")
+        self.emit(Spawned("hallucination"))
 
     def spawn_tentacle(self):
         self.tentacle = Tentacle(self.living_bounds.right - 60, self.living_bounds.top + 60)
+        self.tentacle.speed = self.tuning.TENTACLE_SPEED
+        self.emit(Spawned("tentacle"))
 
     def torch_hits(self, target_rect):
-        origin = self.player.rect.center
-        return in_cone(origin, target_rect.center, self.player_dir)
+        return self.visibility.lit(self.current_room, self.player.rect.center, self.player_dir, target_rect.center)
 
     def use_item(self, idx):
+        self.record(ITEM, idx, self._use_item(idx))
+
+    def _use_item(self, idx):
         if idx == 1 and self.inventory["food"] > 0:
             self.inventory["food"] -= 1
             self.hunger = clamp(self.hunger + 30, 0, 100)
             self.add_message("You eat food.")
+            return True
         elif idx == 2 and self.inventory["water"] > 0:
             self.inventory["water"] -= 1
             self.thirst = clamp(self.thirst + 30, 0, 100)
             self.add_message("You drink water.")
+            return True
         elif idx == 3 and self.inventory["liquid"] > 0:
-            if self.time_system.time - self.liquid_last < STRANGE_LIQUID_COOLDOWN:
+            if self.time_system.time - self.liquid_last < self.tuning.STRANGE_LIQUID_COOLDOWN:
                 self.add_message("Your body rejects more liquid.")
-                return
+                return False
             self.inventory["liquid"] -= 1
             self.liquid_last = self.time_system.time
             self.liquid_uses += 1
-            self.curse_timer = STRANGE_LIQUID_CURSE
+            self.curse_timer = self.tuning.STRANGE_LIQUID_CURSE
             self.hunger = clamp(self.hunger + 25, 0, 100)
             self.thirst = clamp(self.thirst + 25, 0, 100)
             self.sanity = clamp(self.sanity - 8, 0, 100)
             self.add_message("The liquid soothes your body, but twists your mind.")
+            return True
+        return False
 
     def axe_attack(self):
         if not self.has_axe or self.axe_cooldown > 0:
             return
-        self.axe_cooldown = AXE_COOLDOWN
-        if self.tentacle and self.tentacle.in_range(self.player.rect.center):
+        self.axe_cooldown = self.tuning.AXE_COOLDOWN
+        if self.tentacle and self.tentacle.in_range(self.player.rect.center, self.tuning.AXE_RANGE):
             self.tentacle = None
             self.add_message("You sever the tentacle.")
+            self.emit(Despawned("tentacle", "axe"))
 
     def interact(self):
         if self.current_room == ROOM_LIVING and self.interact_zones["Door"].colliderect(self.player.rect):
@@ -447,21 +558,20 @@ class GameState:
             self.current_room = ROOM_BATH
             self.player.rect.center = (self.bath_bounds.left + 40, self.player.rect.centery)
             self.add_message("You slip into the bathroom.")
+            self.record(ROOM, ROOMS.index(ROOM_BATH))
             return
         if self.current_room == ROOM_LIVING and self.interact_zones["TV"].colliderect(self.player.rect):
-            self.tv_on = not self.tv_on
-            self.add_message("TV on." if self.tv_on else "TV off.")
+            self.toggle_tv()
             return
         if self.current_room == ROOM_LIVING and self.interact_zones["Fan"].colliderect(self.player.rect):
-            self.fan_on = not self.fan_on
-            self.add_message("Fan on." if self.fan_on else "Fan off.")
+            self.toggle_fan()
             return
         if self.current_room == ROOM_LIVING and self.interact_zones["Stash"].colliderect(self.player.rect):
             if self.stash_stock <= 0:
                 self.add_message("The stash is empty.")
                 return
             self.stash_stock -= 1
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 self.inventory["food"] += 1
                 self.add_message("You find food.")
             else:
@@ -472,6 +582,41 @@ class GameState:
             self.inventory["water"] += 1
             self.add_message("You fill a bottle.")
 
+    def toggle_tv(self):
+        self.tv_on = not self.tv_on
+        self.add_message("TV on." if self.tv_on else "TV off.")
+        self.record(TOGGLE, DEVICE_TV, self.tv_on)
+
+    def toggle_fan(self):
+        self.fan_on = not self.fan_on
+        self.add_message("Fan on." if self.fan_on else "Fan off.")
+        self.record(TOGGLE, DEVICE_FAN, self.fan_on)
+
+    def toggle_torch(self):
+        if not self.torch_on and self.torch_battery <= 0:
+            self.add_message("The torch is dead.")
+            return
+        self.torch_on = not self.torch_on
+        self.record(TOGGLE, DEVICE_TORCH, self.torch_on)
+
+    def perform(self, action):
+        """Carry out a one-shot action by name; the keyboard, the bots and replays all come through here."""
+        entry = ACTION_METHODS.get(action)
+        if entry is None:
+            return
+        if self.replay:
+            self.replay.action(action)
+        method, args = entry
+        getattr(self, method)(*args)
+
+    def near_zone(self, name):
+        return self.interact_zones[name].colliderect(self.player.rect)
+
+    def near_grounding(self):
+        if self.current_room != ROOM_BATH:
+            return False
+        return self.near_zone("Sink") or self.near_zone("Mirror")
+
     def grounding(self):
         if self.current_room != ROOM_BATH:
             return
@@ -485,63 +630,203 @@ class GameState:
         factor = 1.0 / (1.0 + recent * 0.6)
         self.sanity = clamp(self.sanity + 14 * factor, 0, 100)
         self.thirst = clamp(self.thirst - 6 * (1.0 + recent * 0.4), 0, 100)
+        self.record(GROUNDING, factor)
         if self.hallucination:
             self.hallucination = None
             self.hallucination_active = False
+            self.emit(Despawned("hallucination", "grounded"))
         if factor < 0.8:
             self.add_message("It isn't working as well...")
         else:
             self.add_message("You steady your breathing.")
 
 
+# One-shot actions -> (GameState method, arguments).
+ACTION_METHODS = {
+    "torch": ("toggle_torch", ()),
+    "interact": ("interact", ()),
+    "tv": ("toggle_tv", ()),
+    "fan": ("toggle_fan", ()),
+    "ground": ("grounding", ()),
+    "eat": ("use_item", (1,)),
+    "drink": ("use_item", (2,)),
+    "liquid": ("use_item", (3,)),
+    "axe": ("axe_attack", ()),
+    "switch_room": ("switch_room", ()),
+}
+
+# The game's own reactions to transitions; every GameState's bus starts with these.
+GAME_HANDLERS = {
+    DayChanged: (GameState.on_day_changed,),
+    PhaseChanged: (GameState.on_phase_changed,),
+    MeterCrossed: (GameState.on_meter_crossed,),
+}
+
+
 class Game:
-    def __init__(self, asset_root):
-        self.state = GameState(asset_root)
-        self.ui = self.state.ui
+    def __init__(self, asset_root, seed=None, tuning=None, telemetry=None, quality=None, audio=None, replay_dir=None):
+        self.tuning = tuning
+        self.telemetry = telemetry
+        self.audio = audio
+        self.replay_dir = replay_dir
+        self.replays = 0
+        self.quality = quality or QualityGovernor()
+        self.profiler = Profiler()
+        self.allocs = AllocationTracker()
+        for tracker in (self.profiler, self.allocs):
+            tracker.attach(self, "Game", GAME_PHASES)
+        self.state = None
+        self.sim = None
+        self.reset_state(asset_root, seed)
         self.intro = True
+        self.bot = None
+        self.capture = None
+        self.view = None
+
+    def reset_state(self, asset_root, seed=None):
+        self.new_state(asset_root, seed)
+        self.attach_ui()
+
+    def new_state(self, asset_root, seed=None):
+        """Replace the GameState; the part of a reset that belongs to the thread ticking it."""
+        self.save_replay()
+        self.state = GameState(asset_root, seed, self.tuning)
+        if self.replay_dir:
+            ReplayRecorder(self.state)
+        if self.telemetry:
+            self.state.attach_telemetry(self.telemetry)
+        if self.audio:
+            self.audio.attach(self.state)
+        for tracker in (self.profiler, self.allocs):
+            tracker.attach(self.state, "GameState", STATE_PHASES)
+
+    def attach_ui(self):
+        """Draw with the current GameState's UI; the part of a reset that belongs to the main thread."""
+        self.ui = self.state.ui
+        if self.audio:
+            self.audio.silence()
+        for tracker in (self.profiler, self.allocs):
+            tracker.attach(self.ui, "UI", UI_DRAW_CALLS)
+
+    def restart(self):
+        if not self.sim:
+            self.reset_state(self.state.asset_root)
+            return
+        # Swap the state in between ticks, and keep drawing with the old UI until it is.
+        done = threading.Event()
+
+        def change():
+            self.new_state(self.state.asset_root)
+            done.set()
+
+        self.sim.call(change)
+        done.wait()
+        self.attach_ui()
+
+    def on_sim(self, change):
+        """Run ``change()`` where the GameState is ticked: between ticks on the simulation thread, if any."""
+        if self.sim:
+            self.sim.call(change)
+        else:
+            change()
+
+    def notify(self, text):
+        self.on_sim(lambda: self.state.add_message(text))
+
+    def handle_control(self, event):
+        """Debug toggles and restarting, on the main thread; True if ``event`` was one of them.
+
+        They change what the main thread draws with (trackers, capture, UI),
+        so unlike gameplay input they are never forwarded to the simulation thread.
+        """
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.allocs.disable()
+            self.profiler.toggle()
+        elif event.key == pygame.K_F6:
+            self.profiler.disable()
+            self.allocs.toggle()
+        elif event.key == pygame.K_F4:
+            path = self.profiler.export_trace(f"profile_{time.strftime('%Y%m%d_%H%M%S')}.json")
+            self.notify(f"Trace saved to {path}.")
+        elif event.key == pygame.K_F7:
+            self.on_sim(self.toggle_bot)
+        elif event.key == pygame.K_F8:
+            self.toggle_capture()
+        elif event.key == pygame.K_r and not self.intro and (self.state.dead or self.state.win):
+            self.restart()
+        else:
+            return False
+        return True
 
     def handle_input(self, event):
+        """Gameplay input; runs on the simulation thread in threaded mode."""
         state = self.state
         if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F5 and not self.intro:
+                save_game(state, QUICKSAVE_PATH)
+                state.add_message("Game saved.")
+                return
+            if event.key == pygame.K_F9 and not self.intro:
+                if os.path.exists(QUICKSAVE_PATH):
+                    load_game(QUICKSAVE_PATH, state)
+                    if state.replay:
+                        state.replay.restored(state)
+                    state.add_message("Game loaded.")
+                return
             if self.intro:
                 if event.key == pygame.K_RETURN:
                     self.intro = False
                 return
             if state.dead or state.win:
-                if event.key == pygame.K_r:
-                    self.state = GameState(state.asset_root)
                 if event.key == pygame.K_ESCAPE:
                     pygame.event.post(pygame.event.Event(pygame.QUIT))
                 return
             if event.key == pygame.K_TAB:
-                state.switch_room()
+                state.perform("switch_room")
             if event.key == pygame.K_e:
-                state.interact()
+                state.perform("interact")
             if event.key == pygame.K_t and state.current_room == ROOM_LIVING:
-                if state.interact_zones["TV"].colliderect(state.player.rect):
-                    state.tv_on = not state.tv_on
-                    state.add_message("TV on." if state.tv_on else "TV off.")
+                if state.near_zone("TV"):
+                    state.perform("tv")
             if event.key == pygame.K_f and state.current_room == ROOM_LIVING:
-                if state.interact_zones["Fan"].colliderect(state.player.rect):
-                    state.fan_on = not state.fan_on
-                    state.add_message("Fan on." if state.fan_on else "Fan off.")
+                if state.near_zone("Fan"):
+                    state.perform("fan")
             if event.key == pygame.K_b:
-                if self.near_grounding():
-                    state.grounding()
+                if state.near_grounding():
+                    state.perform("ground")
             if event.key in (pygame.K_1, pygame.K_2, pygame.K_3):
-                state.use_item(int(event.unicode))
+                state.perform(("eat", "drink", "liquid")[int(event.unicode) - 1])
             if event.key == pygame.K_SPACE:
-                state.axe_attack()
+                state.perform("axe")
             if event.key == pygame.K_l:
-                state.torch_on = not state.torch_on
+                state.perform("torch")
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 3:
-                state.torch_on = not state.torch_on
+                state.perform("torch")
 
-    def update(self, dt):
+    def save_replay(self):
+        """Write the current game's replay, if recording and anything was played."""
         state = self.state
-        if self.intro or state.dead or state.win:
-            return
+        if state is None or not state.replay or not state.replay.ticks:
+            return None
+        os.makedirs(self.replay_dir, exist_ok=True)
+        state.replay.finish(state)
+        self.replays += 1
+        path = os.path.join(self.replay_dir, f"replay_{time.strftime('%Y%m%d_%H%M%S')}_{self.replays}.json")
+        return state.replay.save(path)
+
+    def toggle_bot(self):
+        if self.bot:
+            self.bot.close()
+            self.bot = None
+            self.state.add_message("You take back control.")
+        else:
+            self.bot = PlannerBot()
+            self.state.add_message("The planner bot takes over.")
+
+    def read_movement(self):
         keys = pygame.key.get_pressed()
         dx = dy = 0
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:
@@ -552,113 +837,159 @@ class Game:
             dy -= 1
         if keys[pygame.K_s] or keys[pygame.K_DOWN]:
             dy += 1
-        if dx != 0 or dy != 0:
-            length = math.hypot(dx, dy)
-            dx /= length
-            dy /= length
-            state.player_dir = (dx, dy)
-        state.player.move(dx, dy, state.room_bounds(), state.current_obstacles(), dt)
-        state.update(dt)
+        return dx, dy
+
+    def toggle_capture(self):
+        if self.capture:
+            capture, self.capture = self.capture, None
+            stats = capture.close()
+            self.notify(f"Capture saved to {capture.directory} ({stats['dropped']} dropped).")
+        else:
+            self.capture = FrameCapture(f"capture_{time.strftime('%Y%m%d_%H%M%S')}")
+            self.notify("Recording.")
 
-    def render(self):
+    def update(self, dt, move=None):
         state = self.state
-        bg = state.assets["bg_living"] if state.current_room == ROOM_LIVING else state.assets["bg_bath"]
-        state.ui.screen.blit(bg, (0, 0))
+        if self.intro or state.dead or state.win:
+            return
+        if self.bot:
+            dx, dy = self.bot.act(state, dt)
+        else:
+            dx, dy = move if move is not None else self.read_movement()
+        state.move_player(dx, dy, dt)
+        state.update(dt)
+
+    def snapshot(self):
+        return make_snapshot(self.state, self.intro, self.current_prompt())
+
+    def static_screen(self):
+        """True while the last rendered frame cannot change without input (intro, death, win)."""
+        view = self.view
+        if view is None or self.profiler.enabled or self.allocs.enabled or self.capture:
+            return False
+        return view.intro or view.dead or view.win
+
+    def render(self, view=None):
+        view = self.view = view or self.snapshot()
+        assets = self.state.assets
+        ui = self.ui
+        screen = ui.screen
+        quality = ui.quality = self.quality.settings
+        s = ui.scale
+        at = ui.at
+        if view.intro:
+            # The intro covers the whole screen; skip drawing the scene underneath.
+            ui.draw_intro()
+            return
+        bg = assets["bg_living"] if view.current_room == ROOM_LIVING else assets["bg_bath"]
+        screen.blit(bg, (0, 0))
 
         # Draw dog
-        if state.dog.alive:
-            state.ui.screen.blit(state.assets["dog"], state.dog.rect.topleft)
-        elif state.dog_dead and state.current_room == ROOM_LIVING:
-            state.ui.screen.blit(state.assets["dead_dog"], (200, 420))
+        if view.dog_alive:
+            screen.blit(assets["dog"], at(*view.dog_pos))
+        elif view.dog_dead and view.current_room == ROOM_LIVING:
+            screen.blit(assets["dead_dog"], at(200, 420))
 
         # Draw enemies
-        if state.ghost and not state.ghost.banished:
-            sprite = state.assets["ghost_red"] if state.ghost.attack_timer > 6.0 else state.assets["ghost"]
-            shadow_alpha = 140 if not state.fan_on else 60
-            shadow = pygame.Surface((40, 16), pygame.SRCALPHA)
-            pygame.draw.ellipse(shadow, (20, 20, 20, shadow_alpha), (0, 0, 40, 16))
-            state.ui.screen.blit(shadow, (state.ghost.rect().centerx - 20, state.ghost.rect().bottom - 6))
-            if random.random() < 0.1:
-                ghost_sprite = sprite.copy()
-                ghost_sprite.set_alpha(180)
+        if view.ghost_rect:
+            gx, gy, gw, gh = view.ghost_rect
+            sprite = "ghost_red" if view.ghost_red else "ghost"
+            shadow_rect = (*at(gx + gw // 2 - 20, gy + gh - 6), *at(40, 16))
+            if quality["shadow"] == "alpha":
+                shadow_alpha = 140 if not view.fan_on else 60
+                shadow = pygame.Surface(shadow_rect[2:], pygame.SRCALPHA)
+                pygame.draw.ellipse(shadow, (20, 20, 20, shadow_alpha), shadow.get_rect())
+                screen.blit(shadow, shadow_rect[:2])
             else:
-                ghost_sprite = sprite
-            state.ui.screen.blit(ghost_sprite, state.ghost.rect().topleft)
-            if state.tv_on and state.current_room == ROOM_LIVING:
-                dist = distance(state.player.rect.center, (state.ghost.x, state.ghost.y))
+                pygame.draw.ellipse(screen, (20, 20, 20) if not view.fan_on else (70, 70, 70), shadow_rect)
+            if random.random() < 0.1:
+                sprite += "_flicker"
+            screen.blit(assets[sprite], at(gx, gy))
+            if view.tv_on and view.current_room == ROOM_LIVING:
+                dist = distance(view.player_center, view.ghost_pos)
                 if dist < 160:
-                    tv_rect = state.interact_zones["TV"]
-                    static = pygame.Surface((tv_rect.w, tv_rect.h), pygame.SRCALPHA)
-                    for _ in range(10):
+                    tv_rect = self.state.interact_zones["TV"]
+                    static = pygame.Surface(at(tv_rect.w, tv_rect.h), pygame.SRCALPHA)
+                    for _ in range(quality["tv_static"]):
                         x = random.randint(0, tv_rect.w)
                         y = random.randint(0, tv_rect.h)
-                        pygame.draw.rect(static, (200, 200, 200, 120), (x, y, 6, 2))
-                    state.ui.screen.blit(static, tv_rect.topleft)
+                        pygame.draw.rect(static, (200, 200, 200, 120), (*at(x, y), *at(6, 2)))
+                    screen.blit(static, at(*tv_rect.topleft))
 
-        if state.hallucination:
-            sprite = state.assets["ghost"].copy()
-            sprite.set_alpha(120)
-            state.ui.screen.blit(sprite, state.hallucination.rect().topleft)
+        if view.hallucination_rect:
+            screen.blit(assets["hallucination"], at(*view.hallucination_rect[:2]))
 
-        if state.tentacle:
-            state.ui.screen.blit(state.assets["tentacle"], state.tentacle.rect().topleft)
+        if view.tentacle_rect:
+            screen.blit(assets["tentacle"], at(*view.tentacle_rect[:2]))
 
         # Player
-        state.ui.screen.blit(state.assets["player"], state.player.rect.topleft)
+        screen.blit(assets["player"], at(*view.player_pos))
 
         # Torch cone
-        if state.torch_on:
-            cone = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            origin = state.player.rect.center
-            pygame.draw.polygon(
-                cone,
-                (200, 200, 140, 60),
-                [
-                    origin,
-                    (origin[0] + state.player_dir[0] * 260 - state.player_dir[1] * 120,
-                     origin[1] + state.player_dir[1] * 260 + state.player_dir[0] * 120),
-                    (origin[0] + state.player_dir[0] * 260 + state.player_dir[1] * 120,
-                     origin[1] + state.player_dir[1] * 260 - state.player_dir[0] * 120),
-                ],
-            )
-            state.ui.screen.blit(cone, (0, 0))
+        if view.torch_on:
+            # The beam is the same cached visibility polygon torch_hits tests against,
+            # so furniture casts the shadows the ghost can hide in. It is drawn at the
+            # player's exact position so it moves smoothly; hits are measured from the
+            # quantized origin it was cast from, at most half a POSITION_QUANTUM away.
+            beam = self.state.visibility.beam(view.current_room, view.player_center, view.player_dir)
+            points = beam.polygon(at(*view.player_center), s)
+            if quality["torch"] == "alpha":
+                # Blend only the cone's bounding box instead of a full-screen layer.
+                xs = [p[0] for p in points]
+                ys = [p[1] for p in points]
+                bounds = pygame.Rect(min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+                cone = pygame.Surface(bounds.size, pygame.SRCALPHA)
+                pygame.draw.polygon(cone, (200, 200, 140, 60), [(x - bounds.x, y - bounds.y) for x, y in points])
+                screen.blit(cone, bounds.topleft)
+            else:
+                pygame.draw.polygon(screen, (200, 200, 140), points, 2)
 
-        state.ui.draw_hud(state)
-        state.ui.draw_effects(state)
-        state.ui.draw_prompt(self.current_prompt())
+        ui.draw_hud(view)
+        ui.draw_effects(view)
+        ui.draw_prompt(view.prompt)
 
-        if self.intro:
-            state.ui.draw_intro()
-        if state.dead:
+        if view.dead:
             monster_surface = None
-            monster_name = state.death_cause
-            if state.death_cause == "Monster":
-                monster_name = state.death_monster
+            monster_name = view.death_cause
+            if view.death_cause == "Monster":
+                monster_name = view.death_monster
                 if monster_name == "Dead Girl":
-                    monster_surface = state.assets["ghost_red"]
+                    monster_surface = assets["ghost_red"]
                 elif monster_name == "Tentacle Monster":
-                    monster_surface = state.assets["tentacle"]
-            state.ui.draw_death(state, monster_surface, monster_name)
-            d, h, m = state.time_breakdown()
+                    monster_surface = assets["tentacle"]
+            ui.draw_death(view, monster_surface, monster_name)
+            d, h, m = view.time_breakdown
             summary = [
                 f"Time survived: Day {d} Hour {h:02d}:{m:02d}",
-                f"Cause: {state.death_cause}",
-                f"Liquid uses: {state.liquid_uses}",
-                f"TV time: {int(state.tv_time)}s",
-                f"Noise peak: {int(state.noise_peak)}",
+                f"Cause: {view.death_cause}",
+                f"Liquid uses: {view.liquid_uses}",
+                f"TV time: {int(view.tv_time)}s",
+                f"Noise peak: {int(view.noise_peak)}",
             ]
-            state.ui.draw_summary(summary)
-        if state.win:
-            d, h, m = state.time_breakdown()
+            ui.draw_summary(summary)
+        if view.win:
+            d, h, m = view.time_breakdown
             summary = [
                 f"Time survived: Day {d} Hour {h:02d}:{m:02d}",
                 "You survived all five days.",
-                f"Liquid uses: {state.liquid_uses}",
-                f"TV time: {int(state.tv_time)}s",
-                f"Noise peak: {int(state.noise_peak)}",
+                f"Liquid uses: {view.liquid_uses}",
+                f"TV time: {int(view.tv_time)}s",
+                f"Noise peak: {int(view.noise_peak)}",
             ]
-            state.ui.draw_death(state, None, "Survived")
-            state.ui.draw_summary(summary)
+            ui.draw_death(view, None, "Survived")
+            ui.draw_summary(summary)
+
+    def draw_overlay(self):
+        if self.profiler.enabled:
+            self.ui.draw_profiler(self.profiler.report(), FRAME_BUDGET_MS)
+        if self.allocs.enabled:
+            self.ui.draw_allocations(self.allocs.report(), FRAME_ALLOC_BUDGET_KB)
+
+    def end_frame(self):
+        if self.capture:
+            self.capture.capture(self.ui.screen)
+        if self.allocs.enabled:
+            self.allocs.end_frame()
 
     def current_prompt(self):
         state = self.state
@@ -676,39 +1007,96 @@ class Game:
         if state.current_room == ROOM_BATH:
             if state.interact_zones["Sink"].colliderect(state.player.rect):
                 return "Press E to use sink"
-            if self.near_grounding():
+            if state.near_grounding():
                 return "Press B to ground yourself"
         return ""
 
-    def near_grounding(self):
-        state = self.state
-        if state.current_room != ROOM_BATH:
-            return False
-        return state.interact_zones["Sink"].colliderect(state.player.rect) or state.interact_zones["Mirror"].colliderect(state.player.rect)
+
+def default_asset_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets"))
 
 
-def run_game():
+def run_game(
+    telemetry_dir=TELEMETRY_DIR,
+    threaded=False,
+    quality="auto",
+    scale=1.0,
+    window_size=(WIDTH, HEIGHT),
+    tuning=None,
+    tuning_path=None,
+    hot_reload=False,
+    replay_dir=None,
+):
     pygame.init()
     try:
         pygame.mixer.init()
     except pygame.error:
         pass
-    pygame.display.set_mode((WIDTH, HEIGHT))
-    asset_root = os.path.join(os.path.dirname(__file__), "..", "assets")
-    asset_root = os.path.abspath(asset_root)
+    display = Display(window_size, scale)
     clock = pygame.time.Clock()
-    game = Game(asset_root)
+    telemetry = TelemetryWriter(telemetry_dir) if telemetry_dir else None
+    names = [level["name"] for level in QUALITY_LEVELS]
+    governor = QualityGovernor(level=None if quality == "auto" else names.index(quality))
+    audio = AudioEngine() if pygame.mixer.get_init() else None
+    game = Game(
+        default_asset_root(), tuning=tuning, telemetry=telemetry, quality=governor, audio=audio, replay_dir=replay_dir
+    )
+    sim = None
+    if threaded:
+        sim = game.sim = SimulationThread(game)
+        sim.start()
+    reloader = HotReloader(game, default_asset_root(), tuning_path, sim=sim) if hot_reload else None
 
     running = True
+    idle = False
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        for event in pygame.event.get():
+        if idle:
+            # Static screen already drawn: sleep until input instead of redrawing at FPS.
+            # The threaded renderer polls, since the screen can change without input there.
+            # So does hot reload, which has to notice file changes.
+            first = pygame.event.wait(IDLE_POLL_MS) if sim or reloader else pygame.event.wait()
+            events = [first] + pygame.event.get()
+            elapsed = clock.tick() / 1000.0  # Restart frame timing so the idle time never reaches update().
+            dt = 0.0
+        else:
+            dt = elapsed = clock.tick(FPS) / 1000.0
+            events = pygame.event.get()
+        if reloader and reloader.poll(elapsed):
+            idle = False
+        frame_start = time.perf_counter()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEORESIZE:
+                game.ui.screen = display.resize(event.size)
+            elif game.handle_control(event):
+                pass
+            elif sim:
+                sim.push(event)
             else:
                 game.handle_input(event)
-        game.update(dt)
-        game.render()
+        if sim:
+            sim.move = game.read_movement()
+            game.render(sim.buffer.latest()[0])
+        else:
+            game.update(dt)
+            game.render()
+        if audio:
+            audio.update(game.view, game.state.interact_zones)
+        idle = game.static_screen()
+        game.draw_overlay()
+        display.present()
         pygame.display.flip()
-
+        game.end_frame()
+        if not idle:
+            game.quality.observe((time.perf_counter() - frame_start) * 1000.0)
+
+    if sim:
+        sim.stop()
+    game.save_replay()
+    if game.capture:
+        game.capture.close()
+    if telemetry:
+        telemetry.close()
+    display.close()
     pygame.quit()
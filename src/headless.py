@@ -0,0 +1,21 @@
+"""Windowless pygame setup for tools, benchmarks and bots."""
+
+import os
+
+import pygame
+
+from .constants import HEIGHT, WIDTH
+
+
+def init_headless(size=(WIDTH, HEIGHT)):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass
+    surface = pygame.display.get_surface()
+    if surface is None or surface.get_size() != size:
+        surface = pygame.display.set_mode(size)
+    return surface
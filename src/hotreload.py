@@ -0,0 +1,155 @@
+"""Reload changed assets and tuning into a running game without restarting.
+
+``FileWatcher`` polls file stats and only hashes a file when its mtime or size
+moved, so saving an unchanged file (or touching it) reloads nothing.
+``HotReloader`` maps a changed asset file to the one asset it feeds and
+reloads it (and its variants) in place; a changed tuning file is re-read and
+applied to the live GameState, keeping positions, meters and timers, and so is
+a changed room data file. With a ``SimulationThread`` ticking the state, those
+changes are handed to it and applied between ticks.
+"""
+
+import hashlib
+import json
+import os
+
+from .assets import asset_files, reload_asset
+from .rooms import ROOMS_PATH, load_rooms
+from .tuning import Tuning
+
+RELOAD_INTERVAL = 0.5
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileWatcher:
+    def __init__(self, paths=()):
+        # path -> (mtime_ns, size, sha256), or None while the file is missing.
+        self.seen = {}
+        for path in paths:
+            self.watch(path)
+
+    def watch(self, path):
+        self.seen[path] = self.stamp(path, None)
+
+    def stamp(self, path, previous):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if previous and previous[:2] == (st.st_mtime_ns, st.st_size):
+            return previous
+        try:
+            return st.st_mtime_ns, st.st_size, file_digest(path)
+        except OSError:
+            return None
+
+    def changed(self):
+        """Paths whose contents changed, appeared or disappeared since the last call."""
+        changed = []
+        for path, previous in self.seen.items():
+            current = self.stamp(path, previous)
+            if current is previous:
+                continue
+            self.seen[path] = current
+            if (current and current[2]) != (previous and previous[2]):
+                changed.append(path)
+        return changed
+
+
+def load_tuning(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return Tuning(**json.load(f))
+
+
+class HotReloader:
+    def __init__(self, game, asset_root, tuning_path=None, rooms_path=ROOMS_PATH, interval=RELOAD_INTERVAL, sim=None):
+        self.game = game
+        self.sim = sim
+        self.asset_root = asset_root
+        self.tuning_path = tuning_path
+        self.rooms_path = rooms_path
+        self.interval = interval
+        self.elapsed = 0.0
+        self.watch_assets()
+        self.tuning_watcher = FileWatcher([tuning_path] if tuning_path else ())
+        self.rooms_watcher = FileWatcher([rooms_path])
+
+    def watch_assets(self):
+        # Resolved paths depend on which folders exist, so a new file can move one.
+        self.asset_names = asset_files(self.asset_root)
+        self.asset_watcher = FileWatcher(self.asset_names)
+
+    def apply(self, change):
+        """Run ``change()`` against the live state, on the simulation thread if one owns it."""
+        if self.sim:
+            self.sim.call(change)
+        else:
+            change()
+
+    def message(self, text):
+        self.apply(lambda: self.game.state.add_message(text))
+
+    def poll(self, dt):
+        """Check for changes every ``interval`` seconds; True if anything was reloaded."""
+        self.elapsed += dt
+        if self.elapsed < self.interval:
+            return False
+        self.elapsed = 0.0
+        return self.check()
+
+    def check(self):
+        reloaded = False
+        names = {self.asset_names[path] for path in self.asset_watcher.changed()}
+        current = asset_files(self.asset_root)
+        if current != self.asset_names:
+            moved = set(current.items()) ^ set(self.asset_names.items())
+            names.update(name for _, name in moved)
+            self.watch_assets()
+        for name in sorted(names):
+            reload_asset(self.asset_root, name)
+            self.message(f"Reloaded {name}.")
+            reloaded = True
+        if self.tuning_watcher.changed():
+            reloaded = self.reload_tuning() or reloaded
+        if self.rooms_watcher.changed():
+            reloaded = self.reload_rooms() or reloaded
+        return reloaded
+
+    def reload_rooms(self):
+        try:
+            rooms = load_rooms(self.rooms_path)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            self.message(f"Rooms not reloaded: {exc}")
+            return False
+
+        def change():
+            self.game.state.apply_rooms(rooms)
+            self.game.state.add_message("Reloaded room layout.")
+
+        self.apply(change)
+        return True
+
+    def reload_tuning(self):
+        try:
+            tuning = load_tuning(self.tuning_path)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            self.message(f"Tuning not reloaded: {exc}")
+            return False
+
+        def change():
+            state = self.game.state
+            changed = [name for name, value in tuning.as_dict().items() if getattr(state.tuning, name) != value]
+            self.game.tuning = tuning
+            state.apply_tuning(tuning)
+            if changed:
+                state.add_message("Tuning: " + ", ".join(changed))
+
+        self.apply(change)
+        return True
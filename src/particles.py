@@ -0,0 +1,210 @@
+"""Pooled particles for the sanity, hallucination and curse effects.
+
+Every particle lives in a fixed-capacity pool allocated up front: parallel
+arrays of position, velocity, age and lifetime, updated in bulk each frame
+and drawn with one ``Surface.blits`` call from pre-faded sprites. With NumPy
+installed the update is a handful of array operations over the whole pool,
+so a frame costs the same with 10 particles or the cap; without it the same
+arrays are stepped in a plain loop.
+
+Kinds:
+    mote     dust drifting upwards as sanity drops
+    drip     dark streaks running down from the top while cursed
+    flicker  short-lived stuttering bars while hallucinating
+
+Particles are purely visual and use their own random generator, never the
+game's, so they cannot change a simulation.
+"""
+
+import array
+import math
+import random
+import time
+
+import pygame
+
+from .constants import HEIGHT, WIDTH
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CAPACITY = 512
+ALPHA_LEVELS = 8
+MAX_STEP = 0.1
+FLICKER_HZ = 12.0
+MOTE, DRIP, FLICKER = 0, 1, 2
+# kind -> size, colour, peak alpha, lifetime range (s), speed range (px/s).
+KINDS = {
+    MOTE: ((3, 3), (200, 190, 220), 110, (2.0, 5.0), (8.0, 30.0)),
+    DRIP: ((2, 12), (90, 10, 30), 170, (1.0, 2.5), (20.0, 60.0)),
+    FLICKER: ((60, 3), (120, 80, 140), 70, (0.1, 0.35), (0.0, 0.0)),
+}
+GRAVITY = {MOTE: -4.0, DRIP: 140.0, FLICKER: 0.0}
+
+
+def emission_rates(view):
+    """Particles per second of each kind for the current sanity and curse state."""
+    rates = {}
+    if view.sanity < 60:
+        rates[MOTE] = 80.0 * (60 - view.sanity) / 60
+    if view.curse_timer > 0:
+        rates[DRIP] = 30.0
+    if view.hallucination_active:
+        rates[FLICKER] = 150.0
+    return rates
+
+
+def particle_sprites(scale):
+    """{kind: [sprite per alpha level]}; level 0 is never drawn."""
+    sprites = {}
+    for kind, (size, color, peak, _, _) in KINDS.items():
+        w, h = max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+        levels = [None]
+        for level in range(1, ALPHA_LEVELS):
+            sprite = pygame.Surface((w, h), pygame.SRCALPHA)
+            sprite.fill((*color, round(peak * level / (ALPHA_LEVELS - 1))))
+            levels.append(sprite)
+        sprites[kind] = levels
+    return sprites
+
+
+class ParticlePool:
+    def __init__(self, capacity=CAPACITY, scale=1.0, seed=None):
+        self.capacity = capacity
+        self.scale = scale
+        self.limit = capacity
+        self.rng = random.Random(seed)
+        self.sprites = particle_sprites(scale)
+        self.pending = {}
+        self.last = None
+        if np is not None:
+            self.x = np.zeros(capacity, np.float32)
+            self.y = np.zeros(capacity, np.float32)
+            self.vx = np.zeros(capacity, np.float32)
+            self.vy = np.zeros(capacity, np.float32)
+            self.age = np.ones(capacity, np.float32)
+            self.life = np.zeros(capacity, np.float32)  # age >= life marks a free slot.
+            self.phase = np.zeros(capacity, np.float32)
+            self.kind = np.zeros(capacity, np.int8)
+            self.gravity = np.array([GRAVITY[k] for k in sorted(KINDS)], np.float32)
+        else:
+            self.x, self.y, self.vx, self.vy, self.age, self.life, self.phase = (
+                array.array("f", [value]) * capacity for value in (0, 0, 0, 0, 1, 0, 0)
+            )
+            self.kind = array.array("b", [0]) * capacity
+
+    def alive(self):
+        if np is not None:
+            return int(np.count_nonzero(self.age[: self.limit] < self.life[: self.limit]))
+        return sum(1 for i in range(self.limit) if self.age[i] < self.life[i])
+
+    def clear(self):
+        for i in range(self.capacity):
+            self.age[i] = 1.0
+            self.life[i] = 0.0
+        self.pending.clear()
+
+    def spawn(self, kind, slot):
+        size, _, _, (life_lo, life_hi), (speed_lo, speed_hi) = KINDS[kind]
+        rng = self.rng
+        speed = rng.uniform(speed_lo, speed_hi)
+        if kind == MOTE:
+            angle = rng.uniform(0, 2 * math.pi)
+            x, y, vx, vy = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), math.cos(angle) * speed, math.sin(angle) * speed
+        elif kind == DRIP:
+            x, y, vx, vy = rng.uniform(0, WIDTH), rng.uniform(-size[1], 40), 0.0, speed
+        else:
+            x, y, vx, vy = rng.uniform(-size[0] / 2, WIDTH), rng.uniform(0, HEIGHT), 0.0, 0.0
+        self.x[slot], self.y[slot], self.vx[slot], self.vy[slot] = x, y, vx, vy
+        self.age[slot] = 0.0
+        self.life[slot] = rng.uniform(life_lo, life_hi)
+        self.phase[slot] = rng.random()
+        self.kind[slot] = kind
+
+    def emit(self, rates, dt):
+        """Start new particles in free slots; fractional counts carry over to the next frame."""
+        counts = {}
+        for kind, rate in rates.items():
+            pending = self.pending.get(kind, 0.0) + rate * dt
+            counts[kind] = int(pending)
+            self.pending[kind] = pending - counts[kind]
+        for kind in list(self.pending):
+            if kind not in rates:
+                del self.pending[kind]
+        wanted = sum(counts.values())
+        if not wanted:
+            return
+        if np is not None:
+            free = np.flatnonzero(self.age[: self.limit] >= self.life[: self.limit])[:wanted].tolist()
+        else:
+            free = [i for i in range(self.limit) if self.age[i] >= self.life[i]][:wanted]
+        kinds = [kind for kind, count in sorted(counts.items()) for _ in range(count)]
+        for slot, kind in zip(free, kinds):
+            self.spawn(kind, slot)
+
+    def step(self, dt):
+        if np is not None:
+            self.vy += self.gravity[self.kind] * dt
+            self.x += self.vx * dt
+            self.y += self.vy * dt
+            self.age += dt
+            return
+        x, y, vx, vy, age, life, kind = self.x, self.y, self.vx, self.vy, self.age, self.life, self.kind
+        for i in range(self.limit):
+            if age[i] < life[i]:
+                vy[i] += GRAVITY[kind[i]] * dt
+                x[i] += vx[i] * dt
+                y[i] += vy[i] * dt
+                age[i] += dt
+
+    def levels(self):
+        """(slots, alpha levels) of the particles to draw, fading in and out over each lifetime."""
+        top = ALPHA_LEVELS - 1
+        if np is not None:
+            n = self.limit
+            age, life = self.age[:n], self.life[:n]
+            live = age < life
+            fade = np.sin(np.pi * np.clip(age / np.maximum(life, 1e-6), 0, 1))
+            flicker = (self.kind[:n] == FLICKER) & (((self.phase[:n] + age * FLICKER_HZ) % 1.0) >= 0.5)
+            level = (fade * np.where(flicker, 0.25, 1.0) * top + 0.5).astype(np.int8)
+            slots = np.flatnonzero(live & (level > 0))
+            return slots.tolist(), level[slots].tolist()
+        slots, levels = [], []
+        for i in range(self.limit):
+            if self.age[i] < self.life[i]:
+                a = math.sin(math.pi * self.age[i] / max(self.life[i], 1e-6))
+                if self.kind[i] == FLICKER and (self.phase[i] + self.age[i] * FLICKER_HZ) % 1.0 >= 0.5:
+                    a *= 0.25
+                level = int(a * top + 0.5)
+                if level > 0:
+                    slots.append(i)
+                    levels.append(level)
+        return slots, levels
+
+    def draw(self, surface):
+        slots, levels = self.levels()
+        if not slots:
+            return 0
+        s = self.scale
+        sprites = self.sprites
+        if np is not None:
+            xs = (self.x[slots] * s).astype(np.int32).tolist()
+            ys = (self.y[slots] * s).astype(np.int32).tolist()
+            kinds = self.kind[slots].tolist()
+        else:
+            xs = [int(self.x[i] * s) for i in slots]
+            ys = [int(self.y[i] * s) for i in slots]
+            kinds = [self.kind[i] for i in slots]
+        surface.blits([(sprites[k][lv], (x, y)) for k, lv, x, y in zip(kinds, levels, xs, ys)], doreturn=False)
+        return len(slots)
+
+    def update(self, view, surface, now=None):
+        """Advance by the wall-clock time since the last frame, emit for ``view`` and draw."""
+        now = time.perf_counter() if now is None else now
+        dt = 0.0 if self.last is None else min(MAX_STEP, now - self.last)
+        self.last = now
+        self.emit(emission_rates(view), dt)
+        self.step(dt)
+        return self.draw(surface)
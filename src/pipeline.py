@@ -0,0 +1,179 @@
+"""Threaded simulation/render split.
+
+The simulation thread steps ``Game.update`` at a fixed rate and publishes an
+immutable ``RenderSnapshot`` after each batch of ticks. The main thread keeps
+pygame's window, events and drawing, and renders whichever snapshot is newest,
+so a slow frame never delays the simulation and a slow tick never delays the
+frame.
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from .constants import FPS
+
+# Field names match the GameState attributes the UI reads, so UI.draw_hud and
+# UI.draw_effects accept either.
+RenderSnapshot = namedtuple(
+    "RenderSnapshot",
+    (
+        "intro",
+        "prompt",
+        "current_room",
+        "player_pos",
+        "player_center",
+        "player_dir",
+        "dog_pos",
+        "dog_alive",
+        "dog_dead",
+        "ghost_rect",
+        "ghost_pos",
+        "ghost_red",
+        "hallucination_rect",
+        "tentacle_rect",
+        "torch_on",
+        "tv_on",
+        "fan_on",
+        "sanity",
+        "hunger",
+        "thirst",
+        "torch_battery",
+        "day",
+        "hour",
+        "phase",
+        "inventory",
+        "has_axe",
+        "messages",
+        "hallucination_active",
+        "curse_timer",
+        "dead",
+        "win",
+        "death_cause",
+        "death_monster",
+        "time_breakdown",
+        "liquid_uses",
+        "tv_time",
+        "noise_peak",
+    ),
+)
+
+
+def make_snapshot(state, intro=False, prompt=""):
+    ghost = state.ghost
+    visible_ghost = ghost and not ghost.banished
+    return RenderSnapshot(
+        intro,
+        prompt,
+        state.current_room,
+        tuple(state.player.rect.topleft),
+        tuple(state.player.rect.center),
+        state.player_dir,
+        tuple(state.dog.rect.topleft),
+        state.dog.alive,
+        state.dog_dead,
+        tuple(ghost.rect()) if visible_ghost else None,
+        (ghost.x, ghost.y) if visible_ghost else None,
+        bool(visible_ghost and ghost.attack_timer > 6.0),
+        tuple(state.hallucination.rect()) if state.hallucination else None,
+        tuple(state.tentacle.rect()) if state.tentacle else None,
+        state.torch_on,
+        state.tv_on,
+        state.fan_on,
+        state.sanity,
+        state.hunger,
+        state.thirst,
+        state.torch_battery,
+        state.day,
+        state.hour,
+        state.phase,
+        dict(state.inventory),
+        state.has_axe,
+        tuple(state.messages),
+        state.hallucination_active,
+        state.curse_timer,
+        state.dead,
+        state.win,
+        state.death_cause,
+        state.death_monster,
+        state.time_breakdown(),
+        state.liquid_uses,
+        state.tv_time,
+        state.noise_peak,
+    )
+
+
+class SnapshotBuffer:
+    """Two slots: the simulation fills the back slot, then swaps it to the front."""
+
+    def __init__(self):
+        self.slots = [None, None]
+        self.front = 0
+        self.published = 0
+        self.lock = threading.Lock()
+
+    def publish(self, snapshot):
+        back = 1 - self.front
+        self.slots[back] = snapshot
+        with self.lock:
+            self.front = back
+            self.published += 1
+
+    def latest(self):
+        with self.lock:
+            return self.slots[self.front], self.published
+
+
+class SimulationThread(threading.Thread):
+    def __init__(self, game, tick=1.0 / FPS, max_catchup=5):
+        super().__init__(name="simulation", daemon=True)
+        self.game = game
+        self.tick = tick
+        self.max_catchup = max_catchup
+        self.events = queue.SimpleQueue()
+        self.move = (0, 0)
+        self.buffer = SnapshotBuffer()
+        self.running = True
+        self.ticks = 0
+        self.dropped = 0
+
+    def push(self, event):
+        self.events.put(event)
+
+    def call(self, change):
+        """Run ``change()`` on the simulation thread between ticks, in order with the input events."""
+        self.events.put(change)
+
+    def stop(self):
+        self.running = False
+        self.join()
+
+    def run(self):
+        game = self.game
+        self.buffer.publish(game.snapshot())
+        next_tick = time.perf_counter()
+        while self.running:
+            while True:
+                try:
+                    event = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                if callable(event):
+                    event()
+                else:
+                    game.handle_input(event)
+            steps = 0
+            now = time.perf_counter()
+            while now >= next_tick and steps < self.max_catchup:
+                game.update(self.tick, self.move)
+                next_tick += self.tick
+                steps += 1
+            if now >= next_tick:
+                # Too far behind to catch up: drop the backlog rather than spiral.
+                self.dropped += int((now - next_tick) / self.tick) + 1
+                next_tick = now + self.tick
+            if steps:
+                self.ticks += steps
+                self.buffer.publish(game.snapshot())
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
@@ -0,0 +1,153 @@
+"""Per-subsystem frame timers with rolling percentiles and trace export.
+
+Timing is attached by shadowing methods on the instrumented instances, so a
+disabled profiler leaves the original bound methods untouched and costs
+nothing per frame.
+"""
+
+import json
+import time
+from collections import deque
+
+GAME_PHASES = ("update", "render")
+STATE_PHASES = (
+    "update",
+    "update_clock",
+    "update_meters",
+    "update_noise",
+    "update_events",
+    "update_tv",
+    "update_enemies",
+    "update_dog",
+)
+UI_DRAW_CALLS = ("draw_hud", "draw_effects", "draw_prompt", "draw_intro", "draw_death", "draw_summary")
+
+FRAME_BUDGET_MS = 1000.0 / 60.0
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class Profiler:
+    def __init__(self, window=240, trace_limit=50000, report_interval=0.5):
+        self.enabled = False
+        self.window = window
+        self.report_interval = report_interval
+        self.samples = {}
+        self.trace = deque(maxlen=trace_limit)
+        self.origin = time.perf_counter()
+        self.targets = {}
+        self._report = []
+        self._report_time = 0.0
+
+    def attach(self, obj, label, names):
+        previous = self.targets.get(label)
+        if previous is not None and self.enabled:
+            self._unwrap(*previous)
+        self.targets[label] = (obj, names)
+        if self.enabled:
+            self._wrap(obj, label, names)
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        for label, (obj, names) in self.targets.items():
+            self._wrap(obj, label, names)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for obj, names in self.targets.values():
+            self._unwrap(obj, names)
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def reset(self):
+        self.samples.clear()
+        self.trace.clear()
+        self._report = []
+
+    def _wrap(self, obj, label, names):
+        for name in names:
+            setattr(obj, name, self._instrument(f"{label}.{name}", getattr(obj, name)))
+
+    def _unwrap(self, obj, names):
+        for name in names:
+            obj.__dict__.pop(name, None)
+
+    def _instrument(self, name, method):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        trace = self.trace
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                end = clock()
+                samples.append(end - start)
+                trace.append((name, start, end))
+
+        return timed
+
+    def stats(self):
+        rows = []
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            rows.append(
+                (
+                    name,
+                    percentile(ordered, 50) * 1000.0,
+                    percentile(ordered, 95) * 1000.0,
+                    percentile(ordered, 99) * 1000.0,
+                    ordered[-1] * 1000.0,
+                )
+            )
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def report(self):
+        now = time.perf_counter()
+        if now - self._report_time >= self.report_interval:
+            self._report_time = now
+            self._report = self.stats()
+        return self._report
+
+    def export_trace(self, path):
+        events = []
+        for name, start, end in self.trace:
+            label, _, phase = name.partition(".")
+            events.append(
+                {
+                    "name": phase,
+                    "cat": label,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                }
+            )
+        summary = {
+            name: {"p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": worst}
+            for name, p50, p95, p99, worst in self.stats()
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "summary": summary}, f)
+        return path
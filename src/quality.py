@@ -0,0 +1,73 @@
+"""Frame-time governor that trades visual effects for a stable frame rate.
+
+Level 0 is full quality. When the average frame time over the recent window
+stays above the budget, the governor steps down one level; when it stays well
+under budget for longer, it steps back up. Gameplay cues (ghost shadow, TV
+static near a real ghost) get cheaper at lower levels but never disappear.
+"""
+
+from collections import deque
+
+from .profiler import FRAME_BUDGET_MS
+
+QUALITY_LEVELS = (
+    {
+        "name": "high", "effects": "layer", "particles": 512, "tv_static": 10,
+        "torch": "alpha", "shadow": "alpha",
+    },
+    {
+        "name": "medium", "effects": "rects", "particles": 256, "tv_static": 6,
+        "torch": "alpha", "shadow": "solid",
+    },
+    {
+        "name": "low", "effects": "rects", "particles": 96, "tv_static": 3,
+        "torch": "outline", "shadow": "solid",
+    },
+)
+
+
+class QualityGovernor:
+    def __init__(self, budget_ms=FRAME_BUDGET_MS * 0.8, window=30, down_after=30, up_after=180, headroom=0.6, level=None):
+        self.budget_ms = budget_ms
+        self.samples = deque(maxlen=window)
+        self.down_after = down_after
+        self.up_after = up_after
+        self.headroom = headroom
+        self.fixed = level is not None
+        self.level = level or 0
+        self.settings = QUALITY_LEVELS[self.level]
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+
+    def set_level(self, level):
+        level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        if level != self.level:
+            self.level = level
+            self.settings = QUALITY_LEVELS[level]
+            self.changes += 1
+        # A new level has a different cost; judge it on fresh samples.
+        self.samples.clear()
+        self.over = self.under = 0
+
+    def observe(self, frame_ms):
+        """Record one frame's work time and adjust the level if the trend calls for it."""
+        if self.fixed:
+            return self.level
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return self.level
+        average = sum(self.samples) / len(self.samples)
+        if average > self.budget_ms:
+            self.over += 1
+            self.under = 0
+            if self.over >= self.down_after:
+                self.set_level(self.level + 1)
+        elif average < self.budget_ms * self.headroom:
+            self.under += 1
+            self.over = 0
+            if self.under >= self.up_after and self.level > 0:
+                self.set_level(self.level - 1)
+        else:
+            self.over = self.under = 0
+        return self.level
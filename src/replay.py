@@ -0,0 +1,365 @@
+"""Replays with periodic state hashes, and a parallel determinism checker.
+
+A ``ReplayRecorder`` attached to a GameState logs everything that drives the
+simulation: the length of each tick, the held movement and the one-shot
+actions. Every ``hash_every`` ticks of ``GameState.update`` it digests the
+simulation state one field group at a time (player, meters, timers, entities,
+RNG, ...) and folds the digests into a rolling CRC. Every ``keyframe_every``
+ticks it also stores the whole state with ``pack_state``. Tuning and room
+geometry swapped in mid-run (hot reload) go into the input stream too, so
+the re-simulation switches at the same tick.
+
+``check_replay`` re-simulates a replay headlessly and compares the digests.
+Keyframes split the replay into segments that are re-simulated from their
+own snapshots in parallel worker processes, so a long playthrough is checked
+in about the time of one segment. The report names the first checkpoint that
+differs, the last one that agreed, and the field groups that went wrong.
+"""
+
+import base64
+import json
+import os
+import platform
+import struct
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .rooms import rooms_data, rooms_from_data
+from .snapshot import pack_state, unpack_state
+from .tuning import Tuning
+
+FORMAT = "horror-replay"
+VERSION = 2
+HASH_EVERY = 30
+KEYFRAME_EVERY = 3600
+RESTORE = "restore"
+# Inputs that carry data are [kind, data] lists among the action names.
+TUNING = "tuning"
+ROOMS = "rooms"
+RNG_WORDS = struct.Struct("<625I")  # Mersenne Twister state, byte order fixed across machines.
+FIELDS = (
+    "clock", "player", "dog", "meters", "inventory", "noise", "spawn", "timers",
+    "devices", "ghost", "hallucination", "tentacle", "outcome", "rng",
+)
+
+# First checkpoint that differs: its tick, the last agreeing tick, the
+# differing field groups and their re-simulated values.
+Divergence = namedtuple("Divergence", ("tick", "last_good", "fields", "values"))
+
+
+def state_fields(state):
+    """The simulation state as (field group, value) pairs, in FIELDS order.
+
+    The message log is left out: the Game posts its own notices there ("Game
+    saved.") that are not part of the simulation. Positions are hashed as
+    floats, since a spawn sets ints and a restored snapshot floats.
+    """
+    player, dog, spawn = state.player, state.dog, state.spawn
+    ghost, hallucination, tentacle = state.ghost, state.hallucination, state.tentacle
+    version, internal, gauss = state.rng.getstate()
+    return (
+        ("clock", (state.time_system.time,)),
+        ("player", (state.current_room, tuple(player.rect), player.moving, tuple(map(float, state.player_dir)))),
+        ("dog", (tuple(dog.rect), dog.alive, state.dog_dead, dog.bark_timer)),
+        ("meters", (state.sanity, state.hunger, state.thirst, state.torch_battery)),
+        ("inventory", (
+            tuple(sorted(state.inventory.items())), state.liquid_uses, state.liquid_last,
+            state.stash_stock, state.has_axe,
+        )),
+        ("noise", (state.noise.value, state.noise.peak, state.noise_peak)),
+        ("spawn", (spawn.ghost_timer, spawn.hallucination_timer, spawn.tentacle_ready, state.tentacle_hunt)),
+        ("timers", (
+            state.curse_timer, state.tv_time, state.tv_overuse, state.ghost_attack_timer,
+            state.ghost_hint_timer, state.tv_broadcast_timer, state.refill_timer, state.axe_cooldown,
+            state.tv_static_timer, state.grounding_last, tuple(state.grounding_history),
+        )),
+        ("devices", (state.torch_on, state.tv_on, state.fan_on, state.refill_soon, state.hallucination_active)),
+        ("ghost", ghost and (
+            float(ghost.x), float(ghost.y), ghost.alpha, ghost.jitter, ghost.visible,
+            ghost.attack_timer, ghost.banished, ghost.banish_timer,
+        )),
+        ("hallucination", hallucination and (float(hallucination.x), float(hallucination.y), hallucination.life)),
+        ("tentacle", tentacle and (float(tentacle.x), float(tentacle.y))),
+        ("outcome", (state.dead, state.win, state.death_cause, state.death_monster)),
+        ("rng", (version, gauss, zlib.crc32(RNG_WORDS.pack(*internal)))),
+    )
+
+
+def state_digests(state):
+    """One CRC per field group; repr keeps floats exact on every platform."""
+    return [zlib.crc32(repr(value).encode()) for _, value in state_fields(state)]
+
+
+def geometry_digest(state):
+    rooms = (
+        tuple(state.living_bounds), tuple(state.bath_bounds),
+        sorted((room, [tuple(r) for r in rects]) for room, rects in state.obstacles.items()),
+        sorted((zone, tuple(rect)) for zone, rect in state.interact_zones.items()),
+    )
+    return "%08x" % zlib.crc32(repr(rooms).encode())
+
+
+class ReplayRecorder:
+    def __init__(self, state, hash_every=HASH_EVERY, keyframe_every=KEYFRAME_EVERY):
+        self.hash_every = max(1, hash_every)
+        # Keyframes land on checkpoints so a segment can resume the rolling hash.
+        self.keyframe_every = -(-keyframe_every // self.hash_every) * self.hash_every if keyframe_every else 0
+        self.header = {
+            "format": FORMAT,
+            "version": VERSION,
+            "seed": state.seed,
+            "tuning": state.tuning.overrides(),
+            "geometry": geometry_digest(state),
+            "hash_every": self.hash_every,
+            "keyframe_every": self.keyframe_every,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+        self.inputs = []  # Runs of identical ticks: [count, dt, dx, dy, actions].
+        self.checkpoints = []  # [tick, rolling hash, [digest per field group]]
+        self.keyframes = []  # {"tick", "rolling", "restore", "state"}
+        self.ticks = 0
+        self.rolling = 0
+        self.actions = []
+        self.move = None
+        self.checkpoint(state)
+        self.keyframe(state)
+        state.replay = self
+
+    def action(self, name):
+        self.actions.append(name)
+
+    def moved(self, dx, dy):
+        self.move = (dx, dy)
+
+    def retuned(self, tuning):
+        self.actions.append([TUNING, tuning.overrides()])
+
+    def rebuilt(self, rooms):
+        self.actions.append([ROOMS, rooms_data(rooms)])
+
+    def restored(self, state):
+        """Record a load into ``state``: replays restore the same snapshot before the next tick."""
+        self.actions.append(RESTORE)
+        self.keyframe(state, restore=True)
+
+    def tick(self, state, dt):
+        dx, dy = self.move if self.move is not None else (None, None)
+        last = self.inputs[-1] if self.inputs else None
+        if last and not self.actions and not last[4] and last[1:4] == [dt, dx, dy]:
+            last[0] += 1
+        else:
+            self.inputs.append([1, dt, dx, dy, self.actions])
+            self.actions = []
+        self.move = None
+        self.ticks += 1
+        if self.ticks % self.hash_every == 0:
+            self.checkpoint(state)
+            if self.keyframe_every and self.ticks % self.keyframe_every == 0:
+                self.keyframe(state)
+
+    def checkpoint(self, state):
+        digests = state_digests(state)
+        self.rolling = zlib.crc32(repr(digests).encode(), self.rolling)
+        self.checkpoints.append([self.ticks, self.rolling, digests])
+
+    def keyframe(self, state, restore=False):
+        self.keyframes.append({
+            "tick": self.ticks,
+            "rolling": self.rolling,
+            "restore": restore,
+            "state": base64.b64encode(pack_state(state)).decode("ascii"),
+        })
+
+    def finish(self, state):
+        """Checkpoint the final tick too, unless it already was one."""
+        if self.checkpoints[-1][0] != self.ticks:
+            self.checkpoint(state)
+
+    def replay(self):
+        return {
+            **self.header,
+            "ticks": self.ticks,
+            "inputs": self.inputs,
+            "checkpoints": self.checkpoints,
+            "keyframes": self.keyframes,
+        }
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.replay(), f, separators=(",", ":"))
+        os.replace(tmp, path)
+        return path
+
+
+def load_replay(path):
+    with open(path, "r", encoding="utf-8") as f:
+        replay = json.load(f)
+    if replay.get("format") != FORMAT or replay.get("version") not in range(1, VERSION + 1):
+        raise ValueError(f"{path} is not a version {VERSION} replay")
+    return replay
+
+
+def slice_inputs(inputs, start, end):
+    """The runs covering ticks start+1..end, trimmed to that range."""
+    runs = []
+    tick = 0
+    for count, dt, dx, dy, actions in inputs:
+        first, tick = tick + 1, tick + count
+        if tick <= start:
+            continue
+        if first > end:
+            break
+        skipped = max(0, start + 1 - first)
+        runs.append([min(tick, end) - max(first, start + 1) + 1, dt, dx, dy, [] if skipped else actions])
+    return runs
+
+
+def settings_at(replay, tick):
+    """(tuning overrides, room data or None) in force after ``tick``, counting mid-run swaps."""
+    tuning, rooms = replay["tuning"], None
+    first = 1
+    for count, dt, dx, dy, actions in replay["inputs"]:
+        if first > tick:
+            break
+        for action in actions:
+            if isinstance(action, list):
+                kind, data = action
+                if kind == TUNING:
+                    tuning = data
+                elif kind == ROOMS:
+                    rooms = data
+        first += count
+    return tuning, rooms
+
+
+def apply_input(state, action):
+    kind, data = action
+    if kind == TUNING:
+        state.apply_tuning(Tuning(**data))
+    elif kind == ROOMS:
+        state.apply_rooms(rooms_from_data(data))
+
+
+def play_inputs(state, runs, restores, tick=0):
+    """Drive ``state`` through ``runs`` from ``tick``; yields each tick number once it has run."""
+    for count, dt, dx, dy, actions in runs:
+        for i in range(count):
+            if not i:
+                for action in actions:
+                    if isinstance(action, list):
+                        apply_input(state, action)
+                    elif action == RESTORE:
+                        unpack_state(restores[tick], state)
+                    else:
+                        state.perform(action)
+            if dx is not None:
+                state.move_player(dx, dy, dt)
+            state.update(dt)
+            tick += 1
+            yield tick
+
+
+def divergence(state, tick, last_good, digests, expected):
+    fields = [name for name, got, want in zip(FIELDS, digests, expected) if got != want] or ["rolling"]
+    values = dict(state_fields(state))
+    return Divergence(tick, last_good, fields, {name: values.get(name) for name in fields})
+
+
+def check_segment(state, segment, rolling=0):
+    """Re-simulate a segment from ``state`` and return the first Divergence, or None.
+
+    ``state`` must already be at the segment's start (fresh, or restored from
+    the keyframe there) and ``rolling`` is the recorded rolling hash at that tick.
+    """
+    start, hash_every, final = segment["start"], segment["hash_every"], segment["ticks"]
+    expected = {tick: (rolling, digests) for tick, rolling, digests in segment["checkpoints"]}
+    restores = {k["tick"]: base64.b64decode(k["state"]) for k in segment["keyframes"] if k["restore"]}
+    digests = state_digests(state)
+    if not start:
+        rolling = zlib.crc32(repr(digests).encode(), 0)
+    if (rolling, digests) != expected[start]:
+        # A resumed segment that differs here means the snapshot does not capture everything.
+        return divergence(state, start, None, digests, expected[start][1])
+    last_good = start
+    for tick in play_inputs(state, segment["inputs"], restores, start):
+        if tick % hash_every and tick != final:
+            continue
+        digests = state_digests(state)
+        rolling = zlib.crc32(repr(digests).encode(), rolling)
+        if tick not in expected:
+            continue
+        if (rolling, digests) != expected[tick]:
+            return divergence(state, tick, last_good, digests, expected[tick][1])
+        last_good = tick
+    return None
+
+
+def segments(replay, from_start=False):
+    """The replay split at its regular keyframes, each part carrying only its own inputs and hashes."""
+    ticks = replay["ticks"]
+    starts = [0]
+    if not from_start:
+        starts = sorted({k["tick"] for k in replay["keyframes"] if not k["restore"] and k["tick"] < ticks} | {0})
+    header = {key: value for key, value in replay.items() if key not in ("inputs", "checkpoints", "keyframes")}
+    return [
+        {
+            **header,
+            **dict(zip(("tuning", "rooms"), settings_at(replay, start))),
+            "start": start,
+            "inputs": slice_inputs(replay["inputs"], start, end),
+            "checkpoints": [c for c in replay["checkpoints"] if start <= c[0] <= end],
+            "keyframes": [k for k in replay["keyframes"] if start <= k["tick"] <= end],
+        }
+        for start, end in zip(starts, starts[1:] + [ticks])
+    ]
+
+
+def new_state(replay, asset_root):
+    from .game import GameState
+
+    return GameState(asset_root, replay["seed"], Tuning(**replay["tuning"]))
+
+
+def _check_task(segment, asset_root):
+    state = new_state(segment, asset_root)
+    if segment["rooms"] is not None:
+        state.apply_rooms(rooms_from_data(segment["rooms"]))
+    rolling = 0
+    # Unseeded games cannot be rebuilt from the seed; they start from the tick 0 keyframe.
+    if segment["start"] or segment["seed"] is None:
+        keyframe = next(k for k in segment["keyframes"] if k["tick"] == segment["start"] and not k["restore"])
+        unpack_state(base64.b64decode(keyframe["state"]), state)
+        rolling = keyframe["rolling"]
+    return check_segment(state, segment, rolling)
+
+
+def _init_worker():
+    from .headless import init_headless
+
+    init_headless()
+
+
+def check_replay(replay, asset_root, workers=0, from_start=False):
+    """Re-simulate ``replay`` and return (first Divergence or None, warnings).
+
+    With ``workers`` the keyframe segments run in that many processes.
+    """
+    warnings = []
+    state = new_state(replay, asset_root)
+    if geometry_digest(state) != replay["geometry"]:
+        warnings.append("room geometry differs from the recording (rooms.json changed?)")
+    if replay["python"] != platform.python_version():
+        warnings.append(f"recorded on Python {replay['python']}, checking on {platform.python_version()}")
+    parts = segments(replay, from_start)
+    if workers and len(parts) > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+            results = pool.map(_check_task, parts, [asset_root] * len(parts))
+            return next((result for result in results if result), None), warnings
+    for segment in parts:
+        result = _check_task(segment, asset_root)
+        if result:
+            return result, warnings
+    return None, warnings
@@ -0,0 +1,172 @@
+"""Probability of each threat appearing within a horizon, from the spawn rules.
+
+The odds are the ones ``SpawnSystem`` and ``GameState.update_events`` roll,
+with the default tuning:
+
+    ghost          one roll every 10 s of accumulated time; days 1-2 only in
+                   the living room and at a lower chance
+    hallucination  one roll every 6 s in the living room, likelier as sanity drops
+    tentacle       a roll every tick while hunting (night, day 4 on) and another
+                   after three strange liquids; certain once noise reaches the
+                   threshold
+
+Per-roll chances are precomputed, per set of spawn tuning values, into a table
+keyed on (day, phase, sanity point, cursed, liquid), so a query only walks the calendar phases the horizon
+crosses and looks each one up. The roll timers, the tick the rolls land on
+and the noise climb follow the game exactly; the estimate assumes the player
+stays in the current room with the devices and sanity as they are now.
+"""
+
+import math
+from collections import namedtuple
+
+from .constants import FPS, ROOM_LIVING, TOTAL_DAYS
+from .systems import PHASE_HOURS, calendar
+
+HORIZON = 30.0
+HINT_THRESHOLD = 0.5
+TRUTH_BIAS = 0.75
+TRUTH_BIAS_CURSED = 0.45
+# Tuning values the odds table is built from.
+ODDS_TUNING = (
+    "GHOST_CHANCE", "GHOST_CHANCE_EARLY", "GHOST_EARLY_DAYS", "HALLUCINATION_BASE",
+    "HALLUCINATION_SANITY_BONUS", "TENTACLE_HUNT_DAY", "TENTACLE_HUNT_CHANCE", "TENTACLE_LIQUID_CHANCE",
+)
+
+# Chance of each threat within ``horizon`` seconds, and seconds until noise
+# summons a tentacle (None if it is not climbing).
+Risk = namedtuple("Risk", ("ghost", "hallucination", "tentacle", "any", "horizon", "noise_eta"))
+# Per-roll ghost chance in / out of the living room, per-roll hallucination
+# chance in the living room, per-tick chance of no tentacle roll hitting.
+Odds = namedtuple("Odds", ("ghost_living", "ghost_other", "hallucination", "tentacle_survival", "truth_bias"))
+
+_tables = {}
+_schedules = {}
+
+
+def roll_schedule(seconds, dt):
+    """{timer value: ticks until the roll} for a timer reset to 0 and stepped by ``dt``.
+
+    Built by the same float additions the game makes, so the period is the
+    game's too (6 s of 1/60 steps is 361 ticks, not 360).
+    """
+    key = (seconds, dt)
+    schedule = _schedules.get(key)
+    if schedule is None:
+        values = [0.0]
+        while values[-1] < seconds:
+            values.append(values[-1] + dt)
+        period = len(values) - 1
+        schedule = _schedules[key] = (period, {value: period - i for i, value in enumerate(values[:-1])})
+    return schedule
+
+
+def first_roll(timer, seconds, dt):
+    """(ticks until the next roll, ticks between rolls) for a timer at ``timer``."""
+    period, ticks = roll_schedule(seconds, dt)
+    n = ticks.get(timer)
+    if n is None:  # Stepped by other dts, e.g. after loading a save.
+        n = max(1, math.ceil((seconds - timer) / dt - 1e-9))
+    return n, period
+
+
+def rolls_between(first, period, lo, hi):
+    """How many of the ticks first, first + period, ... fall in lo..hi inclusive."""
+    if hi < lo or hi < first:
+        return 0
+    start = max(0, -((first - lo) // period))
+    return max(0, (hi - first) // period - start + 1)
+
+
+def odds_table(tuning):
+    """{(day, phase, sanity, cursed, liquid): Odds}, shared by every model with the same spawn tuning."""
+    key = tuple(getattr(tuning, name) for name in ODDS_TUNING)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+    table = _tables[key] = {}
+    t = tuning
+    for day in range(1, TOTAL_DAYS + 1):
+        ghost = t.GHOST_CHANCE_EARLY if day <= t.GHOST_EARLY_DAYS else t.GHOST_CHANCE
+        for phase, _ in PHASE_HOURS:
+            hunt = phase == "night" and day >= t.TENTACLE_HUNT_DAY
+            for liquid in (False, True):
+                survival = (1.0 - t.TENTACLE_HUNT_CHANCE if hunt else 1.0) * (1.0 - t.TENTACLE_LIQUID_CHANCE if liquid else 1.0)
+                for sanity in range(101):
+                    hallucination = min(1.0, t.HALLUCINATION_BASE + (1.0 - sanity / 100.0) * t.HALLUCINATION_SANITY_BONUS)
+                    for cursed in (False, True):
+                        table[day, phase, sanity, cursed, liquid] = Odds(
+                            ghost,
+                            0.0 if day <= t.GHOST_EARLY_DAYS else ghost,
+                            hallucination,
+                            survival,
+                            TRUTH_BIAS_CURSED if cursed else TRUTH_BIAS,
+                        )
+    return table
+
+
+class RiskModel:
+    def __init__(self, tuning):
+        self.tuning = tuning
+        self.table = odds_table(tuning)
+
+    def odds(self, day, phase, sanity, cursed, liquid):
+        return self.table[min(day, TOTAL_DAYS), phase, int(max(0, min(100, sanity))), cursed, liquid]
+
+    def truth_bias(self, state):
+        """Chance a TV broadcast tells the truth; the curse makes it lie more."""
+        return self.odds(state.day, state.phase, state.sanity, state.curse_timer > 0, False).truth_bias
+
+    def noise_eta(self, state, dt=1.0 / FPS):
+        """Seconds until noise reaches the tentacle threshold at the current sources, or None."""
+        tuning = self.tuning
+        rate = tuning.NOISE_TV * state.tv_on + tuning.NOISE_FAN * state.fan_on
+        rate += tuning.NOISE_MOVE * state.player.moving + tuning.NOISE_TORCH * state.torch_on
+        rate -= tuning.NOISE_DECAY
+        gap = tuning.NOISE_THRESHOLD_TENTACLE - state.noise.value
+        if gap <= 0:
+            return dt
+        if rate <= 0:
+            return None
+        return math.ceil(gap / (rate / 60.0 * dt) - 1e-9) * dt
+
+    def estimate(self, state, horizon=HORIZON, dt=1.0 / FPS):
+        ticks = max(1, int(round(horizon / dt)))
+        now = state.time_system.time
+        living = state.current_room == ROOM_LIVING
+        cursed = state.curse_timer > 0
+        tuning = self.tuning
+        liquid = state.liquid_uses >= tuning.TENTACLE_LIQUID_USES
+        ghost_next, ghost_period = first_roll(state.spawn.ghost_timer, tuning.GHOST_ROLL_SECONDS, dt)
+        halluc_next, halluc_period = first_roll(state.spawn.hallucination_timer, tuning.HALLUCINATION_ROLL_SECONDS, dt)
+
+        # Chance of nothing spawning, multiplied phase by phase. Tick n runs at now + n * dt.
+        ghost_clear = halluc_clear = tentacle_clear = 1.0
+        lo = 1
+        while lo <= ticks:
+            clock = calendar(now + lo * dt)
+            hi = min(ticks, max(lo, math.ceil((clock.next_phase - now) / dt) - 1))
+            odds = self.odds(clock.day, clock.phase, state.sanity, cursed, liquid)
+            ghost = odds.ghost_living if living else odds.ghost_other
+            ghost_clear *= (1.0 - ghost) ** rolls_between(ghost_next, ghost_period, lo, hi)
+            if living:
+                halluc_clear *= (1.0 - odds.hallucination) ** rolls_between(halluc_next, halluc_period, lo, hi)
+            tentacle_clear *= odds.tentacle_survival ** (hi - lo + 1)
+            lo = hi + 1
+
+        noise_eta = self.noise_eta(state, dt)
+        if noise_eta is not None and noise_eta <= ticks * dt:
+            tentacle_clear = 0.0
+        ghost = 1.0 if state.ghost else 1.0 - ghost_clear
+        hallucination = 1.0 if state.hallucination else 1.0 - halluc_clear
+        tentacle = 1.0 if state.tentacle else 1.0 - tentacle_clear
+        return Risk(
+            ghost, hallucination, tentacle,
+            1.0 - (1.0 - ghost) * (1.0 - hallucination) * (1.0 - tentacle),
+            ticks * dt, noise_eta,
+        )
+
+
+def estimate(state, horizon=HORIZON, dt=1.0 / FPS):
+    """Risk for a GameState over the next ``horizon`` seconds."""
+    return RiskModel(state.tuning).estimate(state, horizon, dt)
@@ -0,0 +1,110 @@
+"""Room geometry loaded from a data file instead of being typed into GameState.
+
+``rooms.json`` holds, per room, the walkable bounds, the obstacles and the
+named interaction zones, all as [x, y, w, h] in the 960x540 logical space.
+``tools_coords_viewer.py`` edits it. Parsed files are cached by mtime, so
+creating many GameStates (bots, sweeps) only reads the file once.
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import pygame
+
+from .constants import ROOM_BATH, ROOM_LIVING
+
+ROOMS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "rooms.json"))
+ROOM_NAMES = (ROOM_LIVING, ROOM_BATH)
+# Zones the game looks up by name.
+ZONE_NAMES = ("TV", "Fan", "Door", "Stash", "TopDoor", "Sink", "Mirror")
+
+# One room: bounds rect, list of obstacle rects, {zone name: rect}.
+Room = namedtuple("Room", ("bounds", "obstacles", "zones"))
+
+_cache = {}
+
+
+def missing_zones(zone_names):
+    return [name for name in ZONE_NAMES if name not in zone_names]
+
+
+def _parse(data):
+    rooms = {}
+    for name in ROOM_NAMES:
+        if name not in data:
+            raise KeyError(f"Room data has no {name!r}")
+        room = data[name]
+        rooms[name] = (
+            tuple(room["bounds"]),
+            tuple(tuple(rect) for rect in room.get("obstacles", ())),
+            tuple((zone, tuple(rect)) for zone, rect in room.get("zones", {}).items()),
+        )
+        for rect in (rooms[name][0],) + rooms[name][1] + tuple(r for _, r in rooms[name][2]):
+            if len(rect) != 4:
+                raise ValueError(f"Bad rect in {name!r}: {list(rect)}")
+    missing = missing_zones({zone for room in rooms.values() for zone, _ in room[2]})
+    if missing:
+        raise KeyError(f"Room data is missing zones: {', '.join(missing)}")
+    return rooms
+
+
+def load_rooms(path=ROOMS_PATH):
+    """Return {room name: Room} with fresh Rects the caller may modify."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = _cache[path] = (mtime, _parse(json.load(f)))
+    return _build(cached[1])
+
+
+def _build(parsed):
+    return {
+        name: Room(pygame.Rect(bounds), [pygame.Rect(r) for r in obstacles], {z: pygame.Rect(r) for z, r in zones})
+        for name, (bounds, obstacles, zones) in parsed.items()
+    }
+
+
+def rooms_data(rooms):
+    """{room: Room} as the plain dict rooms.json holds."""
+    return {
+        name: {
+            "bounds": list(room.bounds),
+            "obstacles": [list(r) for r in room.obstacles],
+            "zones": {zone: list(r) for zone, r in room.zones.items()},
+        }
+        for name, room in rooms.items()
+    }
+
+
+def rooms_from_data(data):
+    """The inverse of rooms_data, validated like a loaded file."""
+    return _build(_parse(data))
+
+
+def rooms_digest(path=ROOMS_PATH):
+    """Hash of the room layout in ``path``, for caches of results that depend on it."""
+    payload = json.dumps(rooms_data(load_rooms(path)), sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def save_rooms(rooms, path=ROOMS_PATH):
+    """Write rooms back in the layout load_rooms reads, one rect per line."""
+    lines = ["{"]
+    for i, name in enumerate(ROOM_NAMES):
+        room = rooms[name]
+        lines.append(f"  {json.dumps(name)}: {{")
+        lines.append(f"    \"bounds\": {json.dumps(list(room.bounds))},")
+        lines.append("    \"obstacles\": [" + ",".join(f"\n      {json.dumps(list(r))}" for r in room.obstacles)
+                     + ("\n    ]," if room.obstacles else "],"))
+        zones = [f"\n      {json.dumps(zone)}: {json.dumps(list(r))}" for zone, r in room.zones.items()]
+        lines.append("    \"zones\": {" + ",".join(zones) + ("\n    }" if zones else "}"))
+        lines.append("  }" + ("," if i < len(ROOM_NAMES) - 1 else ""))
+    lines.append("}")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+    _cache.pop(path, None)
@@ -0,0 +1,331 @@
+"""Host many independent GameState sessions in one process.
+
+Sessions are stepped round-robin with deficit scheduling: every turn adds
+``quantum_ms`` of credit to a session, which then runs ticks until its credit
+or its tick budget is spent. Expensive sessions (planner bots) therefore run
+fewer ticks per round instead of starving cheap ones.
+
+Sessions out of tick budget wait outside the run queue until ``grant`` adds
+more. Sessions with nothing to do for ``park_after`` seconds (finished,
+waiting on a budget, or input-driven with no input) are parked: their state is
+packed with ``pack_state`` and the GameState is dropped, so a parked game is
+frozen. Input or a new budget unparks it into a clone of a template state.
+With a ``memory_limit``, the least recently run sessions (queued or waiting on
+a budget) are evicted the same way, input and budgets only bring a session
+back while it fits, and resident sessions rotate out every ``ROTATE_TURNS``
+turns so evicted ones still get their share.
+"""
+
+import sys
+import time
+from collections import deque
+
+from .bot import MOVES, apply_action
+from .constants import FPS
+from .snapshot import clone_state, pack_state, unpack_state
+
+ROTATE_TURNS = 8
+
+# GameState attributes shared by every session (assets, UI, geometry, tuning)
+# or not owned by it; memory accounting skips them.
+SHARED_FIELDS = (
+    "asset_root",
+    "assets",
+    "ui",
+    "living_bounds",
+    "bath_bounds",
+    "doorway_y",
+    "obstacles",
+    "visibility",
+    "interact_zones",
+    "tuning",
+    "telemetry",
+)
+
+
+def _deep_size(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, deque)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_size(vars(obj), seen)
+    return size
+
+
+def state_size(state):
+    """Approximate bytes owned by one session's GameState, excluding shared data."""
+    seen = {id(getattr(state, name, None)) for name in SHARED_FIELDS}
+    seen.add(id(state.__dict__))
+    size = sys.getsizeof(state) + sys.getsizeof(state.__dict__)
+    for name, value in state.__dict__.items():
+        if name not in SHARED_FIELDS:
+            size += _deep_size(value, seen)
+    # The Mersenne Twister state lives in C and is invisible to getsizeof.
+    return size + 625 * 4
+
+
+class HostedSession:
+    def __init__(self, session_id, seed, state, bot=None, budget=None):
+        self.id = session_id
+        self.seed = seed
+        self.state = state
+        self.bot = bot
+        self.budget = budget
+        self.inputs = deque()
+        self.held = (0, 0)
+        self.parked = None
+        self.ticks = 0
+        self.cpu = 0.0
+        self.deficit = 0.0
+        self.turns = 0
+        self.last_input = 0
+        self.last_run = 0
+        self.live_bytes = 0
+        self.finished = False
+
+    def runnable(self):
+        return not self.finished and self.parked is None and (self.budget is None or self.budget > 0)
+
+    def step(self, dt):
+        state = self.state
+        if self.bot and not self.inputs:
+            dx, dy = self.bot.act(state, dt)
+        else:
+            while self.inputs:
+                action = self.inputs.popleft()
+                move = apply_action(state, action)
+                if action in MOVES or action == "idle":
+                    self.held = move
+            dx, dy = self.held
+        state.move_player(dx, dy, dt)
+        state.update(dt)
+        self.ticks += 1
+        if self.budget is not None:
+            self.budget -= 1
+        if state.dead or state.win:
+            self.finished = True
+
+    def result(self):
+        state = self.state
+        d, h, m = state.time_breakdown()
+        return {
+            "id": self.id,
+            "seed": self.seed,
+            "ticks": self.ticks,
+            "survived_s": state.time_system.time,
+            "time": f"Day {d} Hour {h:02d}:{m:02d}",
+            "dead": state.dead,
+            "win": state.win,
+            "cause": state.death_monster or state.death_cause,
+        }
+
+
+class SessionHost:
+    def __init__(self, asset_root, tick=1.0 / FPS, quantum_ms=0.5, park_after=10.0, memory_limit=None, tuning=None):
+        from .game import GameState
+
+        self.make_state = lambda seed: GameState(asset_root, seed, tuning)
+        self.template = self.make_state(0)
+        self.tick = tick
+        self.quantum_ms = quantum_ms
+        self.park_after = park_after
+        self.memory_limit = memory_limit
+        self.sessions = {}
+        self.ready = deque()
+        self.waiting = set()
+        self.evicted = deque()
+        self.next_id = 0
+        self.parks = 0
+        self.unparks = 0
+
+    def create(self, seed=None, bot=None, budget=None, session_id=None):
+        if session_id is None:
+            session_id = f"s{self.next_id}"
+            self.next_id += 1
+        if session_id in self.sessions:
+            raise KeyError(f"Session {session_id} already exists.")
+        session = HostedSession(session_id, seed, self.make_state(seed), bot, budget)
+        session.last_input = session.last_run = time.monotonic()
+        session.live_bytes = state_size(session.state)
+        self.sessions[session_id] = session
+        self.ready.append(session)
+        return session_id
+
+    def send(self, session_id, action):
+        session = self.sessions[session_id]
+        if session.finished:
+            return
+        session.inputs.append(action)
+        session.last_input = time.monotonic()
+        self.admit(session)
+
+    def grant(self, session_id, ticks):
+        session = self.sessions[session_id]
+        if session.finished:
+            return
+        session.budget = (session.budget or 0) + ticks
+        if session in self.waiting:
+            self.waiting.discard(session)
+            self.ready.append(session)
+        self.admit(session)
+
+    def state(self, session_id):
+        session = self.sessions[session_id]
+        if session.finished and session.parked is not None:
+            # A finished game never runs again: hand out a decoded copy and keep it parked.
+            return self.decode(session)
+        self.unpark(session)
+        return session.state
+
+    def close(self, session_id):
+        session = self.sessions.pop(session_id)
+        self.unpark(session)
+        self.waiting.discard(session)
+        if session in self.ready:
+            self.ready.remove(session)
+        return session.result()
+
+    def park(self, session):
+        if session.parked is not None:
+            return
+        session.parked = pack_state(session.state)
+        session.state = None
+        session.turns = 0
+        self.waiting.discard(session)
+        self.parks += 1
+
+    def decode(self, session):
+        state = clone_state(self.template)
+        unpack_state(session.parked, state)
+        state.seed = session.seed
+        return state
+
+    def unpark(self, session):
+        if session.parked is None:
+            return
+        session.state = self.decode(session)
+        session.parked = None
+        session.last_run = time.monotonic()
+        self.unparks += 1
+        if session in self.evicted:
+            self.evicted.remove(session)
+        if session not in self.ready and session.runnable():
+            self.ready.append(session)
+        elif not session.finished:
+            self.waiting.add(session)
+
+    def admit(self, session):
+        """Unpark a session that has work, or queue it behind the evicted ones if it does not fit."""
+        if session.parked is None:
+            return
+        if self.memory_limit is not None and self.live_bytes() + session.live_bytes > self.memory_limit:
+            if session not in self.evicted:
+                self.evicted.append(session)
+            return
+        self.unpark(session)
+
+    def run(self, budget_ms):
+        """Step sessions round-robin for about ``budget_ms`` of wall time; return ticks run."""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        self.readmit()
+        self.park_idle()
+        ran = 0
+        while self.ready:
+            session = self.ready.popleft()
+            if not session.runnable():
+                self.settle(session)
+                continue
+            session.deficit = min(session.deficit + self.quantum_ms, self.quantum_ms * 4)
+            started = time.perf_counter()
+            steps = 0
+            while session.deficit > 0 and session.runnable():
+                session.step(self.tick)
+                steps += 1
+                now = time.perf_counter()
+                session.deficit -= (now - started) * 1000.0
+                session.cpu += now - started
+                started = now
+            ran += steps
+            session.turns += 1
+            session.last_run = time.monotonic()
+            if self.settle(session):
+                if self.evicted and session in self.waiting:
+                    # Out of budget: give its memory to an evicted session rather than idle in it.
+                    self.park(session)
+                    self.evicted.append(session)
+                    self.readmit()
+            elif self.evicted and session.turns >= ROTATE_TURNS:
+                self.park(session)
+                self.evicted.append(session)
+                self.readmit()
+            else:
+                self.ready.append(session)
+            if time.perf_counter() >= deadline:
+                break
+        self.enforce_memory()
+        return ran
+
+    def settle(self, session):
+        """Take a session with nothing left to do off the ready queue; return True if it left."""
+        if session.finished:
+            self.park(session)
+            return True
+        if session.budget is not None and session.budget <= 0:
+            self.waiting.add(session)
+            return True
+        if session.bot is None and not session.inputs and time.monotonic() - session.last_input > self.park_after:
+            self.park(session)
+            return True
+        return False
+
+    def park_idle(self):
+        cutoff = time.monotonic() - self.park_after
+        for session in [s for s in self.waiting if s.last_run < cutoff]:
+            self.park(session)
+
+    def live_bytes(self):
+        return sum(s.live_bytes for s in self.sessions.values() if s.parked is None)
+
+    def enforce_memory(self):
+        if self.memory_limit is None:
+            return
+        used = self.live_bytes()
+        if used <= self.memory_limit:
+            return
+        for session in sorted([*self.ready, *self.waiting], key=lambda s: s.last_run):
+            if used <= self.memory_limit:
+                break
+            if session.inputs:
+                continue
+            if session in self.ready:
+                self.ready.remove(session)
+            self.park(session)
+            self.evicted.append(session)
+            used -= session.live_bytes
+
+    def readmit(self):
+        if not self.evicted:
+            return
+        used = self.live_bytes()
+        for session in list(self.evicted):
+            if session.budget is not None and session.budget <= 0 and not session.inputs:
+                continue  # Nothing to run until grant(); it would only sit in memory.
+            if used + session.live_bytes > self.memory_limit:
+                break
+            self.unpark(session)
+            used += session.live_bytes
+
+    def memory(self):
+        active = [s for s in self.sessions.values() if s.parked is None]
+        parked = [s for s in self.sessions.values() if s.parked is not None]
+        return {
+            "active": len(active),
+            "parked": len(parked),
+            "active_bytes": sum(state_size(s.state) for s in active),
+            "parked_bytes": sum(len(s.parked) for s in parked),
+        }
@@ -0,0 +1,252 @@
+"""Binary snapshots and fast in-memory clones of GameState.
+
+Only simulation state is captured. Shared, read-only parts of a GameState
+(assets, UI, sounds, room geometry) are never copied: a snapshot is restored
+into an existing state, and a clone shares them with its source.
+"""
+
+import array
+import os
+import random
+import struct
+
+from .constants import ROOM_BATH, ROOM_LIVING
+from .entities import Ghost, Hallucination, Tentacle
+
+MAGIC = b"HHSV"
+VERSION = 1
+ROOMS = (ROOM_LIVING, ROOM_BATH)
+
+HEADER = struct.Struct("<4sH")
+# Fixed-layout block: room, player, dog, meters, inventory, systems, flags and timers.
+CORE = struct.Struct(
+    "<B"  # current_room
+    "ii?dd"  # player x, y, moving, player_dir
+    "ii??d"  # dog x, y, alive, dog_dead, bark_timer
+    "ddddd"  # sanity, hunger, thirst, torch_battery, curse_timer
+    "iiiiddi"  # food, water, liquid, liquid_uses, liquid_last, grounding_last, stash_stock
+    "ddddd?"  # noise value, noise peak, ghost_timer, hallucination_timer, time, tentacle_ready
+    "????????"  # torch_on, tv_on, fan_on, dead, win, hallucination_active, refill_soon, has_axe
+    "ddddddddd"  # tv_time, tv_overuse, noise_peak, ghost_attack_timer, ghost_hint_timer,
+    # tv_broadcast_timer, refill_timer, axe_cooldown, tv_static_timer
+)
+GHOST = struct.Struct("<ddi??d?d")  # x, y, alpha, jitter, visible, attack_timer, banished, banish_timer
+HALLUCINATION = struct.Struct("<ddd")  # x, y, life
+TENTACLE = struct.Struct("<dd")
+ENTITY_FLAGS = struct.Struct("<B")
+RNG = struct.Struct("<I?d")  # version, has gauss, gauss_next; the Mersenne Twister words follow
+COUNT = struct.Struct("<H")
+
+HAS_GHOST = 1
+HAS_HALLUCINATION = 2
+HAS_TENTACLE = 4
+
+
+def _pack_text(text):
+    data = text.encode("utf-8")
+    return COUNT.pack(len(data)) + data
+
+
+def _unpack_text(data, offset):
+    (length,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def pack_state(state):
+    player = state.player
+    dog = state.dog
+    inv = state.inventory
+    parts = [
+        HEADER.pack(MAGIC, VERSION),
+        CORE.pack(
+            ROOMS.index(state.current_room),
+            player.rect.x, player.rect.y, player.moving, state.player_dir[0], state.player_dir[1],
+            dog.rect.x, dog.rect.y, dog.alive, state.dog_dead, dog.bark_timer,
+            state.sanity, state.hunger, state.thirst, state.torch_battery, state.curse_timer,
+            inv["food"], inv["water"], inv["liquid"], state.liquid_uses, state.liquid_last,
+            state.grounding_last, state.stash_stock,
+            state.noise.value, state.noise.peak, state.spawn.ghost_timer, state.spawn.hallucination_timer,
+            state.time_system.time, state.spawn.tentacle_ready,
+            state.torch_on, state.tv_on, state.fan_on, state.dead, state.win,
+            state.hallucination_active, state.refill_soon, state.has_axe,
+            state.tv_time, state.tv_overuse, state.noise_peak, state.ghost_attack_timer, state.ghost_hint_timer,
+            state.tv_broadcast_timer, state.refill_timer, state.axe_cooldown, state.tv_static_timer,
+        ),
+    ]
+
+    flags = 0
+    if state.ghost:
+        flags |= HAS_GHOST
+    if state.hallucination:
+        flags |= HAS_HALLUCINATION
+    if state.tentacle:
+        flags |= HAS_TENTACLE
+    parts.append(ENTITY_FLAGS.pack(flags))
+    if state.ghost:
+        g = state.ghost
+        parts.append(GHOST.pack(g.x, g.y, g.alpha, g.jitter, g.visible, g.attack_timer, g.banished, g.banish_timer))
+    if state.hallucination:
+        h = state.hallucination
+        parts.append(HALLUCINATION.pack(h.x, h.y, h.life))
+    if state.tentacle:
+        parts.append(TENTACLE.pack(state.tentacle.x, state.tentacle.y))
+
+    parts.append(COUNT.pack(len(state.grounding_history)))
+    parts.append(array.array("d", state.grounding_history).tobytes())
+    parts.append(COUNT.pack(len(state.messages)))
+    parts.extend(_pack_text(msg) for msg in state.messages)
+    parts.append(_pack_text(state.death_cause))
+    parts.append(_pack_text(state.death_monster))
+
+    version, internal, gauss = state.rng.getstate()
+    parts.append(RNG.pack(version, gauss is not None, gauss or 0.0))
+    parts.append(array.array("I", internal).tobytes())
+    return b"".join(parts)
+
+
+def unpack_state(data, state):
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported snapshot (magic={magic!r}, version={version}).")
+    offset = HEADER.size
+    (
+        room,
+        px, py, moving, dir_x, dir_y,
+        dog_x, dog_y, dog_alive, dog_dead, bark_timer,
+        state.sanity, state.hunger, state.thirst, state.torch_battery, state.curse_timer,
+        food, water, liquid, state.liquid_uses, state.liquid_last,
+        state.grounding_last, state.stash_stock,
+        noise_value, noise_peak, ghost_timer, hallucination_timer,
+        clock, tentacle_ready,
+        state.torch_on, state.tv_on, state.fan_on, state.dead, state.win,
+        state.hallucination_active, state.refill_soon, state.has_axe,
+        state.tv_time, state.tv_overuse, state.noise_peak, state.ghost_attack_timer, state.ghost_hint_timer,
+        state.tv_broadcast_timer, state.refill_timer, state.axe_cooldown, state.tv_static_timer,
+    ) = CORE.unpack_from(data, offset)
+    offset += CORE.size
+
+    state.current_room = ROOMS[room]
+    state.player.rect.topleft = (px, py)
+    state.player.moving = moving
+    state.player_dir = (dir_x, dir_y)
+    state.dog.rect.topleft = (dog_x, dog_y)
+    state.dog.alive = dog_alive
+    state.dog.bark_timer = bark_timer
+    state.dog_dead = dog_dead
+    state.inventory = {"food": food, "water": water, "liquid": liquid}
+    state.noise.value = noise_value
+    state.noise.peak = noise_peak
+    state.spawn.ghost_timer = ghost_timer
+    state.spawn.hallucination_timer = hallucination_timer
+    state.spawn.tentacle_ready = tentacle_ready
+    state.time_system.time = clock
+
+    (flags,) = ENTITY_FLAGS.unpack_from(data, offset)
+    offset += ENTITY_FLAGS.size
+    state.ghost = state.hallucination = state.tentacle = None
+    if flags & HAS_GHOST:
+        x, y, alpha, jitter, visible, attack_timer, banished, banish_timer = GHOST.unpack_from(data, offset)
+        offset += GHOST.size
+        ghost = Ghost(x, y, state.rng)
+        ghost.speed = state.tuning.GHOST_SPEED
+        ghost.alpha, ghost.jitter, ghost.visible = alpha, jitter, visible
+        ghost.attack_timer, ghost.banished, ghost.banish_timer = attack_timer, banished, banish_timer
+        state.ghost = ghost
+    if flags & HAS_HALLUCINATION:
+        x, y, life = HALLUCINATION.unpack_from(data, offset)
+        offset += HALLUCINATION.size
+        state.hallucination = Hallucination(x, y)
+        state.hallucination.speed = state.tuning.HALLUCINATION_SPEED
+        state.hallucination.life = life
+    if flags & HAS_TENTACLE:
+        x, y = TENTACLE.unpack_from(data, offset)
+        offset += TENTACLE.size
+        state.tentacle = Tentacle(x, y)
+        state.tentacle.speed = state.tuning.TENTACLE_SPEED
+
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    history = array.array("d")
+    history.frombytes(data[offset:offset + count * history.itemsize])
+    state.grounding_history = history.tolist()
+    offset += count * history.itemsize
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    messages = []
+    for _ in range(count):
+        msg, offset = _unpack_text(data, offset)
+        messages.append(msg)
+    state.messages = messages
+    state.death_cause, offset = _unpack_text(data, offset)
+    state.death_monster, offset = _unpack_text(data, offset)
+
+    rng_version, has_gauss, gauss = RNG.unpack_from(data, offset)
+    offset += RNG.size
+    internal = array.array("I")
+    internal.frombytes(data[offset:])
+    state.rng.setstate((rng_version, tuple(internal), gauss if has_gauss else None))
+    # Loading is not a transition: adopt the restored clock and meters silently.
+    state.sync_events()
+    return state
+
+
+def _copy(obj):
+    clone = obj.__class__.__new__(obj.__class__)
+    clone.__dict__.update(obj.__dict__)
+    return clone
+
+
+def clone_state(state, rng=None):
+    """Copy the simulation state into a new GameState sharing assets, UI and room geometry.
+
+    Pass ``rng`` to give the clone an independent random stream instead of a copy of
+    the source's, which is what lookahead rollouts want and skips the RNG state copy.
+    """
+    clone = state.__class__.__new__(state.__class__)
+    # Instance-level callables are profiler shadows bound to the source; leave them behind.
+    clone.__dict__.update({k: v for k, v in state.__dict__.items() if not callable(v)})
+    if rng is None:
+        rng = random.Random.__new__(random.Random)
+        rng.setstate(state.rng.getstate())
+    clone.rng = rng
+    # Lookahead clones must not report their imagined futures as real events.
+    clone.telemetry = None
+    clone.replay = None
+    clone.events = state.events.detached()
+
+    clone.player = _copy(state.player)
+    clone.player.rect = state.player.rect.copy()
+    clone.dog = _copy(state.dog)
+    clone.dog.rect = state.dog.rect.copy()
+    if state.ghost:
+        clone.ghost = _copy(state.ghost)
+        clone.ghost.rng = rng
+    if state.hallucination:
+        clone.hallucination = _copy(state.hallucination)
+    if state.tentacle:
+        clone.tentacle = _copy(state.tentacle)
+
+    clone.noise = _copy(state.noise)
+    clone.spawn = _copy(state.spawn)
+    clone.spawn.rng = rng
+    clone.time_system = _copy(state.time_system)
+    clone.inventory = dict(state.inventory)
+    clone.messages = list(state.messages)
+    clone.grounding_history = list(state.grounding_history)
+    return clone
+
+
+def save_game(state, path):
+    data = pack_state(state)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    # Replace atomically so a crash mid-write never corrupts the previous save.
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_game(path, state):
+    with open(path, "rb") as f:
+        return unpack_state(f.read(), state)
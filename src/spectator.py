@@ -0,0 +1,298 @@
+"""Asyncio spectator server streaming per-tick state deltas of live sessions.
+
+Clients connect over TCP or a Unix socket and speak newline-delimited JSON.
+Requests:
+
+    {"cmd": "list"}
+    {"cmd": "subscribe", "ids": ["s0", "s1"]}           # omit ids for every session
+    {"cmd": "unsubscribe", "ids": ["s0"]}
+    {"cmd": "control", "id": "s0", "action": "move_n"}  # any bot.ACTIONS name
+    {"cmd": "release", "id": "s0"}                       # hand the session back to its bot
+
+Server messages are ``{"t": "key", "id", "tick", "game", "state"}`` keyframes with
+every observed field and ``{"t": "delta", "id", "tick", "d"}`` with only the fields
+that changed since the previous tick. Floats are rounded to one decimal before
+diffing, so a draining meter only shows up when its displayed value moves.
+Each message is encoded once per session and shared by all its subscribers.
+"""
+
+import asyncio
+import json
+import time
+
+from .bot import ACTIONS, MOVES, HeuristicBot, apply_action
+from .constants import FPS
+from .pipeline import make_snapshot
+
+KEYFRAME_TICKS = 300
+MAX_CLIENT_BUFFER = 256 * 1024
+
+
+def _quantize(value):
+    if isinstance(value, float):
+        return round(value, 1)
+    if isinstance(value, tuple):
+        return tuple(_quantize(v) for v in value)
+    return value
+
+
+def observe(state):
+    snapshot = make_snapshot(state)
+    # The first two snapshot fields are display-only (intro screen, prompt text).
+    fields = {name: _quantize(value) for name, value in zip(snapshot._fields[2:], snapshot[2:])}
+    fields["time"] = round(state.time_system.time, 1)
+    fields["noise"] = round(state.noise.value, 1)
+    return fields
+
+
+def diff(previous, current):
+    return {name: value for name, value in current.items() if previous.get(name) != value}
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def error(text):
+    return encode({"t": "error", "error": text})
+
+
+def session_ids(value):
+    """A request's ``ids`` as a list (empty when omitted), or None if it is not a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+    return None
+
+
+class Session:
+    def __init__(self, session_id, make_state, seed=0, bot=None):
+        self.id = session_id
+        self.make_state = make_state
+        self.seed = seed
+        self.bot = bot if bot is not None else HeuristicBot()
+        self.game = 0
+        self.tick = 0
+        self.controlled = False
+        self.held = (0, 0)
+        self.actions = []
+        self.subscribers = set()
+        self.state = make_state(seed)
+        self.observed = observe(self.state)
+
+    def restart(self):
+        self.game += 1
+        self.seed += 1
+        self.state = self.make_state(self.seed)
+        self.controlled = False
+        self.held = (0, 0)
+        self.actions.clear()
+
+    def step(self, dt):
+        state = self.state
+        if state.dead or state.win:
+            self.restart()
+            return True
+        if self.controlled:
+            for action in self.actions:
+                move = apply_action(state, action)
+                if action in MOVES or action == "idle":
+                    self.held = move
+            self.actions.clear()
+            dx, dy = self.held
+        else:
+            dx, dy = self.bot.act(state, dt)
+        state.move_player(dx, dy, dt)
+        state.update(dt)
+        self.tick += 1
+        return False
+
+    def keyframe(self):
+        return encode({"t": "key", "id": self.id, "tick": self.tick, "game": self.game, "state": self.observed})
+
+    def delta(self):
+        current = observe(self.state)
+        changes = diff(self.observed, current)
+        self.observed = current
+        if not changes:
+            return None
+        return encode({"t": "delta", "id": self.id, "tick": self.tick, "d": changes})
+
+
+class Client:
+    def __init__(self, writer):
+        self.writer = writer
+        self.subscriptions = set()
+
+    def send(self, data):
+        self.writer.write(data)
+
+    def congested(self):
+        return self.writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER
+
+
+class SpectatorServer:
+    def __init__(self, sessions, tick=1.0 / FPS, keyframe_ticks=KEYFRAME_TICKS):
+        self.sessions = {session.id: session for session in sessions}
+        self.tick = tick
+        self.keyframe_ticks = keyframe_ticks
+        self.clients = set()
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    async def serve(self, duration=None):
+        loop = asyncio.get_running_loop()
+        started = next_tick = loop.time()
+        while duration is None or loop.time() - started < duration:
+            self.step()
+            next_tick += self.tick
+            delay = next_tick - loop.time()
+            if delay < -self.tick * 5:
+                next_tick = loop.time()  # Fell far behind: skip ahead instead of bursting.
+            await asyncio.sleep(max(0.0, delay))
+
+    def step(self):
+        self.ticks += 1
+        keyframe_due = self.ticks % self.keyframe_ticks == 0
+        for session in self.sessions.values():
+            restarted = session.step(self.tick)
+            if not session.subscribers:
+                continue
+            if restarted or keyframe_due:
+                session.observed = observe(session.state)
+                data = session.keyframe()
+            else:
+                data = session.delta()
+            if data:
+                self.broadcast(session, data)
+
+    def broadcast(self, session, data):
+        for client in list(session.subscribers):
+            if client.congested():
+                # Slow reader: stop streaming to it; resubscribing resyncs with a keyframe.
+                client.subscriptions.discard(session.id)
+                session.subscribers.discard(client)
+                client.send(encode({"t": "dropped", "id": session.id}))
+                continue
+            client.send(data)
+            self.bytes_sent += len(data)
+
+    def subscribe(self, client, ids):
+        for session_id in ids:
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
+            session.subscribers.add(client)
+            client.subscriptions.add(session_id)
+            session.observed = observe(session.state)
+            client.send(session.keyframe())
+
+    def unsubscribe(self, client, ids):
+        for session_id in ids:
+            client.subscriptions.discard(session_id)
+            session = self.sessions.get(session_id)
+            if session:
+                session.subscribers.discard(client)
+
+    def handle(self, client, request):
+        if not isinstance(request, dict):
+            client.send(error("request must be a JSON object"))
+            return
+        cmd = request.get("cmd")
+        if cmd == "list":
+            client.send(encode({
+                "t": "sessions",
+                "sessions": [
+                    {"id": s.id, "seed": s.seed, "game": s.game, "tick": s.tick, "controlled": s.controlled}
+                    for s in self.sessions.values()
+                ],
+            }))
+        elif cmd in ("subscribe", "unsubscribe"):
+            ids = session_ids(request.get("ids"))
+            if ids is None:
+                client.send(error("ids must be a list of session ids"))
+            elif cmd == "subscribe":
+                self.subscribe(client, ids or list(self.sessions))
+            else:
+                self.unsubscribe(client, ids or list(client.subscriptions))
+        elif cmd in ("control", "release"):
+            session_id = request.get("id")
+            session = self.sessions.get(session_id) if isinstance(session_id, str) else None
+            if session is None:
+                client.send(error(f"unknown session {session_id!r}"))
+            elif cmd == "release":
+                session.controlled = False
+            elif request.get("action") not in ACTIONS:
+                client.send(error(f"unknown action {request.get('action')!r}"))
+            else:
+                session.controlled = True
+                session.actions.append(request["action"])
+        else:
+            client.send(error(f"unknown command {cmd!r}"))
+
+    async def handle_client(self, reader, writer):
+        client = Client(writer)
+        self.clients.add(client)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    client.send(error("invalid JSON"))
+                    continue
+                self.handle(client, request)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.unsubscribe(client, list(client.subscriptions))
+            self.clients.discard(client)
+            writer.close()
+
+    def close(self):
+        if self.server:
+            self.server.close()
+        for client in list(self.clients):
+            client.writer.close()
+
+
+async def watch(host="127.0.0.1", port=8765, unix_path=None, ids=None, duration=10.0):
+    """Subscribe to sessions and return per-session message and byte counts."""
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"cmd": "subscribe", "ids": ids or []}))
+    await writer.drain()
+    stats = {}
+    deadline = time.monotonic() + duration
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                line = await asyncio.wait_for(reader.readline(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            message = json.loads(line)
+            entry = stats.setdefault(message.get("id"), {"keyframes": 0, "deltas": 0, "bytes": 0})
+            entry["keyframes" if message["t"] == "key" else "deltas"] += 1
+            entry["bytes"] += len(line)
+    finally:
+        writer.close()
+    return stats
@@ -1,39 +1,94 @@
 """Systems for time, meters, noise, and spawning."""
 
 import random
+from collections import namedtuple
 
 from .constants import (
-    BREACH_BASE,
-    BREACH_CURSE_BONUS,
     DAY_HOURS,
-    HALLUCINATION_BASE,
+    DAY_SECONDS,
     HOUR_SECONDS,
-    HOURS_PER_DAY,
     MORNING_HOURS,
+    NIGHT_HOURS,
+    ROOM_LIVING,
 )
+from .tuning import DEFAULT_TUNING
+
+
+# A calendar position, valid for ``hour_start <= time < next_hour``.
+Clock = namedtuple("Clock", ("day", "hour", "phase", "hour_start", "next_hour", "next_phase", "next_day"))
+PHASE_HOURS = (("morning", MORNING_HOURS), ("day", DAY_HOURS), ("night", NIGHT_HOURS))
+
+
+def calendar(time):
+    """The Clock for a game time, with the absolute times of the next hour, phase and day."""
+    day_index = int(time // DAY_SECONDS)
+    day_start = day_index * DAY_SECONDS
+    hour = int((time - day_start) // HOUR_SECONDS) + 1
+    hour_start = day_start + (hour - 1) * HOUR_SECONDS
+    for phase, hours in PHASE_HOURS:
+        if hour in hours:
+            break
+    return Clock(
+        day_index + 1, hour, phase, hour_start, hour_start + HOUR_SECONDS,
+        day_start + hours[-1] * HOUR_SECONDS, day_start + DAY_SECONDS,
+    )
 
 
 class TimeSystem:
+    """Game clock with a calendar snapshot recomputed only when an hour boundary is crossed.
+
+    After each ``update`` the ``hour_changed``/``phase_changed``/``day_changed``
+    flags say whether that step crossed a boundary, however large the step.
+    """
+
     def __init__(self):
         self.time = 0.0
+        self.clock = calendar(0.0)
+        self.stamp = 0.0
+        self.hour_changed = self.phase_changed = self.day_changed = False
 
     def update(self, dt):
         self.time += dt
+        self.refresh()
+
+    def refresh(self):
+        clock = self.clock
+        time = self.stamp = self.time
+        if clock.hour_start <= time < clock.next_hour:
+            self.hour_changed = self.phase_changed = self.day_changed = False
+            return clock
+        self.clock = new = calendar(time)
+        self.hour_changed = True
+        self.day_changed = new.day != clock.day
+        self.phase_changed = self.day_changed or new.phase != clock.phase
+        return new
+
+    def sync(self):
+        """Adopt a directly assigned ``time`` without reporting it as a transition."""
+        self.refresh()
+        self.hour_changed = self.phase_changed = self.day_changed = False
+
+    def current(self):
+        """The clock for ``time``; reading never consumes a transition ``update`` should report."""
+        clock = self.clock
+        if self.time == self.stamp or clock.hour_start <= self.time < clock.next_hour:
+            return clock
+        return calendar(self.time)
 
     def day(self):
-        return int(self.time // (HOUR_SECONDS * HOURS_PER_DAY)) + 1
+        return self.current().day
 
     def hour(self):
-        hour_in_day = int((self.time % (HOUR_SECONDS * HOURS_PER_DAY)) // HOUR_SECONDS) + 1
-        return hour_in_day
+        return self.current().hour
 
     def phase(self):
-        hour = self.hour()
-        if hour in MORNING_HOURS:
-            return "morning"
-        if hour in DAY_HOURS:
-            return "day"
-        return "night"
+        return self.current().phase
+
+    def seconds_until_phase(self):
+        return self.current().next_phase - self.time
+
+    def seconds_until_day(self):
+        return self.current().next_day - self.time
 
 
 class NoiseSystem:
@@ -50,31 +105,34 @@ class NoiseSystem:
 
 
 class SpawnSystem:
-    def __init__(self):
+    def __init__(self, rng=None, tuning=None):
+        self.rng = rng or random
+        self.tuning = tuning or DEFAULT_TUNING
         self.ghost_timer = 0.0
         self.hallucination_timer = 0.0
         self.tentacle_ready = False
 
     def update_ghost(self, dt, day, room):
+        tuning = self.tuning
         self.ghost_timer += dt
-        if self.ghost_timer < 10.0:
+        if self.ghost_timer < tuning.GHOST_ROLL_SECONDS:
             return False
         self.ghost_timer = 0.0
-        if day <= 2 and room != "Living Room":
+        if day <= tuning.GHOST_EARLY_DAYS and room != ROOM_LIVING:
             return False
-        base = 0.2 if day <= 2 else 0.35
-        return random.random() < base
+        base = tuning.GHOST_CHANCE_EARLY if day <= tuning.GHOST_EARLY_DAYS else tuning.GHOST_CHANCE
+        return self.rng.random() < base
 
     def update_hallucination(self, dt, sanity, room):
         self.hallucination_timer += dt
-        if self.hallucination_timer < 6.0:
+        if self.hallucination_timer < self.tuning.HALLUCINATION_ROLL_SECONDS:
             return False
         self.hallucination_timer = 0.0
-        if room != "Living Room":
+        if room != ROOM_LIVING:
             return False
-        chance = HALLUCINATION_BASE + (1.0 - sanity / 100.0) * 0.2
-        return random.random() < chance
+        chance = self.tuning.HALLUCINATION_BASE + (1.0 - sanity / 100.0) * self.tuning.HALLUCINATION_SANITY_BONUS
+        return self.rng.random() < chance
 
     def breach_roll(self, curse_active):
-        chance = BREACH_BASE + (BREACH_CURSE_BONUS if curse_active else 0)
-        return random.random() < chance
+        chance = self.tuning.BREACH_BASE + (self.tuning.BREACH_CURSE_BONUS if curse_active else 0)
+        return self.rng.random() < chance
@@ -0,0 +1,235 @@
+"""Typed gameplay telemetry written to a compact, rotated binary log.
+
+The game thread only appends tuples to per-event buffers. Full buffers, and
+every buffer still holding events after ``flush_interval`` seconds, are
+handed to a background thread that packs them into blocks of fixed-size
+records, one block per event type, and appends them to the current log file:
+
+    file   := b"HHTL" u16 version block*
+    block  := u8 event u32 count record*count
+    record := u32 session f32 game_time payload
+
+Because every block holds a single record layout, readers decode whole blocks
+with ``struct.iter_unpack`` and can pivot them into columns cheaply.
+"""
+
+import glob
+import os
+import queue
+import random
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from .constants import ROOM_BATH, ROOM_LIVING
+from .events import Despawned, Died, Spawned, Won
+
+MAGIC = b"HHTL"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+BLOCK_HEADER = struct.Struct("<BI")
+
+SESSION_START = 0
+SPAWN = 1
+DESPAWN = 2
+BANISH = 3
+ITEM = 4
+TOGGLE = 5
+ROOM = 6
+GROUNDING = 7
+DEATH = 8
+WIN = 9
+
+# event code -> (name, payload struct format, payload field names)
+EVENTS = {
+    SESSION_START: ("session_start", "I", ("seed",)),
+    SPAWN: ("spawn", "B", ("entity",)),
+    DESPAWN: ("despawn", "BB", ("entity", "reason")),
+    BANISH: ("banish", "", ()),
+    ITEM: ("item", "B?", ("item", "used")),
+    TOGGLE: ("toggle", "B?", ("device", "on")),
+    ROOM: ("room", "B", ("room",)),
+    GROUNDING: ("grounding", "f", ("factor",)),
+    DEATH: (
+        "death",
+        "BBBBBHff",
+        ("cause", "monster", "day", "hour", "minute", "liquid_uses", "tv_time", "noise_peak"),
+    ),
+    WIN: ("win", "BBBHff", ("day", "hour", "minute", "liquid_uses", "tv_time", "noise_peak")),
+}
+RECORDS = {code: struct.Struct("<If" + fmt) for code, (_, fmt, _) in EVENTS.items()}
+TYPES = {
+    code: namedtuple(name.title().replace("_", ""), ("session", "time") + fields)
+    for code, (name, _, fields) in EVENTS.items()
+}
+
+ENTITY_GHOST = 0
+ENTITY_HALLUCINATION = 1
+ENTITY_TENTACLE = 2
+ENTITIES = ("ghost", "hallucination", "tentacle")
+DESPAWN_EXPIRED = 0
+DESPAWN_GROUNDED = 1
+DESPAWN_AXE = 2
+DESPAWN_REASONS = ("expired", "grounded", "axe")
+DEVICE_TV = 0
+DEVICE_FAN = 1
+DEVICE_TORCH = 2
+DEVICES = ("tv", "fan", "torch")
+ROOMS = (ROOM_LIVING, ROOM_BATH)
+CAUSES = ("Hunger", "Thirst", "Sanity", "Monster", "Outside")
+MONSTERS = ("", "Dead Girl", "Tentacle Monster", "Outside")
+
+
+def _log_spawned(state, event):
+    state.record(SPAWN, ENTITIES.index(event.entity))
+
+
+def _log_despawned(state, event):
+    state.record(DESPAWN, ENTITIES.index(event.entity), DESPAWN_REASONS.index(event.reason))
+
+
+def _log_died(state, event):
+    state.record(
+        DEATH, CAUSES.index(event.cause), MONSTERS.index(event.monster), *state.time_breakdown(),
+        state.liquid_uses, state.tv_time, state.noise_peak,
+    )
+
+
+def _log_won(state, event):
+    state.record(WIN, *state.time_breakdown(), state.liquid_uses, state.tv_time, state.noise_peak)
+
+
+# Event bus subscriptions that turn game transitions into telemetry records.
+TELEMETRY_HANDLERS = {
+    Spawned: _log_spawned,
+    Despawned: _log_despawned,
+    Died: _log_died,
+    Won: _log_won,
+}
+
+
+class TelemetryWriter:
+    def __init__(self, directory, max_bytes=32 * 1024 * 1024, flush_events=2048, flush_interval=5.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.flush_events = flush_events
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        self.buffers = {code: [] for code in EVENTS}
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.queue = queue.SimpleQueue()
+        self.file = None
+        self.file_index = 0
+        self.thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def new_session(self, seed=None):
+        session = random.SystemRandom().getrandbits(32)
+        self.log(SESSION_START, session, 0.0, (seed or 0) & 0xFFFFFFFF)
+        return session
+
+    def log(self, event, session, game_time, *fields):
+        with self.lock:
+            self.buffers[event].append((session, game_time, *fields))
+            self.pending += 1
+            full = self.pending >= self.flush_events
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            self.last_flush = time.monotonic()
+            if not self.pending:
+                return
+            batch = self.buffers
+            self.buffers = {code: [] for code in EVENTS}
+            self.pending = 0
+        self.queue.put(batch)
+
+    def close(self):
+        self.flush()
+        self.queue.put(None)
+        self.thread.join()
+
+    def _open(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"telemetry-{stamp}-{os.getpid()}-{self.file_index:04d}.htl")
+        self.file_index += 1
+        self.file = open(path, "ab")
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def _run(self):
+        while True:
+            # The interval is checked here rather than in log(), so events logged just before
+            # the game goes idle (a death screen waiting on input) still reach the file.
+            wait = self.last_flush + self.flush_interval - time.monotonic()
+            try:
+                batch = self.queue.get(timeout=max(wait, 0.0))
+            except queue.Empty:
+                self.flush()
+                continue
+            if batch is None:
+                break
+            if self.file is None or self.file.tell() >= self.max_bytes:
+                if self.file:
+                    self.file.close()
+                self._open()
+            parts = []
+            for code, rows in batch.items():
+                if not rows:
+                    continue
+                record = RECORDS[code]
+                parts.append(BLOCK_HEADER.pack(code, len(rows)))
+                parts.extend(record.pack(*row) for row in rows)
+            self.file.write(b"".join(parts))
+            self.file.flush()
+        if self.file:
+            self.file.close()
+
+
+def log_files(directory):
+    return sorted(glob.glob(os.path.join(directory, "*.htl")))
+
+
+def read_blocks(path):
+    """Yield (event code, raw record bytes) for each block in a log file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version = FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a telemetry log (magic={magic!r}, version={version}).")
+    offset = FILE_HEADER.size
+    while offset + BLOCK_HEADER.size <= len(data):
+        code, count = BLOCK_HEADER.unpack_from(data, offset)
+        offset += BLOCK_HEADER.size
+        size = RECORDS[code].size * count
+        if offset + size > len(data):
+            break  # Torn final block from a crash; everything before it is intact.
+        yield code, data[offset:offset + size]
+        offset += size
+
+
+def read_events(paths):
+    """Yield typed event records from the given log files."""
+    for path in paths:
+        for code, raw in read_blocks(path):
+            make = TYPES[code]._make
+            for row in RECORDS[code].iter_unpack(raw):
+                yield make(row)
+
+
+def load_columns(paths):
+    """Return {event name: {field: tuple of values}} for fast aggregate analysis."""
+    rows = {code: [] for code in EVENTS}
+    for path in paths:
+        for code, raw in read_blocks(path):
+            rows[code].extend(RECORDS[code].iter_unpack(raw))
+    columns = {}
+    for code, (name, _, fields) in EVENTS.items():
+        names = ("session", "time") + fields
+        values = list(zip(*rows[code])) if rows[code] else [()] * len(names)
+        columns[name] = dict(zip(names, values))
+    return columns
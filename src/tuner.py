@@ -0,0 +1,224 @@
+"""Parallel balance sweeps over Tuning parameters with an on-disk result cache.
+
+Each point of a sweep is a set of Tuning overrides played by the reference
+HeuristicBot over a fixed list of seeds. Results are cached under a key built
+from the full parameter set, seeds, play length, policy and room layout, so
+repeating or extending a sweep only simulates points that have not been seen
+before.
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .bot import HeuristicBot, play_game
+from .rooms import rooms_digest
+from .tuning import TUNABLE, Tuning
+
+CACHE_VERSION = 2
+POLICY = "heuristic"
+# Bump when the bot or the simulation changes in a way that moves results.
+REVISION = 3  # 2: torch occlusion, 3: TV rule from the risk model's noise ETA.
+
+
+def parse_space(specs):
+    """Parse ``NAME=lo:hi`` ranges and ``NAME=a,b,c`` choices into a search space."""
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in TUNABLE:
+            raise KeyError(f"Unknown tuning parameter: {name}")
+        if ":" in values:
+            lo, hi = values.split(":")
+            is_int = "." not in lo and "." not in hi
+            space[name] = ("range", float(lo), float(hi), is_int)
+        else:
+            space[name] = ("choice", [float(v) if "." in v else int(v) for v in values.split(",")])
+    return space
+
+
+def _range_value(dim, t):
+    _, lo, hi, is_int = dim
+    value = lo + (hi - lo) * min(1.0, max(0.0, t))
+    return int(round(value)) if is_int else round(value, 6)
+
+
+def _normalized(dim, value):
+    if dim[0] == "choice":
+        return None
+    _, lo, hi, _ = dim
+    return (value - lo) / (hi - lo) if hi != lo else 0.0
+
+
+def grid_points(space, steps=3):
+    axes = []
+    for dim in space.values():
+        if dim[0] == "choice":
+            axes.append(dim[1])
+        else:
+            axes.append(sorted({_range_value(dim, i / max(1, steps - 1)) for i in range(steps)}))
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*axes)]
+
+
+def random_point(space, rng):
+    return {
+        name: rng.choice(dim[1]) if dim[0] == "choice" else _range_value(dim, rng.random())
+        for name, dim in space.items()
+    }
+
+
+def _density(point, observed, space, bandwidth):
+    total = 0.0
+    for other, _ in observed:
+        weight = 1.0
+        for name, dim in space.items():
+            if dim[0] == "choice":
+                weight *= 1.0 if point[name] == other[name] else 0.2
+            else:
+                gap = _normalized(dim, point[name]) - _normalized(dim, other[name])
+                weight *= math.exp(-0.5 * (gap / bandwidth) ** 2)
+        total += weight
+    return total / max(1, len(observed))
+
+
+def suggest_points(space, history, count, rng, gamma=0.25, candidates=48, bandwidth=0.15):
+    """Tree-structured Parzen estimator suggestions from (params, score) history.
+
+    Candidates are drawn around the best ``gamma`` fraction of history and ranked
+    by how much more likely they are under the good points than the rest.
+    """
+    if len(history) < 2 * len(space) + 2:
+        return [random_point(space, rng) for _ in range(count)]
+    ranked = sorted(history, key=lambda item: item[1], reverse=True)
+    split = max(1, int(len(ranked) * gamma))
+    good, bad = ranked[:split], ranked[split:]
+    seen = {json.dumps(params, sort_keys=True) for params, _ in history}
+    points = []
+    for _ in range(count):
+        best, best_ratio = None, -1.0
+        for _ in range(candidates):
+            base = rng.choice(good)[0]
+            candidate = {}
+            for name, dim in space.items():
+                if dim[0] == "choice":
+                    candidate[name] = base[name] if rng.random() < 0.7 else rng.choice(dim[1])
+                else:
+                    candidate[name] = _range_value(dim, _normalized(dim, base[name]) + rng.gauss(0.0, bandwidth))
+            key = json.dumps(candidate, sort_keys=True)
+            if key in seen:
+                continue
+            ratio = _density(candidate, good, space, bandwidth) / (_density(candidate, bad, space, bandwidth) + 1e-12)
+            if ratio > best_ratio:
+                best, best_ratio = candidate, ratio
+        if best is None:
+            best = random_point(space, rng)
+        seen.add(json.dumps(best, sort_keys=True))
+        points.append(best)
+    return points
+
+
+def cache_key(params, seeds, minutes, geometry=None):
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "policy": POLICY,
+            "revision": REVISION,
+            "geometry": geometry or rooms_digest(),
+            "tuning": Tuning(**params).digest(),
+            "seeds": list(seeds),
+            "minutes": minutes,
+        },
+        sort_keys=True,
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, result):
+        tmp_path = f"{self.path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, self.path(key))
+
+
+_asset_root = None
+
+
+def _init_worker(asset_root):
+    global _asset_root
+    from .headless import init_headless
+
+    init_headless()
+    _asset_root = asset_root
+
+
+def evaluate_point(params, seeds, minutes, asset_root=None):
+    tuning = Tuning(**params)
+    games = [play_game(asset_root or _asset_root, HeuristicBot(), seed, minutes, tuning=tuning) for seed in seeds]
+    limit = minutes * 60.0
+    causes = {}
+    for game in games:
+        if game["dead"]:
+            causes[game["cause"]] = causes.get(game["cause"], 0) + 1
+    return {
+        "params": params,
+        "games": len(games),
+        "survival": sum(min(1.0, game["survived_s"] / limit) for game in games) / len(games),
+        "death_rate": sum(1 for game in games if game["dead"]) / len(games),
+        "win_rate": sum(1 for game in games if game["win"]) / len(games),
+        "causes": causes,
+    }
+
+
+def score(result, target=None):
+    """Higher is better: raw survival, or closeness to a target survival fraction."""
+    if target is None:
+        return result["survival"]
+    return -abs(result["survival"] - target)
+
+
+def run_sweep(points, seeds, minutes, asset_root, cache, workers=0):
+    """Return one result per point, simulating only points missing from the cache."""
+    results = [None] * len(points)
+    pending = []
+    geometry = rooms_digest()
+    for index, params in enumerate(points):
+        key = cache_key(params, seeds, minutes, geometry)
+        cached = cache.get(key)
+        if cached is not None:
+            cached["cached"] = True
+            results[index] = cached
+        else:
+            pending.append((index, key, params))
+    if not pending:
+        return results
+    if workers:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(asset_root,)) as pool:
+            futures = [(index, key, pool.submit(evaluate_point, params, seeds, minutes)) for index, key, params in pending]
+            for index, key, future in futures:
+                results[index] = future.result()
+                cache.put(key, results[index])
+    else:
+        _init_worker(asset_root)
+        for index, key, params in pending:
+            results[index] = evaluate_point(params, seeds, minutes, asset_root)
+            cache.put(key, results[index])
+    return results
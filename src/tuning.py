@@ -0,0 +1,82 @@
+"""Balance parameters that can be overridden per GameState.
+
+Defaults come from ``constants.py``; a ``Tuning`` holds one value per tunable
+name, so trying a value no longer means editing source and restarting.
+"""
+
+import hashlib
+import json
+
+from . import constants
+
+TUNABLE = (
+    "PLAYER_SPEED",
+    "DOG_SPEED",
+    "HUNGER_DRAIN_MORNING",
+    "THIRST_DRAIN_MORNING",
+    "SANITY_DRAIN_MORNING",
+    "HUNGER_DRAIN_DAY",
+    "THIRST_DRAIN_DAY",
+    "SANITY_DRAIN_DAY",
+    "HUNGER_DRAIN_NIGHT",
+    "THIRST_DRAIN_NIGHT",
+    "SANITY_DRAIN_NIGHT",
+    "TV_SANITY_GAIN",
+    "TV_OVERUSE_LIMIT",
+    "TV_OVERUSE_PENALTY",
+    "NOISE_DECAY",
+    "NOISE_TV",
+    "NOISE_FAN",
+    "NOISE_MOVE",
+    "NOISE_TORCH",
+    "NOISE_THRESHOLD_TENTACLE",
+    "GHOST_SPEED",
+    "TENTACLE_SPEED",
+    "HALLUCINATION_SPEED",
+    "GHOST_KILL_TIME",
+    "GHOST_BANISH_TIME",
+    "HALLUCINATION_BASE",
+    "GHOST_ROLL_SECONDS",
+    "GHOST_CHANCE",
+    "GHOST_CHANCE_EARLY",
+    "GHOST_EARLY_DAYS",
+    "HALLUCINATION_ROLL_SECONDS",
+    "HALLUCINATION_SANITY_BONUS",
+    "TENTACLE_HUNT_DAY",
+    "TENTACLE_HUNT_CHANCE",
+    "TENTACLE_LIQUID_USES",
+    "TENTACLE_LIQUID_CHANCE",
+    "BREACH_BASE",
+    "BREACH_CURSE_BONUS",
+    "STRANGE_LIQUID_COOLDOWN",
+    "STRANGE_LIQUID_CURSE",
+    "AXE_DAY",
+    "AXE_RANGE",
+    "AXE_COOLDOWN",
+)
+
+
+class Tuning:
+    def __init__(self, **overrides):
+        for name in TUNABLE:
+            setattr(self, name, getattr(constants, name))
+        for name, value in overrides.items():
+            if name not in TUNABLE:
+                raise KeyError(f"Unknown tuning parameter: {name}")
+            setattr(self, name, value)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in TUNABLE}
+
+    def overrides(self):
+        return {name: value for name, value in self.as_dict().items() if value != getattr(constants, name)}
+
+    def replace(self, **overrides):
+        return Tuning(**{**self.overrides(), **overrides})
+
+    def digest(self):
+        payload = json.dumps(self.as_dict(), sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+
+DEFAULT_TUNING = Tuning()
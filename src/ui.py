@@ -1,67 +1,95 @@
 """HUD and rendering helpers."""
 
-import random
-
 import pygame
 
 from .constants import BLUE, GREEN, HEIGHT, LIGHT_GRAY, PURPLE, RED, WHITE, WIDTH, YELLOW
+from .fonts import get_font, glyph_atlas
+from .particles import ParticlePool
+from .quality import QUALITY_LEVELS
 
 
-def draw_bar(surf, x, y, w, h, value, max_value, color, label, font):
+def draw_bar(surf, x, y, w, h, value, max_value, color, label, glyphs, scale=1.0):
+    x, y, w, h = round(x * scale), round(y * scale), round(w * scale), round(h * scale)
     pygame.draw.rect(surf, (25, 25, 30), (x, y, w, h))
     fill = int((value / max_value) * w)
     pygame.draw.rect(surf, color, (x, y, fill, h))
-    pygame.draw.rect(surf, (10, 10, 12), (x, y, w, h), 2)
-    text = font.render(f"{label}: {int(value)}", True, WHITE)
-    surf.blit(text, (x + 6, y + 2))
+    pygame.draw.rect(surf, (10, 10, 12), (x, y, w, h), max(1, round(2 * scale)))
+    glyphs.draw(surf, f"{label}: {int(value)}", (x + round(6 * scale), y + round(2 * scale)))
 
 
 class UI:
-    def __init__(self, screen):
+    def __init__(self, screen, scale=1.0, asset_root=None):
+        # Layout is written in logical WIDTH x HEIGHT coordinates and multiplied
+        # by the render scale of the screen it draws on.
         self.screen = screen
-        self.font = pygame.font.SysFont("consolas", 18)
-        self.big = pygame.font.SysFont("consolas", 30, bold=True)
+        self.scale = scale
+        self.width = WIDTH
+        self.height = HEIGHT
+        self.font = get_font(asset_root, max(8, round(18 * scale)))
+        self.big = get_font(asset_root, max(8, round(30 * scale)), bold=True)
+        self.line = round(18 * scale)
+        self.quality = QUALITY_LEVELS[0]
+        self.patches = {}
+        self.particles = None  # Built on first draw; headless states never need one.
+        # Static screens are rasterized once and reused until their inputs change.
+        self.intro_surface = None
+        self.death_overlay = None
+        self.scaled_monsters = {}
+        self.summary_key = None
+        self.summary_lines = None
 
     def draw_hud(self, state):
-        draw_bar(self.screen, 16, 16, 220, 20, state.sanity, 100, PURPLE, "Sanity", self.font)
-        draw_bar(self.screen, 16, 42, 220, 20, state.hunger, 100, GREEN, "Hunger", self.font)
-        draw_bar(self.screen, 16, 68, 220, 20, state.thirst, 100, BLUE, "Thirst", self.font)
-        draw_bar(self.screen, 16, 94, 220, 14, state.torch_battery, 100, YELLOW, "Torch", self.font)
-
-        room = self.font.render(f"Room: {state.current_room}", True, WHITE)
-        self.screen.blit(room, (WIDTH - 200, 16))
-
-        clock = self.font.render(
-            f"Day {state.day} Hour {state.hour:02d} ({state.phase})", True, WHITE
-        )
-        self.screen.blit(clock, (WIDTH - 260, 40))
-
-        inv = self.font.render(
+        s = self.scale
+        white = self.glyphs(WHITE)
+        draw_bar(self.screen, 16, 16, 220, 20, state.sanity, 100, PURPLE, "Sanity", white, s)
+        draw_bar(self.screen, 16, 42, 220, 20, state.hunger, 100, GREEN, "Hunger", white, s)
+        draw_bar(self.screen, 16, 68, 220, 20, state.thirst, 100, BLUE, "Thirst", white, s)
+        draw_bar(self.screen, 16, 94, 220, 14, state.torch_battery, 100, YELLOW, "Torch", white, s)
+
+        white.draw(self.screen, f"Room: {state.current_room}", self.at(self.width - 200, 16))
+        white.draw(self.screen, f"Day {state.day} Hour {state.hour:02d} ({state.phase})", self.at(self.width - 260, 40))
+        white.draw(
+            self.screen,
             f"[1] Food {state.inventory['food']}  [2] Water {state.inventory['water']}  [3] Liquid {state.inventory['liquid']}",
-            True,
-            WHITE,
+            self.at(16, self.height - 28),
         )
-        self.screen.blit(inv, (16, HEIGHT - 28))
 
         if state.has_axe:
-            axe = self.font.render("Axe ready (SPACE)", True, WHITE)
-            self.screen.blit(axe, (WIDTH - 200, 64))
+            white.draw(self.screen, "Axe ready (SPACE)", self.at(self.width - 200, 64))
 
         if state.messages:
-            y = HEIGHT - 110
+            gray = self.glyphs(LIGHT_GRAY)
+            x, y = self.at(16, self.height - 110)
             for msg in state.messages:
-                text = self.font.render(msg, True, LIGHT_GRAY)
-                self.screen.blit(text, (16, y))
-                y += 18
+                gray.draw(self.screen, msg, (x, y))
+                y += self.line
+
+    def glyphs(self, color):
+        """Glyph atlas of the HUD font in ``color``, shared by every UI at this scale."""
+        return glyph_atlas(self.font, color)
+
+    def at(self, x, y):
+        """Screen position of a logical layout position."""
+        return x * self.scale, y * self.scale
+
+    def centered(self, img, y):
+        return (self.width * self.scale - img.get_width()) / 2, y * self.scale
 
     def draw_prompt(self, text):
         if not text:
             return
-        img = self.font.render(text, True, WHITE)
-        self.screen.blit(img, (WIDTH / 2 - img.get_width() / 2, HEIGHT - 90))
+        white = self.glyphs(WHITE)
+        width = white.size(text)[0]
+        white.draw(self.screen, text, ((self.width * self.scale - width) / 2, (self.height - 90) * self.scale))
 
     def draw_intro(self):
-        self.screen.fill((10, 10, 12))
+        if self.intro_surface is None:
+            self.intro_surface = self.render_intro()
+        self.screen.blit(self.intro_surface, (0, 0))
+
+    def render_intro(self):
+        surface = pygame.Surface(self.screen.get_size())
+        surface.fill((10, 10, 12))
         lines = [
             "Horror House Survival",
             "Survive five days inside the house.",
@@ -72,48 +100,92 @@ class UI:
         ]
         for i, line in enumerate(lines):
             img = self.big.render(line, True, WHITE)
-            self.screen.blit(img, (WIDTH / 2 - img.get_width() / 2, 120 + i * 42))
+            surface.blit(img, self.centered(img, 120 + i * 42))
+        return surface
+
+    def blend_rect(self, color, rect):
+        """Alpha-blend a filled rect onto the screen through a cached patch surface."""
+        s = self.scale
+        key = (max(1, round(rect[2] * s)), max(1, round(rect[3] * s)), color)
+        patch = self.patches.get(key)
+        if patch is None:
+            patch = self.patches[key] = pygame.Surface(key[:2], pygame.SRCALPHA)
+            patch.fill(color)
+        self.screen.blit(patch, self.at(rect[0], rect[1]))
 
     def draw_effects(self, state):
+        # Full quality composites the vignette on a full-screen layer; lower levels
+        # blend its four edges, which touches a fraction of the pixels. Motes, drips
+        # and hallucination flicker come from the particle pool, capped per level.
+        layered = self.quality["effects"] == "layer"
+        width, height = self.width, self.height
+        s = self.scale
         if state.sanity < 35:
             strength = (35 - state.sanity) / 35
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pygame.draw.rect(overlay, (0, 0, 0, int(120 * strength)), overlay.get_rect(), 20)
-            self.screen.blit(overlay, (0, 0))
-        if state.hallucination_active:
-            noise = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            for _ in range(40):
-                x = random.randint(0, WIDTH)
-                y = random.randint(0, HEIGHT)
-                w = random.randint(20, 80)
-                h = random.randint(2, 6)
-                pygame.draw.rect(noise, (120, 80, 140, 30), (x, y, w, h))
-            self.screen.blit(noise, (0, 0))
-        if state.curse_timer > 0:
-            glitch = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            for _ in range(18):
-                x = random.randint(0, WIDTH)
-                y = random.randint(0, HEIGHT)
-                w = random.randint(40, 120)
-                h = random.randint(4, 10)
-                pygame.draw.rect(glitch, (150, 100, 140, 40), (x, y, w, h))
-            self.screen.blit(glitch, (0, 0))
+            color = (0, 0, 0, int(120 * strength))
+            if layered:
+                overlay = pygame.Surface(self.at(WIDTH, HEIGHT), pygame.SRCALPHA)
+                pygame.draw.rect(overlay, color, overlay.get_rect(), round(20 * s))
+                self.screen.blit(overlay, (0, 0))
+            else:
+                for rect in ((0, 0, width, 20), (0, height - 20, width, 20), (0, 20, 20, height - 40), (width - 20, 20, 20, height - 40)):
+                    self.blend_rect(color, rect)
+        if self.particles is None:
+            self.particles = ParticlePool(scale=s)
+        self.particles.limit = self.quality["particles"]
+        self.particles.update(state, self.screen)
 
     def draw_death(self, state, monster_surface, monster_name):
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((200, 20, 20, 80))
-        self.screen.blit(overlay, (0, 0))
+        if self.death_overlay is None:
+            self.death_overlay = pygame.Surface(self.at(WIDTH, HEIGHT), pygame.SRCALPHA)
+            self.death_overlay.fill((200, 20, 20, 80))
+        self.screen.blit(self.death_overlay, (0, 0))
         if monster_surface:
-            scaled = pygame.transform.smoothscale(monster_surface, (240, 360))
-            self.screen.blit(scaled, (WIDTH // 2 - 120, HEIGHT // 2 - 200))
+            scaled = self.scaled_monsters.get(monster_surface)
+            if scaled is None:
+                size = (round(240 * self.scale), round(360 * self.scale))
+                scaled = self.scaled_monsters[monster_surface] = pygame.transform.smoothscale(monster_surface, size)
+            self.screen.blit(scaled, self.at(self.width // 2 - 120, self.height // 2 - 200))
         title = self.big.render(monster_name, True, WHITE)
-        self.screen.blit(title, (WIDTH / 2 - title.get_width() / 2, 20))
+        self.screen.blit(title, self.centered(title, 20))
 
     def draw_summary(self, lines):
-        y = HEIGHT / 2 + 120
-        for line in lines:
-            text = self.font.render(line, True, WHITE)
-            self.screen.blit(text, (WIDTH / 2 - text.get_width() / 2, y))
+        key = tuple(lines)
+        if key != self.summary_key:
+            self.summary_key = key
+            self.summary_lines = [self.font.render(line, True, WHITE) for line in lines]
+            self.summary_lines.append(self.font.render("Press R to restart or ESC to quit.", True, WHITE))
+        y = self.height / 2 + 120
+        for text in self.summary_lines[:-1]:
+            self.screen.blit(text, self.centered(text, y))
             y += 18
-        sub = self.font.render("Press R to restart or ESC to quit.", True, WHITE)
-        self.screen.blit(sub, (WIDTH / 2 - sub.get_width() / 2, HEIGHT - 60))
+        sub = self.summary_lines[-1]
+        self.screen.blit(sub, self.centered(sub, self.height - 60))
+
+    def draw_panel(self, header, rows):
+        panel = pygame.Surface(self.at(430, 24 + 18 * len(rows)), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        self.screen.blit(panel, self.at(self.width - 440, 90))
+        self.glyphs(LIGHT_GRAY).draw(self.screen, header, self.at(self.width - 432, 94))
+        y = 112
+        for text, color in rows:
+            self.glyphs(color).draw(self.screen, text, self.at(self.width - 432, y))
+            y += 18
+
+    def draw_profiler(self, rows, budget_ms):
+        self.draw_panel(
+            "section            p50   p95   p99 ms",
+            [
+                (f"{name[-18:]:<18} {p50:5.2f} {p95:5.2f} {p99:5.2f}", RED if p95 > budget_ms else WHITE)
+                for name, p50, p95, p99, _ in rows
+            ],
+        )
+
+    def draw_allocations(self, rows, budget_kb):
+        self.draw_panel(
+            "section          avg   p95  max KB surf",
+            [
+                (f"{name[-16:]:<16} {avg:5.1f} {p95:5.1f} {worst:5.1f} {surfaces:4.1f}", RED if p95 > budget_kb else WHITE)
+                for name, avg, p95, worst, surfaces in rows
+            ],
+        )
@@ -0,0 +1,161 @@
+"""Torch visibility: the cone raycast against room obstacles, with cached polygons.
+
+A visibility polygon is the torch sector clipped by the room's obstacles. Rays
+are cast at even steps across the sector plus either side of every obstacle
+corner inside it, so shadow edges are exact. Polygons are cached per room and
+quantized player position and direction, and cast from the quantized position;
+hit tests measure targets from that same origin, so they agree with the
+polygon's shadows exactly. Torch hit tests and the drawn beam both read the
+same cached polygon, so a frame normally costs a dict lookup and
+a binary search rather than a full raycast.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+TORCH_ANGLE = 40
+TORCH_REACH = 260
+RAYS = 33
+POSITION_QUANTUM = 8
+ANGLE_QUANTUM = 2
+CACHE_SIZE = 1024
+CORNER_EPSILON = 1e-4
+
+
+def ray_distance(origin, dx, dy, rect, limit):
+    """Distance along a unit ray to ``rect`` (slab test), or ``limit`` if it is not hit sooner."""
+    near, far = 0.0, limit
+    for o, d, low, high in ((origin[0], dx, rect.left, rect.right), (origin[1], dy, rect.top, rect.bottom)):
+        if abs(d) < 1e-12:
+            if o < low or o > high:
+                return limit
+            continue
+        t1 = (low - o) / d
+        t2 = (high - o) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        near = max(near, t1)
+        far = min(far, t2)
+        if near > far:
+            return limit
+    return near
+
+
+class Beam:
+    """A visibility polygon around ``origin``, stored as offsets sorted by angle."""
+
+    def __init__(self, origin, heading, angles, distances, reach):
+        self.origin = origin
+        self.heading = heading
+        self.angles = angles
+        self.distances = distances
+        self.reach = reach
+        self.points = [
+            (math.cos(heading + a) * r, math.sin(heading + a) * r) for a, r in zip(angles, distances)
+        ]
+
+    def contains(self, offset):
+        """True if a point at ``offset`` from the origin is lit."""
+        dist = math.hypot(offset[0], offset[1])
+        if dist > self.reach:
+            return False
+        if dist == 0:
+            return True
+        angle = math.atan2(offset[1], offset[0]) - self.heading
+        angle = (angle + math.pi) % (2 * math.pi) - math.pi
+        if angle < self.angles[0] or angle > self.angles[-1]:
+            return False
+        i = max(1, bisect_left(self.angles, angle))
+        r0, r1 = self.distances[i - 1], self.distances[i]
+        if r0 >= self.reach and r1 >= self.reach:
+            return True  # Unobstructed: the sector's arc, not the chord.
+        # Intersect the ray towards the point with the polygon edge between rays i-1 and i.
+        (x0, y0), (x1, y1) = self.points[i - 1], self.points[i]
+        ux, uy = offset[0] / dist, offset[1] / dist
+        ex, ey = x1 - x0, y1 - y0
+        denom = ux * ey - uy * ex
+        if abs(denom) < 1e-12:
+            return dist <= max(r0, r1)
+        edge = (x0 * ey - y0 * ex) / denom
+        return dist <= edge + 1e-6
+
+    def polygon(self, origin, scale=1.0):
+        ox, oy = origin
+        return [(ox, oy)] + [(ox + x * scale, oy + y * scale) for x, y in self.points]
+
+
+class Visibility:
+    def __init__(self, obstacles, angle=TORCH_ANGLE, reach=TORCH_REACH, rays=RAYS, cache_size=CACHE_SIZE):
+        self.obstacles = obstacles
+        self.half = math.radians(angle)
+        self.reach = reach
+        self.rays = rays
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        # The renderer and a simulation thread may share one state's cache.
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        """Drop cached polygons, e.g. after room geometry changed."""
+        with self.lock:
+            self.cache.clear()
+
+    def key(self, room, origin, direction):
+        q = POSITION_QUANTUM
+        heading = round(math.degrees(math.atan2(direction[1], direction[0])) / ANGLE_QUANTUM) % (360 // ANGLE_QUANTUM)
+        return room, round(origin[0] / q), round(origin[1] / q), heading
+
+    def beam(self, room, origin, direction):
+        key = self.key(room, origin, direction)
+        with self.lock:
+            beam = self.cache.get(key)
+            if beam is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return beam
+        q = POSITION_QUANTUM
+        beam = self.cast(self.obstacles[room], (key[1] * q, key[2] * q), math.radians(key[3] * ANGLE_QUANTUM))
+        with self.lock:
+            self.misses += 1
+            self.cache[key] = beam
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return beam
+
+    def cast(self, obstacles, origin, heading):
+        half, reach = self.half, self.reach
+        angles = [-half + 2 * half * i / (self.rays - 1) for i in range(self.rays)]
+        # Quantizing can put the origin just inside an obstacle the player is touching;
+        # that obstacle cannot occlude anything in front of the player.
+        nearby = [
+            rect for rect in obstacles
+            if rect.inflate(2 * reach, 2 * reach).collidepoint(origin) and not rect.collidepoint(origin)
+        ]
+        for rect in nearby:
+            for corner in (rect.topleft, (rect.right, rect.top), (rect.left, rect.bottom), (rect.right, rect.bottom)):
+                angle = math.atan2(corner[1] - origin[1], corner[0] - origin[0]) - heading
+                angle = (angle + math.pi) % (2 * math.pi) - math.pi
+                for a in (angle - CORNER_EPSILON, angle + CORNER_EPSILON):
+                    if -half < a < half:
+                        angles.append(a)
+        angles.sort()
+        distances = []
+        for a in angles:
+            dx, dy = math.cos(heading + a), math.sin(heading + a)
+            dist = reach
+            for rect in nearby:
+                dist = ray_distance(origin, dx, dy, rect, dist)
+            distances.append(dist)
+        return Beam(origin, heading, angles, distances, reach)
+
+    def lit(self, room, origin, direction, target):
+        """True if ``target`` is inside the torch beam from ``origin`` facing ``direction``."""
+        beam = self.beam(room, origin, direction)
+        return beam.contains((target[0] - beam.origin[0], target[1] - beam.origin[1]))
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self.cache)}
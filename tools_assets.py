@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Report the pixel format chosen for each asset, and optionally time every candidate.
+
+Usage:
+  python tools_assets.py
+  python tools_assets.py --time                  # also measure the blit cost of each format
+  python tools_assets.py --scale 0.5 --assets path/to/assets
+"""
+
+import argparse
+import sys
+
+from src.assets import asset_report
+from src.game import default_asset_root
+from src.headless import init_headless
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", default=default_asset_root(), help="asset root directory")
+    parser.add_argument("--scale", type=float, default=1.0, help="render scale to load assets for")
+    parser.add_argument("--time", action="store_true", help="time a blit of every candidate format")
+    args = parser.parse_args()
+
+    init_headless()
+    atlas, rows = asset_report(args.assets, args.scale, timed=args.time)
+    width, height = atlas.surface.get_size()
+    if not args.time:
+        print(f"{'asset':<18} {'alpha':<12} chosen")
+        for name, kind, chosen, _ in rows:
+            print(f"{name:<18} {kind:<12} {chosen}")
+        print(f"atlas {width}x{height} with {len(atlas.rects)} sprites")
+        return 0
+    formats = sorted({fmt for row in rows for fmt in row[3]})
+    print(f"{'asset':<18} {'alpha':<12} {'chosen':<9}" + "".join(f"{fmt:>11}" for fmt in formats) + "   us/blit")
+    before = after = 0.0
+    for name, kind, chosen, timings in rows:
+        cells = "".join(f"{timings[fmt]:11.2f}" if fmt in timings else f"{'-':>11}" for fmt in formats)
+        print(f"{name:<18} {kind:<12} {chosen:<9}{cells}")
+        before += timings["alpha"]
+        after += timings[chosen]
+    print(f"atlas {width}x{height} with {len(atlas.rects)} sprites")
+    print(f"one blit of every asset: {before:.1f} us as loaded, {after:.1f} us optimized")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
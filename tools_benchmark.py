@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Headless benchmark of scripted scenarios with baseline regression gates.
+
+Usage:
+  python tools_benchmark.py                       # run and compare to benchmarks/baseline.json
+  python tools_benchmark.py --save-baseline       # record a new baseline on this machine
+  python tools_benchmark.py --scenario night_torch_tv --threshold 0.1 --metric-threshold render_p95_ms=0.3
+  python tools_benchmark.py --alloc-budget --save-baseline   # calibrate per-scenario allocation budgets
+  python tools_benchmark.py --alloc-budget                   # gate frames on the calibrated budgets
+  python tools_benchmark.py --alloc-budget 64 --section-budget UI.draw_effects=16
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from src.allocs import steady_peak
+from src.bench import SCENARIOS, compare, run_alloc_budget, run_scenario
+from src.game import default_asset_root
+from src.headless import init_headless
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+# Baseline key holding a scenario's largest steady-state frame allocation, in KB.
+FRAME_ALLOC_KEY = "frame_alloc_kb"
+
+
+def parse_limits(values):
+    thresholds = {}
+    for item in values:
+        metric, _, limit = item.partition("=")
+        thresholds[metric] = float(limit)
+    return thresholds
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, baseline):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    print(f"Baseline written to {path}")
+
+
+def check_alloc_budgets(args, asset_root):
+    """Fixed ``--alloc-budget KB``, or each scenario's calibrated peak plus --threshold."""
+    section_budgets = parse_limits(args.section_budget)
+    calibrated = args.alloc_budget == "baseline"
+    baseline = load_baseline(args.baseline) or {}
+    failed = False
+    for name in args.scenario or sorted(SCENARIOS):
+        budget = None
+        if calibrated and not args.save_baseline:
+            peak = baseline.get(name, {}).get(FRAME_ALLOC_KEY)
+            if peak is None:
+                print(f"{name}: no calibrated allocation budget in {args.baseline}; run --alloc-budget --save-baseline")
+                failed = True
+                continue
+            budget = peak * (1 + args.threshold)
+        elif not calibrated:
+            budget = float(args.alloc_budget)
+        tracker, violations = run_alloc_budget(
+            asset_root, name, args.frames, args.warmup, args.seed, budget, section_budgets
+        )
+        peak = steady_peak(tracker, args.warmup)
+        print(f"{name}: steady-state peak {peak:.2f} KB" + (f", budget {budget:.2f} KB" if budget else ""))
+        if args.save_baseline:
+            baseline.setdefault(name, {})[FRAME_ALLOC_KEY] = peak
+        for section, avg, p95, worst, surfaces in tracker.stats():
+            print(f"  {section:<28} avg {avg:8.2f} KB  p95 {p95:8.2f} KB  max {worst:8.2f} KB  {surfaces:5.2f} surfaces")
+        for index, section, used, limit in violations[:10]:
+            print(f"  OVER BUDGET frame {index} {section}: {used:.2f} KB > {limit:.2f} KB")
+        if violations:
+            print(f"  {len(violations)} budget violations")
+            failed = True
+    if args.save_baseline:
+        save_baseline(args.baseline, baseline)
+        return 0
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="scenario to run (repeatable)")
+    parser.add_argument("--ticks", type=int, default=3000, help="headless update ticks per scenario")
+    parser.add_argument("--frames", type=int, default=600, help="offscreen render frames per scenario")
+    parser.add_argument("--alloc-ticks", type=int, default=300, help="ticks traced for allocations (0 disables)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-render", action="store_true", help="skip the Game.render pass")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--metric-threshold", action="append", default=[], metavar="METRIC=LIMIT")
+    parser.add_argument("--json", help="also write the results to this path")
+    parser.add_argument(
+        "--alloc-budget",
+        nargs="?",
+        const="baseline",
+        metavar="KB",
+        help="fail if a steady-state frame allocates more KB than this; without a value, more than the "
+        "scenario's calibrated peak from the baseline plus --threshold",
+    )
+    parser.add_argument("--section-budget", action="append", default=[], metavar="SECTION=KB")
+    parser.add_argument("--warmup", type=int, default=60, help="frames ignored by the allocation budget")
+    args = parser.parse_args()
+
+    init_headless()
+    asset_root = default_asset_root()
+    if args.alloc_budget is not None:
+        return check_alloc_budgets(args, asset_root)
+    results = {}
+    for name in args.scenario or sorted(SCENARIOS):
+        results[name] = run_scenario(
+            asset_root,
+            name,
+            ticks=args.ticks,
+            frames=args.frames,
+            alloc_ticks=args.alloc_ticks,
+            seed=args.seed,
+            render=not args.no_render,
+        )
+        print(name)
+        for metric, value in sorted(results[name].items()):
+            print(f"  {metric:<28} {value:12.4f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    baseline = load_baseline(args.baseline)
+    if args.save_baseline:
+        # Keep the calibrated allocation budgets, which only --alloc-budget measures.
+        for name, metrics in (baseline or {}).items():
+            if FRAME_ALLOC_KEY in metrics and name in results:
+                results[name][FRAME_ALLOC_KEY] = metrics[FRAME_ALLOC_KEY]
+        save_baseline(args.baseline, {**(baseline or {}), **results})
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+    regressions = compare(results, baseline, args.threshold, parse_limits(args.metric_threshold))
+    for name, metric, base, value, change in regressions:
+        print(f"REGRESSION {name}.{metric}: {base:.4f} -> {value:.4f} ({change:+.1%})")
+    if regressions:
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Run the reference bots headlessly and report how long they survive.
+
+Usage:
+  python tools_bot.py --bot planner --games 5 --minutes 10
+  python tools_bot.py --bot heuristic --games 50 --json results.json
+"""
+
+import argparse
+import json
+import sys
+
+from src.bot import HeuristicBot, PlannerBot, play_game
+from src.constants import FPS
+from src.game import default_asset_root
+from src.headless import init_headless
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bot", choices=("planner", "heuristic"), default="planner")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--minutes", type=float, default=10.0, help="game minutes to play before stopping")
+    parser.add_argument("--budget-ms", type=float, default=4.0, help="planner search time per tick")
+    parser.add_argument("--workers", type=int, default=0, help="planner worker processes")
+    parser.add_argument("--json", help="write per-game results to this path")
+    args = parser.parse_args()
+
+    init_headless()
+    asset_root = default_asset_root()
+    results = []
+    for game in range(args.games):
+        if args.bot == "planner":
+            bot = PlannerBot(budget_ms=args.budget_ms, workers=args.workers, seed=args.seed + game)
+        else:
+            bot = HeuristicBot()
+        try:
+            result = play_game(asset_root, bot, args.seed + game, args.minutes, 1.0 / FPS)
+        finally:
+            if args.bot == "planner":
+                bot.close()
+        results.append(result)
+        status = "won" if result["win"] else (f"died ({result['cause']})" if result["dead"] else "alive")
+        print(f"seed {result['seed']:>4}: {result['time']} {status:<24} {result['wall_ms_per_tick']:.2f} ms/tick")
+
+    survived = [r["survived_s"] for r in results]
+    deaths = sum(1 for r in results if r["dead"])
+    print(f"mean survival {sum(survived) / len(survived):.1f}s, deaths {deaths}/{len(results)}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Export a headless bot playthrough to video as fast as it renders.
+
+Usage:
+  python tools_capture.py --seed 3 --seconds 60 --format raw --out capture_seed3
+  python tools_capture.py --seconds 30 --format png
+  python tools_capture.py --seconds 120 --format ffmpeg   # needs ffmpeg on PATH
+"""
+
+import argparse
+import sys
+import time
+
+from src.bot import HeuristicBot
+from src.capture import FORMATS, FrameCapture
+from src.constants import FPS
+from src.game import Game, default_asset_root
+from src.headless import init_headless
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=30.0, help="game seconds to record")
+    parser.add_argument("--format", choices=FORMATS, default="raw")
+    parser.add_argument("--out", help="output directory (default capture_seed<seed>)")
+    parser.add_argument("--pool", type=int, default=8, help="preallocated frame buffers")
+    parser.add_argument("--writers", type=int, default=2, help="PNG encoder threads")
+    args = parser.parse_args()
+
+    screen = init_headless()
+    game = Game(default_asset_root(), seed=args.seed)
+    game.intro = False
+    game.bot = HeuristicBot()
+    capture = FrameCapture(args.out or f"capture_seed{args.seed}", args.format, FPS, args.pool, args.writers)
+    dt = 1.0 / FPS
+    frames = int(args.seconds * FPS)
+    started = time.perf_counter()
+    for _ in range(frames):
+        game.update(dt)
+        game.render()
+        capture.capture(screen, block=True)
+        if game.state.dead or game.state.win:
+            break
+    stats = capture.close()
+    elapsed = time.perf_counter() - started
+    video_seconds = stats["written"] / FPS
+    print(
+        f"{stats['written']} frames ({video_seconds:.1f}s of video) in {elapsed:.1f}s, "
+        f"{video_seconds / elapsed:.1f}x real time -> {capture.directory}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,459 @@
 #!/usr/bin/env python3
-"""Simple image coordinate viewer for backgrounds.
+"""Room editor: draw, move and save obstacle and zone rectangles over a background.
+
+Rects are edited in the game's 960x540 logical space and saved to the room data
+file (rooms.json) that GameState loads; a running game started with --hot-reload
+picks the saved file up. Large backgrounds are cut into tiles that are scaled
+once per zoom level and cached, and the window is only redrawn after input.
 
 Usage:
-  python tools_coords_viewer.py assets/backgrounds/living_room.png
+  python tools_coords_viewer.py
+  python tools_coords_viewer.py --room Bathroom
+  python tools_coords_viewer.py assets/backgrounds/bathroom.png --room Bathroom
+  python tools_coords_viewer.py --image assets/backgrounds/living_room.png --rooms rooms.json
+
+Controls:
+  left drag           draw a rect on empty space, move a rect, or resize it by its corner
+  O / Z               new rects are obstacles / zones
+  N                   rename the selected zone (type, then Enter)
+  B                   select the room bounds
+  arrows              nudge the selection (shift: 10 px)
+  Delete              remove the selection
+  wheel, + / -        zoom around the cursor
+  right/middle drag   pan
+  G                   toggle 8 px grid snapping
+  Tab                 next room
+  Ctrl+S              save
+  Esc                 quit
 """
 
+import argparse
 import sys
+from collections import OrderedDict
+
 import pygame
 
+from src.assets import resolve_path
+from src.constants import ASSET_BG_BATH, ASSET_BG_LIVING, HEIGHT, ROOM_BATH, ROOM_LIVING, WIDTH
+from src.game import default_asset_root
+from src.rooms import ROOM_NAMES, ROOMS_PATH, load_rooms, missing_zones, save_rooms
+
+BACKGROUNDS = {ROOM_LIVING: ASSET_BG_LIVING, ROOM_BATH: ASSET_BG_BATH}
+TILE = 256
+TILE_CACHE_SIZE = 256
+ZOOMS = tuple(2 ** (i / 2) for i in range(-6, 9))
+STATUS_HEIGHT = 24
+HANDLE = 6
+SNAP = 8
+COLORS = {"bounds": (120, 200, 255), "obstacle": (255, 90, 90), "zone": (90, 255, 140)}
+
+
+class TileCache:
+    """Scaled tiles of one image, built on first use per zoom level and kept in an LRU."""
+
+    def __init__(self, image, limit=TILE_CACHE_SIZE):
+        self.image = image
+        self.limit = limit
+        self.tiles = OrderedDict()
+
+    def tile(self, zoom, tx, ty):
+        key = (zoom, tx, ty)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        source = pygame.Rect(tx * TILE, ty * TILE, TILE, TILE).clip(self.image.get_rect())
+        # Edges come from the same rounding draw() uses, so neighbouring tiles never gap.
+        size = (round(source.right * zoom) - round(source.left * zoom), round(source.bottom * zoom) - round(source.top * zoom))
+        part = self.image.subsurface(source)
+        if size == source.size:
+            tile = part.copy()
+        elif zoom < 1:
+            tile = pygame.transform.smoothscale(part, (max(1, size[0]), max(1, size[1])))
+        else:
+            tile = pygame.transform.scale(part, size)  # Hard pixel edges for precise placement.
+        self.tiles[key] = tile
+        if len(self.tiles) > self.limit:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def draw(self, screen, view, zoom, origin):
+        """Blit the tiles covering ``view`` with image pixel ``origin / zoom`` at its top left."""
+        w, h = self.image.get_size()
+        ox, oy = origin
+        first_x, first_y = max(0, int(ox / zoom) // TILE), max(0, int(oy / zoom) // TILE)
+        last_x = min((w - 1) // TILE, int((ox + view.width) / zoom) // TILE)
+        last_y = min((h - 1) // TILE, int((oy + view.height) / zoom) // TILE)
+        for ty in range(first_y, last_y + 1):
+            for tx in range(first_x, last_x + 1):
+                pos = (round(tx * TILE * zoom) - ox + view.x, round(ty * TILE * zoom) - oy + view.y)
+                screen.blit(self.tile(zoom, tx, ty), pos)
+
+
+def placeholder_background():
+    surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+    surface.fill((30, 30, 40))
+    for x in range(0, WIDTH, 40):
+        pygame.draw.line(surface, (45, 45, 60), (x, 0), (x, HEIGHT))
+    for y in range(0, HEIGHT, 40):
+        pygame.draw.line(surface, (45, 45, 60), (0, y), (WIDTH, y))
+    return surface
+
+
+class Editor:
+    def __init__(self, screen, rooms, rooms_path, room, asset_root, image_path=None):
+        self.screen = screen
+        self.rooms = rooms
+        self.rooms_path = rooms_path
+        self.asset_root = asset_root
+        self.image_path = image_path
+        self.font = pygame.font.Font(None, 20)
+        self.caches = {}
+        self.mode = "obstacle"
+        self.snap = 1
+        self.unsaved = False
+        self.naming = None
+        self.drag = None
+        self.status_text = None
+        self.status_image = None
+        self.mouse = (0, 0)
+        self.running = True
+        self.set_room(room)
+
+    # Geometry -----------------------------------------------------------
+
+    def set_room(self, room):
+        self.room = room
+        self.selected = None
+        if room not in self.caches:
+            if self.image_path:
+                image = pygame.image.load(self.image_path).convert()
+            else:
+                path = resolve_path(self.asset_root, BACKGROUNDS[room])
+                try:
+                    image = pygame.image.load(path).convert()
+                except (pygame.error, FileNotFoundError):
+                    image = placeholder_background()
+            self.caches[room] = TileCache(image)
+        self.tiles = self.caches[room]
+        w, h = self.tiles.image.get_size()
+        # Image pixels per logical unit; the game stretches backgrounds to WIDTH x HEIGHT.
+        self.kx, self.ky = w / WIDTH, h / HEIGHT
+        self.fit()
+
+    def view(self):
+        w, h = self.screen.get_size()
+        return pygame.Rect(0, 0, w, max(1, h - STATUS_HEIGHT))
+
+    def fit(self):
+        view = self.view()
+        w, h = self.tiles.image.get_size()
+        fits = [z for z in ZOOMS if w * z <= view.width and h * z <= view.height]
+        self.zoom_index = ZOOMS.index(fits[-1]) if fits else 0
+        self.pan = (0.0, 0.0)
+
+    @property
+    def zoom(self):
+        return ZOOMS[self.zoom_index]
+
+    def origin(self):
+        return round(self.pan[0] * self.zoom), round(self.pan[1] * self.zoom)
+
+    def to_screen(self, rect):
+        ox, oy = self.origin()
+        z = self.zoom
+        left, top = round(rect.left * self.kx * z) - ox, round(rect.top * self.ky * z) - oy
+        right, bottom = round(rect.right * self.kx * z) - ox, round(rect.bottom * self.ky * z) - oy
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def to_world(self, pos):
+        ox, oy = self.origin()
+        return (pos[0] + ox) / self.zoom / self.kx, (pos[1] + oy) / self.zoom / self.ky
+
+    def snapped(self, pos):
+        return tuple(int(round(v / self.snap) * self.snap) for v in self.to_world(pos))
+
+    def items(self):
+        room = self.rooms[self.room]
+        yield "bounds", None, room.bounds
+        for i, rect in enumerate(room.obstacles):
+            yield "obstacle", i, rect
+        for name, rect in room.zones.items():
+            yield "zone", name, rect
+
+    def rect_of(self, item):
+        kind, key = item
+        room = self.rooms[self.room]
+        if kind == "bounds":
+            return room.bounds
+        return room.obstacles[key] if kind == "obstacle" else room.zones[key]
+
+    def hit(self, pos):
+        """(item, "resize" | "move") under the cursor; the bounds can only be resized."""
+        found = None
+        for kind, key, rect in self.items():
+            box = self.to_screen(rect)
+            if pygame.Rect(box.right - HANDLE, box.bottom - HANDLE, 2 * HANDLE, 2 * HANDLE).collidepoint(pos):
+                found = (kind, key), "resize"
+            elif kind != "bounds" and box.collidepoint(pos):
+                found = (kind, key), "move"
+        return found
+
+    # Editing ------------------------------------------------------------
+
+    def add_rect(self, rect):
+        room = self.rooms[self.room]
+        if self.mode == "obstacle":
+            room.obstacles.append(rect)
+            self.selected = ("obstacle", len(room.obstacles) - 1)
+        else:
+            name = "Zone"
+            n = 2
+            while any(name in r.zones for r in self.rooms.values()):
+                name, n = f"Zone{n}", n + 1
+            room.zones[name] = rect
+            self.selected = ("zone", name)
+        self.unsaved = True
+
+    def delete(self):
+        if not self.selected or self.selected[0] == "bounds":
+            return
+        kind, key = self.selected
+        room = self.rooms[self.room]
+        if kind == "obstacle":
+            del room.obstacles[key]
+        else:
+            del room.zones[key]
+        self.selected = None
+        self.unsaved = True
+
+    def rename(self, name):
+        kind, old = self.selected
+        if not name or name == old or any(name in r.zones for r in self.rooms.values()):
+            return
+        room = self.rooms[self.room]
+        zones = [(name if zone == old else zone, rect) for zone, rect in room.zones.items()]
+        room.zones.clear()
+        room.zones.update(zones)
+        self.selected = ("zone", name)
+        self.unsaved = True
+
+    def save(self):
+        missing = missing_zones({zone for room in self.rooms.values() for zone in room.zones})
+        if missing:
+            print(f"Not saved: the game needs zones {', '.join(missing)}")
+            return
+        save_rooms(self.rooms, self.rooms_path)
+        self.unsaved = False
+        print(f"Saved {self.rooms_path}")
+
+    def zoom_at(self, pos, step):
+        index = max(0, min(len(ZOOMS) - 1, self.zoom_index + step))
+        if index == self.zoom_index:
+            return
+        # Keep the image pixel under the cursor in place.
+        px, py = (pos[0] + self.origin()[0]) / self.zoom, (pos[1] + self.origin()[1]) / self.zoom
+        self.zoom_index = index
+        self.pan = (px - pos[0] / self.zoom, py - pos[1] / self.zoom)
+
+    # Events -------------------------------------------------------------
+
+    def handle(self, event):
+        """Apply one event; return "full", "status" or None for what needs redrawing."""
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.VIDEORESIZE:
+            return "full"
+        elif event.type == pygame.WINDOWEXPOSED:
+            return "full"
+        elif self.naming is not None:
+            return self.handle_naming(event)
+        elif event.type == pygame.KEYDOWN:
+            return self.handle_key(event)
+        elif event.type == pygame.MOUSEWHEEL:
+            self.zoom_at(pygame.mouse.get_pos(), 1 if event.y > 0 else -1)
+            return "full"
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            found = self.hit(event.pos)
+            if found:
+                self.selected, action = found
+                rect = self.rect_of(self.selected)
+                start = self.snapped(event.pos)
+                self.drag = (action, start, rect.copy())
+            else:
+                self.selected = None
+                self.drag = ("draw", self.snapped(event.pos), None)
+            return "full"
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (2, 3):
+            self.drag = ("pan", event.pos, self.pan)
+        elif event.type == pygame.MOUSEBUTTONUP and self.drag:
+            action, start, _ = self.drag
+            self.drag = None
+            if action == "draw":
+                end = self.snapped(event.pos)
+                rect = pygame.Rect(min(start[0], end[0]), min(start[1], end[1]), abs(end[0] - start[0]), abs(end[1] - start[1]))
+                if rect.width and rect.height:
+                    self.add_rect(rect)
+            return "full"
+        elif event.type == pygame.MOUSEMOTION:
+            self.mouse = event.pos
+            return self.drag_to(event.pos) or "status"
+        return None
+
+    def drag_to(self, pos):
+        if not self.drag:
+            return None
+        action, start, original = self.drag
+        if action == "pan":
+            self.pan = (original[0] - (pos[0] - start[0]) / self.zoom, original[1] - (pos[1] - start[1]) / self.zoom)
+            return "full"
+        if action == "draw":
+            return "full"
+        x, y = self.snapped(pos)
+        rect = self.rect_of(self.selected)
+        if action == "move":
+            rect.topleft = (original.x + x - start[0], original.y + y - start[1])
+        else:
+            rect.size = (max(1, original.width + x - start[0]), max(1, original.height + y - start[1]))
+        self.unsaved = True
+        return "full"
+
+    def handle_key(self, event):
+        key = event.key
+        if key == pygame.K_ESCAPE:
+            self.running = False
+        elif key == pygame.K_s and event.mod & pygame.KMOD_CTRL:
+            self.save()
+        elif key == pygame.K_o:
+            self.mode = "obstacle"
+        elif key == pygame.K_z:
+            self.mode = "zone"
+        elif key == pygame.K_g:
+            self.snap = SNAP if self.snap == 1 else 1
+        elif key == pygame.K_b:
+            self.selected = ("bounds", None)
+        elif key == pygame.K_n and self.selected and self.selected[0] == "zone":
+            self.naming = ""
+            pygame.key.start_text_input()
+        elif key in (pygame.K_DELETE, pygame.K_BACKSPACE):
+            self.delete()
+        elif key == pygame.K_TAB:
+            self.set_room(ROOM_NAMES[(ROOM_NAMES.index(self.room) + 1) % len(ROOM_NAMES)])
+        elif key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.zoom_at(self.view().center, 1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.zoom_at(self.view().center, -1)
+        elif key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN) and self.selected:
+            step = 10 if event.mod & pygame.KMOD_SHIFT else 1
+            dx = {pygame.K_LEFT: -step, pygame.K_RIGHT: step}.get(key, 0)
+            dy = {pygame.K_UP: -step, pygame.K_DOWN: step}.get(key, 0)
+            self.rect_of(self.selected).move_ip(dx, dy)
+            self.unsaved = True
+        else:
+            return None
+        return "full"
+
+    def handle_naming(self, event):
+        if event.type == pygame.TEXTINPUT:
+            self.naming += event.text
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE:
+            self.naming = self.naming[:-1]
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_RETURN, pygame.K_ESCAPE):
+            if event.key == pygame.K_RETURN:
+                self.rename(self.naming.strip())
+            self.naming = None
+            pygame.key.stop_text_input()
+            return "full"
+        else:
+            return None
+        return "status"
+
+    # Drawing ------------------------------------------------------------
+
+    def draw(self):
+        view = self.view()
+        self.screen.fill((0, 0, 0), view)
+        self.screen.set_clip(view)
+        self.tiles.draw(self.screen, view, self.zoom, self.origin())
+        for kind, key, rect in self.items():
+            box = self.to_screen(rect)
+            width = 3 if self.selected == (kind, key) else 1
+            pygame.draw.rect(self.screen, COLORS[kind], box, width)
+            pygame.draw.rect(self.screen, COLORS[kind], (box.right - HANDLE // 2, box.bottom - HANDLE // 2, HANDLE, HANDLE))
+            if kind == "zone":
+                self.screen.blit(self.font.render(key, True, COLORS[kind]), (box.x + 3, box.y + 3))
+        if self.drag and self.drag[0] == "draw":
+            x0, y0 = self.drag[1]
+            x1, y1 = self.snapped(self.mouse)
+            rect = pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0))
+            pygame.draw.rect(self.screen, COLORS[self.mode], self.to_screen(rect), 1)
+        self.screen.set_clip(None)
+        self.draw_status(force=True)
+
+    def draw_status(self, force=False):
+        x, y = self.to_world(self.mouse)
+        parts = [f"{self.room}{' *' if self.unsaved else ''}", f"x={x:.0f} y={y:.0f}", f"zoom {self.zoom:.2f}",
+                 f"new: {self.mode}", f"snap {self.snap}"]
+        if self.selected:
+            kind, key = self.selected
+            parts.append(f"{key if kind == 'zone' else kind}: {list(self.rect_of(self.selected))}")
+        if self.naming is not None:
+            parts.append(f"name: {self.naming}_")
+        text = "   ".join(parts)
+        strip = pygame.Rect(0, self.view().bottom, self.screen.get_width(), STATUS_HEIGHT)
+        if text == self.status_text and not force:
+            return None
+        if text != self.status_text:
+            self.status_text = text
+            self.status_image = self.font.render(text, True, (230, 230, 230))
+        self.screen.fill((20, 20, 20), strip)
+        self.screen.blit(self.status_image, (8, strip.y + 5))
+        return strip
+
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python tools_coords_viewer.py <image_path>")
-        return
-    img_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", default=ROOMS_PATH, help="room data file to edit")
+    parser.add_argument("--room", choices=ROOM_NAMES, default=ROOM_LIVING, help="room to start in")
+    parser.add_argument("image", nargs="?", help="background to edit over instead of the room's asset")
+    parser.add_argument("--image", dest="image_option", metavar="IMAGE", help="same as the positional image")
+    parser.add_argument("--assets", default=default_asset_root(), help="asset root directory")
+    parser.add_argument("--size", default=f"{WIDTH}x{HEIGHT}", help="initial view size, WxH")
+    args = parser.parse_args()
+    if args.image and args.image_option and args.image != args.image_option:
+        parser.error("give the background image once, positionally or with --image")
+    image = args.image or args.image_option
+
     pygame.init()
-    img = pygame.image.load(img_path).convert_alpha()
-    screen = pygame.display.set_mode(img.get_size())
-    pygame.display.set_caption("Coordinate Viewer")
-    font = pygame.font.SysFont("consolas", 16)
-
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        screen.blit(img, (0, 0))
-        mx, my = pygame.mouse.get_pos()
-        text = font.render(f"x={mx} y={my}", True, (255, 255, 255))
-        screen.blit(text, (10, 10))
-        pygame.display.flip()
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    screen = pygame.display.set_mode((w, h + STATUS_HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("Room Editor")
+    rooms = load_rooms(args.rooms)
+    editor = Editor(screen, rooms, args.rooms, args.room, args.assets, image)
+    editor.draw()
+    pygame.display.flip()
+    while editor.running:
+        # Sleep until input; nothing on screen changes on its own.
+        events = [pygame.event.wait()] + pygame.event.get()
+        redraw = set()
+        for event in events:
+            redraw.add(editor.handle(event))
+        if not editor.running:
+            break
+        if "full" in redraw:
+            editor.screen = pygame.display.get_surface()
+            editor.draw()
+            pygame.display.flip()
+            pygame.display.set_caption(f"Room Editor - {editor.room}{' *' if editor.unsaved else ''}")
+        elif "status" in redraw:
+            strip = editor.draw_status()
+            if strip:
+                pygame.display.update(strip)
+    if editor.unsaved:
+        print("Quit with unsaved changes.")
     pygame.quit()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Record replays with state hashes and check that they re-simulate identically.
+
+A recorded replay holds the seed, every tick's length, movement and actions,
+a rolling hash of the simulation state every --hash-every ticks and a full
+snapshot every --keyframe-every ticks. Checking re-simulates it headlessly,
+keyframe segments in parallel, and reports the first tick whose hash differs
+and which parts of the state differ there. Record on one machine, Python or
+tick rate and check on another to catch desyncs.
+
+Usage:
+  python tools_replay.py --record replay.json --bot heuristic --seed 3 --minutes 20
+  python tools_replay.py --record replay.json --jitter 0.5 --hash-every 1
+  python tools_replay.py replay.json --workers 4
+  python tools_replay.py replays/*.json --from-start
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from src.bot import HeuristicBot, PlannerBot
+from src.constants import FPS
+from src.game import GameState, default_asset_root
+from src.headless import init_headless
+from src.replay import HASH_EVERY, KEYFRAME_EVERY, ReplayRecorder, check_replay, load_replay
+
+
+def record(args, asset_root):
+    state = GameState(asset_root, args.seed)
+    recorder = ReplayRecorder(state, args.hash_every, args.keyframe_every)
+    bot = PlannerBot(budget_ms=args.budget_ms, seed=args.seed) if args.bot == "planner" else HeuristicBot()
+    # Tick lengths vary on their own generator, like a real frame clock would.
+    jitter = random.Random(args.seed)
+    limit = args.minutes * 60.0
+    try:
+        while not (state.dead or state.win) and state.time_system.time < limit:
+            dt = args.dt * (1.0 + jitter.uniform(-args.jitter, args.jitter))
+            dx, dy = bot.act(state, dt)
+            state.move_player(dx, dy, dt)
+            state.update(dt)
+    finally:
+        if args.bot == "planner":
+            bot.close()
+    recorder.finish(state)
+    recorder.save(args.record)
+    print(
+        f"{args.record}: {recorder.ticks} ticks, {len(recorder.checkpoints)} checkpoints, "
+        f"{len(recorder.keyframes)} keyframes"
+    )
+    return 0
+
+
+def check(args, asset_root):
+    failed = 0
+    for path in args.replays:
+        replay = load_replay(path)
+        started = time.perf_counter()
+        divergence, warnings = check_replay(replay, asset_root, args.workers, args.from_start)
+        elapsed = time.perf_counter() - started
+        for warning in warnings:
+            print(f"{path}: warning: {warning}")
+        if divergence is None:
+            print(f"{path}: {replay['ticks']} ticks match ({elapsed:.1f}s)")
+            continue
+        failed += 1
+        since = "the start" if divergence.last_good is None else f"tick {divergence.last_good}"
+        print(f"{path}: diverged at tick {divergence.tick} (last match {since}) in {', '.join(divergence.fields)}")
+        for name, value in divergence.values.items():
+            print(f"  {name}: {value!r}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("replays", nargs="*", help="replays to check")
+    parser.add_argument("--record", metavar="PATH", help="play a headless bot game and save its replay here")
+    parser.add_argument("--bot", choices=("planner", "heuristic"), default="heuristic")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--minutes", type=float, default=10.0, help="game minutes to record")
+    parser.add_argument("--dt", type=float, default=1.0 / FPS, help="tick length in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="vary each tick length by up to this fraction")
+    parser.add_argument("--budget-ms", type=float, default=4.0, help="planner search time per tick")
+    parser.add_argument("--hash-every", type=int, default=HASH_EVERY, help="ticks between state hashes")
+    parser.add_argument("--keyframe-every", type=int, default=KEYFRAME_EVERY, help="ticks between full snapshots")
+    parser.add_argument("--workers", type=int, default=0, help="processes to check keyframe segments in")
+    parser.add_argument("--from-start", action="store_true", help="check in one pass from tick 0, ignoring keyframes")
+    args = parser.parse_args()
+    if not args.record and not args.replays:
+        parser.error("give replays to check, or --record PATH")
+
+    init_headless()
+    asset_root = default_asset_root()
+    if args.record:
+        return record(args, asset_root)
+    return check(args, asset_root)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
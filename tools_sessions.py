@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Run many bot sessions in one process through the SessionHost.
+
+Usage:
+  python tools_sessions.py --sessions 200 --seconds 10
+  python tools_sessions.py --sessions 300 --realtime --seconds 20 --memory-mb 8
+"""
+
+import argparse
+import sys
+import time
+
+from src.bot import HeuristicBot
+from src.constants import FPS
+from src.game import default_asset_root
+from src.headless import init_headless
+from src.sessions import SessionHost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=10.0, help="wall time to run")
+    parser.add_argument("--realtime", action="store_true", help="grant each session 60 ticks per wall second")
+    parser.add_argument("--slice-ms", type=float, default=16.0, help="host run() budget per loop")
+    parser.add_argument("--quantum-ms", type=float, default=0.5, help="scheduler credit per session turn")
+    parser.add_argument("--memory-mb", type=float, help="cap on live session state before eviction")
+    args = parser.parse_args()
+
+    init_headless()
+    limit = int(args.memory_mb * 1024 * 1024) if args.memory_mb else None
+    host = SessionHost(default_asset_root(), quantum_ms=args.quantum_ms, memory_limit=limit)
+    budget = 0 if args.realtime else None
+    ids = [host.create(args.seed + i, HeuristicBot(), budget) for i in range(args.sessions)]
+
+    started = last = time.perf_counter()
+    owed = 0.0
+    ticks = 0
+    while time.perf_counter() - started < args.seconds:
+        if args.realtime:
+            now = time.perf_counter()
+            owed += (now - last) * FPS
+            last = now
+            if owed >= 1.0:
+                for session_id in ids:
+                    host.grant(session_id, int(owed))
+                owed -= int(owed)
+        ticks += host.run(args.slice_ms)
+    elapsed = time.perf_counter() - started
+
+    counts = [host.sessions[session_id].ticks for session_id in ids]
+    finished = sum(1 for session_id in ids if host.sessions[session_id].finished)
+    memory = host.memory()
+    print(f"{ticks} ticks in {elapsed:.1f}s ({ticks / elapsed:.0f} ticks/s across {len(ids)} sessions)")
+    print(f"ticks per session: min {min(counts)}, max {max(counts)}, finished {finished}")
+    print(
+        f"active {memory['active']} ({memory['active_bytes'] / 1024:.0f} KB), "
+        f"parked {memory['parked']} ({memory['parked_bytes'] / 1024:.0f} KB), "
+        f"parks {host.parks}, unparks {host.unparks}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
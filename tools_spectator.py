@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Serve bot sessions to spectators, or watch a running server.
+
+Usage:
+  python tools_spectator.py serve --sessions 24 --port 8765
+  python tools_spectator.py serve --sessions 8 --unix /tmp/horror.sock
+  python tools_spectator.py watch --port 8765 --seconds 10
+"""
+
+import argparse
+import asyncio
+import sys
+
+from src.game import GameState, default_asset_root
+from src.headless import init_headless
+from src.spectator import Session, SpectatorServer, watch
+
+
+async def serve(args):
+    asset_root = default_asset_root()
+    sessions = [
+        Session(f"s{i}", lambda seed: GameState(asset_root, seed), seed=args.seed + i * 1000)
+        for i in range(args.sessions)
+    ]
+    server = SpectatorServer(sessions)
+    await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving {len(sessions)} sessions on {where}")
+    try:
+        await server.serve(args.seconds)
+    finally:
+        server.close()
+    print(f"{server.ticks} ticks, {server.bytes_sent / 1024:.1f} KB sent")
+
+
+async def spectate(args):
+    stats = await watch(args.host, args.port, args.unix, args.ids, args.seconds or 10.0)
+    for session_id, entry in sorted(stats.items(), key=lambda item: str(item[0])):
+        rate = entry["bytes"] / (args.seconds or 10.0) / 1024
+        print(f"{session_id}: {entry['keyframes']} keyframes, {entry['deltas']} deltas, {rate:.2f} KB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("serve", "watch"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Unix socket path instead of TCP")
+    parser.add_argument("--sessions", type=int, default=8, help="bot sessions to host")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--seconds", type=float, help="stop after this many seconds")
+    parser.add_argument("--ids", nargs="*", help="sessions to watch (default: all)")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        init_headless()
+        asyncio.run(serve(args))
+    else:
+        asyncio.run(spectate(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
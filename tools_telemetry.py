@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Summarize gameplay telemetry logs written by the game.
+
+Usage:
+  python tools_telemetry.py
+  python tools_telemetry.py --dir telemetry --json summary.json
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+
+from src.telemetry import CAUSES, DEVICES, ENTITIES, MONSTERS, load_columns, log_files
+
+
+def summarize(columns):
+    sessions = set(columns["session_start"]["session"])
+    death = columns["death"]
+    win = columns["win"]
+    ended = dict(zip(death["session"], death["time"]))
+    ended.update(zip(win["session"], win["time"]))
+    causes = Counter(
+        MONSTERS[monster] if CAUSES[cause] == "Monster" else CAUSES[cause]
+        for cause, monster in zip(death["cause"], death["monster"])
+    )
+    items = Counter(
+        (item, used) for item, used in zip(columns["item"]["item"], columns["item"]["used"])
+    )
+    toggles = Counter(
+        DEVICES[device] for device, on in zip(columns["toggle"]["device"], columns["toggle"]["on"]) if on
+    )
+    return {
+        "events": sum(len(fields["session"]) for fields in columns.values()),
+        "sessions": len(sessions),
+        "finished": len(ended),
+        "deaths": len(death["session"]),
+        "wins": len(win["session"]),
+        "mean_survival_s": sum(ended.values()) / len(ended) if ended else 0.0,
+        "death_causes": dict(causes.most_common()),
+        "spawns": dict(Counter(ENTITIES[e] for e in columns["spawn"]["entity"])),
+        "banishes": len(columns["banish"]["session"]),
+        "items_used": {str(item): count for (item, used), count in sorted(items.items()) if used},
+        "items_refused": {str(item): count for (item, used), count in sorted(items.items()) if not used},
+        "toggled_on": dict(toggles),
+        "groundings": len(columns["grounding"]["session"]),
+        "room_changes": len(columns["room"]["session"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default="telemetry", help="directory holding *.htl logs")
+    parser.add_argument("--json", help="write the summary to this path")
+    args = parser.parse_args()
+
+    paths = log_files(args.dir)
+    if not paths:
+        print(f"No telemetry logs in {args.dir}.")
+        return 1
+    summary = summarize(load_columns(paths))
+    for key, value in summary.items():
+        if isinstance(value, float):
+            value = f"{value:.1f}"
+        print(f"{key:<16} {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
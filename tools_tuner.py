@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Sweep balance parameters from constants.py with the reference heuristic bot.
+
+Points are played in a process pool and cached on disk by parameter hash, so
+re-running or widening a sweep only simulates new points.
+
+Usage:
+  python tools_tuner.py --param SANITY_DRAIN_NIGHT=0.8:1.6 --param GHOST_KILL_TIME=8,10,12 --grid 3
+  python tools_tuner.py --param HALLUCINATION_BASE=0.01:0.08 --suggest 8 --rounds 4 --target 0.6 --workers 4
+"""
+
+import argparse
+import os
+import random
+import sys
+
+from src.game import default_asset_root
+from src.tuner import ResultCache, grid_points, parse_space, run_sweep, score, suggest_points
+
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tuning_cache")
+
+
+def report(rows, target):
+    rows = sorted(rows, key=lambda result: score(result, target), reverse=True)
+    for result in rows:
+        params = " ".join(f"{name}={value}" for name, value in sorted(result["params"].items()))
+        causes = ", ".join(f"{cause}:{count}" for cause, count in sorted(result["causes"].items()))
+        tag = " (cached)" if result.get("cached") else ""
+        print(
+            f"{score(result, target):+.3f} survival {result['survival']:.2f} deaths {result['death_rate']:.2f} "
+            f"wins {result['win_rate']:.2f} | {params} | {causes}{tag}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--param", action="append", required=True, metavar="NAME=LO:HI|A,B,C")
+    parser.add_argument("--grid", type=int, default=0, help="grid steps per range parameter")
+    parser.add_argument("--suggest", type=int, default=0, help="points suggested per round (TPE)")
+    parser.add_argument("--rounds", type=int, default=1, help="suggestion rounds")
+    parser.add_argument("--target", type=float, help="aim for this survival fraction instead of maximizing it")
+    parser.add_argument("--seeds", type=int, default=8, help="games per point")
+    parser.add_argument("--minutes", type=float, default=60.0, help="game minutes per game (60 = all five days)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache", default=DEFAULT_CACHE)
+    parser.add_argument("--rng-seed", type=int, default=0)
+    args = parser.parse_args()
+
+    space = parse_space(args.param)
+    seeds = list(range(1, args.seeds + 1))
+    cache = ResultCache(args.cache)
+    asset_root = default_asset_root()
+    rng = random.Random(args.rng_seed)
+
+    results = []
+    if args.grid or not args.suggest:
+        points = grid_points(space, args.grid or 3)
+        results.extend(run_sweep(points, seeds, args.minutes, asset_root, cache, args.workers))
+    for _ in range(args.rounds if args.suggest else 0):
+        history = [(result["params"], score(result, args.target)) for result in results]
+        points = suggest_points(space, history, args.suggest, rng)
+        results.extend(run_sweep(points, seeds, args.minutes, asset_root, cache, args.workers))
+    report(results, args.target)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())